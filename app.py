@@ -1,16 +1,21 @@
 import os
-from flask import Flask
+import time
+from flask import Flask, g, request
 
 from games.guess import bp as guess_bp
 from games.type_matchup import bp as type_bp
 from games.quiz import bp as quiz_bp
 from games.pokedex import bp as entry_bp
-from games.daily import bp as daily_bp
+from games.daily import bp as daily_bp, start_rollover_scheduler
 from games.scream import bp as scream_bp
 from games.silhouette import bp as silhouette_bp
 from games.pixelate import bp as pixelate_bp
-from games.tcg import bp as tcg_bp
+from games.tcg import bp as tcg_bp, start_index_refresher
+from games.media import bp as media_bp
+from games.metrics import bp as metrics_bp
+from games.admin import bp as admin_bp, is_admin
 from services import pokemon as services
+from services import cache_registry, dataset, derivatives, metrics, tracing
 
 app = Flask(__name__)
 app.config['JSON_SORT_KEYS'] = False
@@ -19,6 +24,15 @@ app.config['JSON_SORT_KEYS'] = False
 # Prefer environment variable; fall back to a deterministic dev default.
 app.secret_key = os.environ.get('SECRET_KEY') or 'pokemon-games-dev-secret-key'
 
+# Load the offline-built dataset (python -m services.ingest) once at startup;
+# with gunicorn --preload the tables are shared by all workers.
+dataset.load()
+services.load_prebuilt()
+# Count and time every upstream HTTP call (see /metrics)
+metrics.instrument_requests()
+# Server-Timing header and access log line for sampled requests
+tracing.install(app, can_force=is_admin)
+
 # Register game blueprints (no prefixes to preserve existing routes)
 app.register_blueprint(guess_bp)
 app.register_blueprint(type_bp)
@@ -29,6 +43,14 @@ app.register_blueprint(scream_bp)
 app.register_blueprint(silhouette_bp)
 app.register_blueprint(pixelate_bp)
 app.register_blueprint(tcg_bp)
+app.register_blueprint(media_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(admin_bp)
+
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
 
 
 # Schedule warmup once on the first incoming request (Flask 3.1 compatible)
@@ -37,6 +59,21 @@ def _schedule_warmup():
     if not services.WARMUP_SCHEDULED:
         services.EXECUTOR.submit(services.warm_up_all_names)
         services.WARMUP_SCHEDULED = True
+        start_rollover_scheduler()
+        start_index_refresher()
+        derivatives.start_precompute()
+        metrics.start_flusher()
+        cache_registry.start_observer()
+
+
+@app.after_request
+def _record_request(response):
+    started = g.get('request_started')
+    if started is not None:
+        # Label by URL rule (not path) to keep the number of series bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe_request(route, request.method, response.status_code, time.perf_counter() - started)
+    return response
 
 
 if __name__ == '__main__':
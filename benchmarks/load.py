@@ -0,0 +1,225 @@
+"""End-to-end load test: gunicorn + the offline upstream stand-in + scripted players.
+
+    python -m benchmarks.load --users 16 --duration 60 --latency-ms 40 --error-rate 0.01
+
+Starts benchmarks/upstream_stub.py on a free port and gunicorn (`--gunicorn-args`,
+default as in the Procfile) with POKEAPI_BASE/TCGDEX_BASE pointing at it. Then runs
+`--users` concurrent players, each repeatedly picking a mode and playing one scripted
+session (benchmarks/sessions.py). A `--warmup` phase runs first and is not measured.
+
+The report has p50/p95/p99 latency, throughput and errors per endpoint, and upstream
+calls per request: overall from the stand-in's counters, per endpoint from the
+Server-Timing header of the `--trace-rate` share of requests sent with `X-Trace: 1`.
+Forced traces need the admin token: the harness starts gunicorn with ADMIN_TOKEN set to
+`--admin-token` (a random one by default); with `--url`, pass the server's token.
+`--json` also writes the report to a file so runs can be compared.
+
+`--url` targets a server that is already running instead (upstream calls are then only
+known from traced requests, unless it uses a stand-in started with --stub-url).
+
+Everything runs on one machine without network access; the dataset (`--data-dir`) must
+have been built with `python -m services.ingest`, which also records the raw responses
+the stand-in replays.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import secrets
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks import upstream_stub
+from benchmarks.sessions import SESSIONS, Client, Recorder
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERCENTILES = (50, 95, 99)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(stub_base: str, data_dir: str, gunicorn_args: str, log_path: str, admin_token: str):
+    """Launch gunicorn on a free port. Returns (process, base URL)."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        'POKEAPI_BASE': f"{stub_base}/pokeapi.co/api/v2",
+        'TCGDEX_BASE': f"{stub_base}/api.tcgdex.net/v2",
+        'POKEMON_DATA_DIR': data_dir,
+        'METRICS_DIR': tempfile.mkdtemp(prefix='pokemon-load-metrics-'),
+        'TRACE_SAMPLE_RATE': '0',  # only the harness' X-Trace requests are traced
+        'ADMIN_TOKEN': admin_token,
+    }
+    cmd = [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}', *shlex.split(gunicorn_args)]
+    log = open(log_path, 'ab')
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def wait_ready(base: str, proc=None, timeout: float = 60) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            return False
+        try:
+            if requests.get(f"{base}/quiz", timeout=5).status_code < 500:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    return False
+
+
+def run_users(base: str, recorder: Recorder, modes, users: int, seconds: float, rounds: int,
+              trace_rate: float, seed, admin_token: str = '') -> float:
+    """Play sessions with `users` threads until `seconds` have passed. Returns the wall time."""
+    stop = threading.Event()
+
+    def user(i: int):
+        rng = random.Random(None if seed is None else seed + i)
+        client = Client(base, recorder, trace_rate, admin_token=admin_token)
+        while not stop.is_set():
+            SESSIONS[rng.choice(modes)](client, rng, rounds)
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    stop.wait(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0
+
+
+def _percentile(sorted_values, p: float) -> float:
+    # Nearest rank
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(samples, elapsed: float) -> dict:
+    latencies = sorted(s[0] for s in samples)
+    traced = [s[2] for s in samples if s[2] is not None]
+    out = {
+        'requests': len(samples),
+        'errors': sum(1 for s in samples if not s[1]),
+        'rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'upstream_per_request': round(sum(traced) / len(traced), 3) if traced else None,
+        'traced': len(traced),
+    }
+    for p in PERCENTILES:
+        out[f'p{p}_ms'] = round(_percentile(latencies, p) * 1000, 2) if latencies else None
+    out['max_ms'] = round(latencies[-1] * 1000, 2) if latencies else None
+    return out
+
+
+def report(recorder: Recorder, elapsed: float, upstream: dict | None) -> dict:
+    samples = recorder.samples
+    endpoints = {label: summarize(s, elapsed) for label, s in sorted(samples.items())}
+    total = summarize([x for s in samples.values() for x in s], elapsed)
+    if upstream is not None and total['requests']:
+        total['upstream_per_request'] = round(upstream['requests'] / total['requests'], 3)
+    return {'elapsed_s': round(elapsed, 2), 'total': total, 'endpoints': endpoints, 'upstream': upstream}
+
+
+def print_report(rep: dict):
+    cols = ['requests', 'errors', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'upstream_per_request']
+    heads = ['reqs', 'errors', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms', 'upstream/req']
+    width = max([len(k) for k in rep['endpoints']] + [5])
+    print(f"{'endpoint':<{width}} " + ' '.join(f"{h:>12}" for h in heads))
+    for label, row in list(rep['endpoints'].items()) + [('total', rep['total'])]:
+        cells = ['-' if row[c] is None else str(row[c]) for c in cols]
+        print(f"{label:<{width}} " + ' '.join(f"{c:>12}" for c in cells))
+    up = rep.get('upstream')
+    if up:
+        hosts = ', '.join(f"{h}: {c['requests']} ({c['errors']} errors, {c['dropped']} dropped, {c['not_found']} not recorded)"
+                          for h, c in sorted(up['hosts'].items()))
+        print(f"upstream: {up['requests']} calls in {rep['elapsed_s']}s; {hosts or 'none'}")
+
+
+def _stub_stats(stub_url: str):
+    try:
+        return requests.get(f"{stub_url}/_stats", timeout=5).json()
+    except requests.RequestException:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the app against an offline upstream stand-in.')
+    parser.add_argument('--url', help='target an already running server instead of starting gunicorn')
+    parser.add_argument('--stub-url', help='with --url: the stand-in that server uses, for upstream counts')
+    parser.add_argument('--gunicorn-args', default='--workers 3 --preload')
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='unmeasured seconds first')
+    parser.add_argument('--rounds', type=int, default=5, help='rounds per session')
+    parser.add_argument('--modes', default=','.join(SESSIONS), help='comma-separated modes to play')
+    parser.add_argument('--trace-rate', type=float, default=0.1, help='share of requests sent with X-Trace: 1')
+    parser.add_argument('--admin-token', default=os.environ.get('ADMIN_TOKEN') or '',
+                        help="the server's ADMIN_TOKEN, needed for X-Trace (default: $ADMIN_TOKEN, "
+                             "or a random one for the gunicorn started here)")
+    parser.add_argument('--json', help='also write the report to this file')
+    upstream_stub.add_arguments(parser)
+    args = parser.parse_args(argv)
+    modes = [m for m in args.modes.split(',') if m]
+    unknown = [m for m in modes if m not in SESSIONS]
+    if unknown or not modes:
+        parser.error(f"unknown modes {unknown}; choose from {', '.join(SESSIONS)}")
+
+    server = proc = None
+    stub_url = args.stub_url
+    base = args.url
+    admin_token = args.admin_token or ('' if base else secrets.token_hex(16))
+    if base and args.trace_rate and not admin_token:
+        print('no --admin-token: requests are not traced, upstream calls per endpoint are unknown', file=sys.stderr)
+    if not base:
+        stub = upstream_stub.stub_from_args(args)
+        server = upstream_stub.serve(stub)
+        stub_url = stub.base
+        log_path = os.path.join(tempfile.gettempdir(), 'pokemon-load-gunicorn.log')
+        proc, base = start_gunicorn(stub.base, args.data_dir, args.gunicorn_args, log_path, admin_token)
+        print(f"gunicorn at {base} (log: {log_path}), upstream stand-in at {stub.base}")
+    try:
+        if not wait_ready(base, proc):
+            print('server did not become ready', file=sys.stderr)
+            return 1
+        recorder = Recorder()
+        if args.warmup > 0:
+            run_users(base, recorder, modes, args.users, args.warmup, args.rounds, 0, args.seed)
+            recorder.clear()
+        if stub_url:
+            requests.post(f"{stub_url}/_reset", timeout=5)
+        elapsed = run_users(base, recorder, modes, args.users, args.duration, args.rounds,
+                            args.trace_rate, args.seed, admin_token)
+        rep = report(recorder, elapsed, _stub_stats(stub_url) if stub_url else None)
+        rep['config'] = {k: v for k, v in vars(args).items() if k not in ('json', 'admin_token')}
+        print_report(rep)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(rep, f, indent=2)
+        return 0
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
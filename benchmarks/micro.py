@@ -0,0 +1,288 @@
+"""Micro-benchmarks of the CPU-bound hot paths, with JSON baselines and a regression gate.
+
+    python -m benchmarks.micro                       # run and print ns per call
+    python -m benchmarks.micro --save                # ... and write the baseline
+    python -m benchmarks.micro --compare --threshold 15
+    python -m benchmarks.micro --data-dir data --export-corpus   # refresh the fixture
+
+Every benchmark runs over the species corpus committed in benchmarks/corpus/: the dataset
+files it reads (attributes, evolution, forms, names per language) exported from a build
+of `python -m services.ingest`, so results compare across machines and checkouts.
+`--data-dir` runs over another built dataset instead. The caches are warmed by one untimed pass. Each is
+timed `--repeat` times and the fastest run counts, which keeps scheduler noise out of
+the comparison. `--compare` exits with status 1 when any benchmark is more than
+`--threshold` percent slower than in the baseline file.
+
+Network access is disabled while benchmarking: a path that would call PokeAPI raises
+instead of silently timing a round trip.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+
+import requests
+from flask import Flask
+from werkzeug.test import EnvironBuilder
+
+from benchmarks.normalize_name import load_corpus
+from games import common, daily, guess
+from services import dataset, evolution, name_shards, pokemon, text_utils
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, 'baselines', 'micro.json')
+DEFAULT_CORPUS = os.path.join(HERE, 'corpus')
+CORPUS_FILES = [dataset.ATTRS_FILE, evolution.EVOLUTION_FILE, dataset.FORMS_FILE]
+GENS = ['', 'all', '1', '3', '9', '1,3,5', '2|4', '10']
+FORM_PREFIXES = ['Mega', 'Alolan', 'Galarian', 'Hisuian', 'Paldean', 'Gigantamax']
+SUGGEST_QUERIES = 200
+DAILY_GUESSES = 200
+
+
+def _offline(*args, **kwargs):
+    raise RuntimeError('network access during a micro-benchmark')
+
+
+def export_corpus(data_dir: str, out_dir: str = DEFAULT_CORPUS) -> int:
+    """Replace the corpus fixture with the files the benchmarks read from a built dataset.
+    Returns the number of files copied."""
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(os.path.join(out_dir, dataset.NAMES_DIR))
+    names = [os.path.join(dataset.NAMES_DIR, fn) for fn in sorted(os.listdir(os.path.join(data_dir, dataset.NAMES_DIR)))
+             if fn.endswith('.json')]
+    copied = 0
+    for rel in CORPUS_FILES + names:
+        src = os.path.join(data_dir, rel)
+        if os.path.exists(src):
+            shutil.copyfile(src, os.path.join(out_dir, rel))
+            copied += 1
+    return copied
+
+
+def _setup(data_dir: str) -> dict:
+    requests.Session.send = _offline
+    dataset.load(data_dir)
+    pokemon.load_prebuilt()
+    lst = pokemon.get_pokemon_list()
+    app = Flask(__name__)
+    app.register_blueprint(guess.bp)
+    app.register_blueprint(daily.bp)
+    # Non-English language with a built shard (suggestions and aliases take the localized path)
+    langs = sorted(lang for lang in dataset.NAME_LANGS if lang != 'en' and name_shards.is_complete(lang))
+    return {
+        'app': app,
+        'list': lst,
+        'ids': [p['id'] for p in lst],
+        'names': [p['display_en'] for p in lst],
+        'corpus': load_corpus(data_dir),
+        'langs': ['en'] + langs[:2],
+        'rng': random.Random(1),
+    }
+
+
+# Each bench takes the context and returns (fn, calls per fn()).
+
+def bench_normalize_name(ctx):
+    corpus = ctx['corpus']
+
+    def run():
+        for s in corpus:
+            text_utils.normalize_name(s)
+    return run, len(corpus)
+
+
+def bench_normalize_name_uncached(ctx):
+    corpus, raw = ctx['corpus'], text_utils._normalize.__wrapped__
+
+    def run():
+        for s in corpus:
+            raw(s)
+    return run, len(corpus)
+
+
+def bench_slugify_guess_for_form_lookup(ctx):
+    guesses = ctx['names'] + [f"{prefix} {name}" for prefix in FORM_PREFIXES for name in ctx['names'][::10]]
+    guesses += [slug.replace('-', ' ') for slug in dataset.FORMS]
+
+    def run():
+        for g in guesses:
+            pokemon._slugify_guess_for_form_lookup(g)
+    return run, len(guesses)
+
+
+def bench_filter_ids_by_gen(ctx):
+    ids = ctx['ids']
+
+    def run():
+        for gen in GENS:
+            pokemon._filter_ids_by_gen(ids, gen)
+    return run, len(GENS)
+
+
+def bench_pick_random_id_for_gen(ctx):
+    gens = GENS * 25
+
+    def run():
+        for gen in gens:
+            pokemon.pick_random_id_for_gen(gen)
+    return run, len(gens)
+
+
+def bench_build_aliases(ctx):
+    pairs = [(pid, lang) for lang in ctx['langs'] for pid in ctx['ids']]
+
+    def run():
+        for pid, lang in pairs:
+            common.build_aliases(pid, lang)
+    return run, len(pairs)
+
+
+def bench_ensure_name_index(ctx):
+    langs = ctx['langs'] * 100
+
+    def run():
+        for lang in langs:
+            daily._ensure_name_index(lang)
+    return run, len(langs)
+
+
+def bench_suggest_scan(ctx):
+    rng = ctx['rng']
+    names = [(lang, pokemon.get_localized_name(pid, lang)) for lang in ctx['langs'] for pid in ctx['ids']]
+    queries = [(lang, name[:rng.randint(1, 3)]) for lang, name in rng.sample(names, min(SUGGEST_QUERIES, len(names)))]
+    app = ctx['app']
+    environs = [EnvironBuilder('/api/pokemon-suggest', query_string={'q': q, 'lang': lang}).get_environ()
+                for lang, q in queries]
+
+    def run():
+        for environ in environs:
+            with app.request_context(environ):
+                guess.pokemon_suggest()
+    return run, len(environs)
+
+
+def bench_daily_feedback(ctx):
+    rng = ctx['rng']
+    guesses = rng.sample(ctx['names'], min(DAILY_GUESSES, len(ctx['names'])))
+    app = ctx['app']
+    prepared = []
+    for g in guesses:
+        body = json.dumps({'guess': g, 'lang': 'en'}).encode('utf-8')
+        environ = EnvironBuilder('/api/daily/guess', method='POST', data=body, content_type='application/json').get_environ()
+        prepared.append((environ, body))
+
+    def run():
+        for environ, body in prepared:
+            # Each request consumes its body stream
+            with app.request_context({**environ, 'wsgi.input': io.BytesIO(body)}):
+                daily.api_guess()
+    return run, len(prepared)
+
+
+BENCHMARKS = {
+    'normalize_name': bench_normalize_name,
+    'normalize_name_uncached': bench_normalize_name_uncached,
+    '_slugify_guess_for_form_lookup': bench_slugify_guess_for_form_lookup,
+    '_filter_ids_by_gen': bench_filter_ids_by_gen,
+    'pick_random_id_for_gen': bench_pick_random_id_for_gen,
+    'build_aliases': bench_build_aliases,
+    '_ensure_name_index': bench_ensure_name_index,
+    'suggest_scan': bench_suggest_scan,
+    'daily_feedback': bench_daily_feedback,
+}
+
+
+def run_benchmarks(ctx: dict, names, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        fn, calls = BENCHMARKS[name](ctx)
+        fn()  # warm caches
+        best = float('inf')
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        results[name] = {'ns_per_call': round(best / calls * 1e9, 1), 'calls': calls}
+        print(f"  {name:<32} {results[name]['ns_per_call']:12.1f} ns/call  ({calls} calls)")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print the change against the baseline; return the names that regressed."""
+    regressed = []
+    print(f"{'benchmark':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, cur in results.items():
+        base = (baseline.get('results') or {}).get(name)
+        if not base:
+            print(f"{name:<32} {'-':>12} {cur['ns_per_call']:12.1f} {'new':>8}")
+            continue
+        change = (cur['ns_per_call'] - base['ns_per_call']) / base['ns_per_call'] * 100
+        flag = ''
+        if change > threshold:
+            regressed.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<32} {base['ns_per_call']:12.1f} {cur['ns_per_call']:12.1f} {change:+7.1f}%{flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Micro-benchmark the services hot paths.')
+    parser.add_argument('--data-dir', default=DEFAULT_CORPUS, help='built dataset to run over (default: the fixture)')
+    parser.add_argument('--export-corpus', action='store_true',
+                        help='copy the corpus files of --data-dir into benchmarks/corpus/ and exit')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', help='comma-separated benchmark names')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--compare', action='store_true', help='fail on regressions against the baseline')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed slowdown in percent')
+    args = parser.parse_args(argv)
+    names = [n for n in (args.only.split(',') if args.only else BENCHMARKS) if n]
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks {unknown}; choose from {', '.join(BENCHMARKS)}")
+    if args.export_corpus:
+        if os.path.abspath(args.data_dir) == DEFAULT_CORPUS:
+            parser.error('--export-corpus needs --data-dir pointing at a built dataset')
+        print(f"{export_corpus(args.data_dir)} files copied to {DEFAULT_CORPUS}")
+        return 0
+
+    ctx = _setup(args.data_dir)
+    if not ctx['ids'] or not dataset.is_loaded():
+        parser.error(f"no dataset in {args.data_dir}; build one with python -m services.ingest")
+    print(f"corpus: {len(ctx['ids'])} species, {len(ctx['corpus'])} names, langs {ctx['langs']}")
+    results = run_benchmarks(ctx, names, args.repeat)
+
+    status = 0
+    if args.compare:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except OSError:
+            parser.error(f"no baseline at {args.baseline}; run with --save first")
+        regressed = compare(results, baseline, args.threshold)
+        if regressed:
+            print(f"{len(regressed)} benchmark(s) regressed by more than {args.threshold}%: {', '.join(regressed)}")
+            status = 1
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'species': len(ctx['ids']),
+                'results': results,
+            }, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Benchmark services.text_utils.normalize_name against the original implementation.
+
+Run `python -m benchmarks.normalize_name` after `python -m services.ingest names`. The
+corpus is every slug, English display name and localized name in the dataset. It also
+checks that both implementations agree on every Unicode code point and on the corpus.
+"""
+import argparse
+import sys
+import time
+import unicodedata
+
+from services import dataset, name_shards
+from services import text_utils
+
+
+def reference_normalize_name(s: str) -> str:
+    """The original normalize_name, kept verbatim as the correctness oracle."""
+    if not isinstance(s, str):
+        s = str(s)
+    s = s.strip()
+    s = unicodedata.normalize('NFKD', s)
+    s = ''.join(c for c in s if not unicodedata.combining(c))
+    s = s.lower()
+    s = s.replace('ß', 'ss')
+    s = s.replace('♂', 'm').replace('♀', 'f')
+    s = ''.join(ch for ch in s if ('a' <= ch <= 'z') or ('0' <= ch <= '9'))
+    return s
+
+
+def load_corpus(data_dir: str) -> list[str]:
+    dataset.load(data_dir)
+    corpus = []
+    if dataset.is_loaded():
+        for slug in dataset.ATTRS['slug']:
+            slug = str(slug)
+            corpus.append(slug)
+            corpus.append(slug.replace('-', ' ').title())
+    for lang in sorted(dataset.NAME_LANGS):
+        corpus.extend(name for name in name_shards.shard(lang) if name)
+    corpus.extend(dataset.FORMS.keys())
+    return corpus
+
+
+def check_identical(corpus) -> list:
+    """Return inputs where the implementations disagree (empty when byte-identical)."""
+    bad = []
+    for cp in range(sys.maxunicode + 1):
+        if 0xD800 <= cp <= 0xDFFF:
+            continue
+        ch = chr(cp)
+        if text_utils.normalize_name(ch) != reference_normalize_name(ch):
+            bad.append(ch)
+    for s in corpus:
+        if text_utils.normalize_name(s) != reference_normalize_name(s):
+            bad.append(s)
+    return bad
+
+
+def _time(fn, corpus, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for s in corpus:
+            fn(s)
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark normalize_name on the name corpus.')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--data-dir', default=dataset.DATA_DIR)
+    parser.add_argument('--skip-check', action='store_true', help='skip the full code point comparison')
+    args = parser.parse_args(argv)
+    corpus = load_corpus(args.data_dir)
+    if not corpus:
+        parser.error(f"no names in {args.data_dir}; run python -m services.ingest names first")
+    if not args.skip_check:
+        bad = check_identical(corpus)
+        if bad:
+            print(f"MISMATCH on {len(bad)} inputs, e.g. {bad[:5]!r}")
+            return 1
+        print('identical on all code points and corpus entries')
+
+    calls = len(corpus) * args.rounds
+    ref = _time(reference_normalize_name, corpus, args.rounds)
+    text_utils._normalize.cache_clear()
+    cold = _time(text_utils.normalize_name, corpus, 1)
+    text_utils._normalize.cache_clear()
+    warm = _time(text_utils.normalize_name, corpus, args.rounds)
+    # Uncached cost of the translation-table path alone
+    raw = _time(text_utils._normalize.__wrapped__, corpus, args.rounds)
+    print(f"corpus={len(corpus)} names, {args.rounds} rounds")
+    for label, dt, n in (('reference', ref, calls), ('new, first pass', cold, len(corpus)),
+                         ('new, memoized', warm, calls), ('new, no memo', raw, calls)):
+        print(f"  {label:<16} {dt / n * 1e9:8.0f} ns/call  ({ref / calls / (dt / n):5.1f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Scripted player sessions for the load harness (benchmarks/load.py).
+
+A session is one page visit: the requests the front-end makes on load (the name list
+used for suggestions), then a few rounds of play, wrong guesses included. Every mode of
+the site has a script in SESSIONS, and each script only calls the JSON endpoints its page
+calls in static/*.js.
+"""
+import random
+import re
+import threading
+import time
+from functools import partial
+
+import requests
+
+LANGS = ['en', 'en', 'en', 'en', 'fr', 'de', 'es', 'ja']  # rough traffic mix
+GENS = [''] * 6 + [str(g) for g in range(1, 10)]
+# Pages whose round endpoint reuses the shared name list and POST /api/check-guess
+ROUND_ENDPOINTS = {
+    'sprite': '/api/random-sprite',
+    'silhouette': '/api/silhouette/random',
+    'pixelate': '/api/pixelate/random',
+    'scream': '/api/random-cry',
+    'pokedex': '/pokedex/api/random-entry',
+    'tcg': '/api/tcg/random',
+}
+_UPSTREAM_CALLS = re.compile(r'upstream;[^,]*desc="(\d+) calls')
+
+
+class Recorder:
+    """Thread-safe latency samples: label -> [(seconds, ok, upstream calls or None)]."""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, label: str, seconds: float, ok: bool, upstream=None):
+        with self._lock:
+            self.samples.setdefault(label, []).append((seconds, ok, upstream))
+
+    def clear(self):
+        with self._lock:
+            self.samples = {}
+
+
+class Client:
+    """One virtual user: a keep-alive HTTP session that records every call it makes."""
+
+    def __init__(self, base: str, recorder: Recorder, trace_rate: float = 0.0, timeout: float = 30,
+                 admin_token: str = ''):
+        self.base = base.rstrip('/')
+        self.recorder = recorder
+        # Forced traces need the admin token: without one no request is traced
+        self.trace_rate = trace_rate if admin_token else 0.0
+        self.trace_headers = {'X-Trace': '1', 'X-Admin-Token': admin_token}
+        self.timeout = timeout
+        self.http = requests.Session()
+
+    def _call(self, label: str, method: str, path: str, **kwargs):
+        headers = self.trace_headers if self.trace_rate and random.random() < self.trace_rate else {}
+        t0 = time.perf_counter()
+        try:
+            resp = self.http.request(method, self.base + path, headers=headers, timeout=self.timeout, **kwargs)
+            elapsed = time.perf_counter() - t0
+        except requests.RequestException:
+            self.recorder.add(label, time.perf_counter() - t0, False)
+            return None
+        m = _UPSTREAM_CALLS.search(resp.headers.get('Server-Timing') or '')
+        # 4xx answers to scripted wrong guesses are part of the game, not failures
+        self.recorder.add(label, elapsed, resp.status_code < 500, int(m.group(1)) if m else None)
+        try:
+            return resp.json()
+        except ValueError:
+            return None
+
+    def get(self, label: str, path: str, **params):
+        return self._call(label, 'GET', path, params=params)
+
+    def post(self, label: str, path: str, body: dict):
+        return self._call(label, 'POST', path, json=body)
+
+
+def _wrong_names(names, answer: str, rng: random.Random, n: int) -> list:
+    pool = [x for x in (names or []) if isinstance(x, str) and x != answer]
+    return rng.sample(pool, min(n, len(pool)))
+
+
+def guess_session(mode: str, client: Client, rng: random.Random, rounds: int, max_wrong: int = 3):
+    lang, gen = rng.choice(LANGS), rng.choice(GENS)
+    # Every game page loads its suggestions from the shared list (static/suggestions.js)
+    names = client.get(f'{mode} names', '/api/all-names', lang=lang, gen=gen)
+    for _ in range(rounds):
+        data = client.get(f'{mode} round', ROUND_ENDPOINTS[mode], lang=lang, gen=gen)
+        if not isinstance(data, dict) or 'token' not in data:
+            continue
+        for wrong in _wrong_names(names, data.get('name'), rng, rng.randint(0, max_wrong)):
+            client.post(f'{mode} guess', '/api/check-guess', {'token': data['token'], 'guess': wrong, 'lang': lang})
+        client.post(f'{mode} guess', '/api/check-guess', {'token': data['token'], 'guess': data.get('name') or '', 'lang': lang})
+
+
+def daily_session(client: Client, rng: random.Random, rounds: int, max_guesses: int = 8):
+    lang = rng.choice(LANGS)
+    client.get('daily meta', '/api/daily/meta', lang=lang)
+    names = client.get('daily names', '/api/all-names', lang=lang, gen='')
+    for name in _wrong_names(names, None, rng, max_guesses):
+        data = client.post('daily guess', '/api/daily/guess', {'guess': name, 'lang': lang})
+        if isinstance(data, dict) and data.get('correct'):
+            break
+
+
+def quiz_session(client: Client, rng: random.Random, rounds: int):
+    lang, gen = rng.choice(LANGS), rng.choice(GENS)
+    difficulty = rng.choice(['', 'easy', 'medium', 'hard'])
+    for _ in range(rounds):
+        q = client.get('quiz round', '/api/quiz/question', lang=lang, gen=gen, difficulty=difficulty)
+        if not isinstance(q, dict) or 'token' not in q:
+            continue
+        n = len(q.get('options') or [])
+        for choice in rng.sample(range(n), k=min(2, n)):
+            a = client.post('quiz answer', '/api/quiz/answer', {'token': q['token'], 'choice': choice})
+            if isinstance(a, dict) and a.get('correct'):
+                break
+
+
+def type_matchup_session(client: Client, rng: random.Random, rounds: int):
+    lang, gen = rng.choice(LANGS), rng.choice(GENS)
+    for _ in range(rounds):
+        r = client.get('type_matchup round', '/api/type-matchup/random', lang=lang, gen=gen)
+        if not isinstance(r, dict) or 'token' not in r:
+            continue
+        attacks = r.get('attack_types') or []
+        for attack in rng.sample(attacks, k=min(3, len(attacks))):
+            c = client.post('type_matchup check', '/api/type-matchup/check', {'token': r['token'], 'attack': attack})
+            if isinstance(c, dict) and c.get('correct'):
+                break
+
+
+SESSIONS = {
+    **{mode: partial(guess_session, mode) for mode in ROUND_ENDPOINTS},
+    'daily': daily_session,
+    'quiz': quiz_session,
+    'type_matchup': type_matchup_session,
+}
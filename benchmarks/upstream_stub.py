@@ -0,0 +1,196 @@
+"""Offline stand-in for PokeAPI and TCGdex that replays the ingest raw cache.
+
+`python -m services.ingest` records every upstream response under DATA_DIR/raw/<host>/...
+This server answers GET http://<bind>/<host>/<path> from those files, so the app can be
+pointed at it with
+
+    POKEAPI_BASE=http://127.0.0.1:8081/pokeapi.co/api/v2
+    TCGDEX_BASE=http://127.0.0.1:8081/api.tcgdex.net/v2
+
+Absolute https:// URLs inside replayed documents (evolution chains, sprites) are rewritten
+to go through the stand-in too. TCGdex name searches (`cards?name=...`) are answered from
+the recorded full card list of the language. Anything that was not recorded is a 404.
+
+Every response can be delayed (--latency-ms, --jitter-ms) and replaced by an error
+(--error-rate, --error-status) or a dropped connection (--drop-rate). GET /_stats returns
+per-host request counts and POST /_reset zeroes them.
+
+Run standalone with `python -m benchmarks.upstream_stub --port 8081`.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from services import dataset, ingest
+
+_ABS_URL = re.compile(rb'https://([A-Za-z0-9.-]+)/')
+
+
+class Stub:
+    """Replay state and fault-injection settings shared by the request handlers."""
+
+    def __init__(self, data_dir: str, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, error_status: int = 503, drop_rate: float = 0, seed=None):
+        self.data_dir = data_dir
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.base = ''
+        self.rng = random.Random(seed)
+        self.counts = {}  # host -> {'requests', 'errors', 'dropped', 'not_found'}
+        self._bodies = {}  # raw file path -> rewritten bytes
+        self._cards = {}   # TCGdex lang -> recorded card list
+        self._lock = threading.Lock()
+
+    def count(self, host: str, field: str):
+        with self._lock:
+            c = self.counts.setdefault(host, {'requests': 0, 'errors': 0, 'dropped': 0, 'not_found': 0})
+            c[field] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            hosts = {h: dict(c) for h, c in self.counts.items()}
+        return {'requests': sum(c['requests'] for c in hosts.values()), 'hosts': hosts}
+
+    def reset(self):
+        with self._lock:
+            self.counts = {}
+
+    def _read(self, path: str):
+        body = self._bodies.get(path)
+        if body is None:
+            with open(path, 'rb') as f:
+                body = f.read()
+            if path.endswith('.json'):
+                body = _ABS_URL.sub(self.base.encode('ascii') + rb'/\1/', body)
+            self._bodies[path] = body
+        return body
+
+    def _card_search(self, url: str, query: dict):
+        """Recorded TCGdex list filtered by name, like the live `name` filter (substring, any case)."""
+        parts = urlsplit(url)
+        cards = self._cards.get(parts.path)
+        if cards is None:
+            path = ingest._raw_path(self.data_dir, f"https://{parts.netloc}{parts.path}")
+            if not os.path.exists(path):
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                cards = self._cards[parts.path] = json.load(f)
+        needle = (query.get('name') or [''])[0].lower()
+        hits = [c for c in cards if needle in str(c.get('name') or '').lower()]
+        return _ABS_URL.sub(self.base.encode('ascii') + rb'/\1/', json.dumps(hits).encode('utf-8'))
+
+    def lookup(self, url: str):
+        """(body, content type) for an upstream URL, or None when it was never recorded."""
+        path = ingest._raw_path(self.data_dir, url)
+        if os.path.exists(path):
+            return self._read(path), 'application/json'
+        binary = ingest._raw_path(self.data_dir, url, suffix='')
+        if os.path.isfile(binary):
+            return self._read(binary), 'application/octet-stream'
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        if parts.path.endswith('/cards') and 'name' in query:
+            body = self._card_search(url, query)
+            if body is not None:
+                return body, 'application/json'
+        return None
+
+
+def _handler(stub: Stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str = 'application/json'):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/_stats':
+                return self._send(200, json.dumps(stub.stats()).encode('utf-8'))
+            host, _, rest = self.path.lstrip('/').partition('/')
+            stub.count(host, 'requests')
+            delay = stub.latency + (stub.rng.gauss(0, stub.jitter) if stub.jitter else 0)
+            if delay > 0:
+                time.sleep(delay)
+            roll = stub.rng.random()
+            if roll < stub.drop_rate:
+                stub.count(host, 'dropped')
+                self.close_connection = True
+                return
+            if roll < stub.drop_rate + stub.error_rate:
+                stub.count(host, 'errors')
+                return self._send(stub.error_status, b'{"error": "injected"}')
+            found = stub.lookup(f"https://{host}/{rest}")
+            if found is None:
+                stub.count(host, 'not_found')
+                return self._send(404, b'{"error": "not recorded"}')
+            self._send(200, *found)
+
+        def do_POST(self):
+            if self.path == '/_reset':
+                stub.reset()
+                return self._send(200, b'{}')
+            self._send(405, b'{}')
+
+    return Handler
+
+
+def serve(stub: Stub, host: str = '127.0.0.1', port: int = 0):
+    """Start the stand-in on a background thread. Returns the server; its base URL is stub.base."""
+    server = ThreadingHTTPServer((host, port), _handler(stub))
+    server.daemon_threads = True
+    stub.base = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name='upstream-stub', daemon=True).start()
+    return server
+
+
+def add_arguments(parser):
+    parser.add_argument('--data-dir', default=dataset.DATA_DIR, help='dataset with a raw/ response cache')
+    parser.add_argument('--latency-ms', type=float, default=0, help='added delay per upstream response')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='standard deviation of the delay')
+    parser.add_argument('--error-rate', type=float, default=0, help='share of responses replaced by an error')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--drop-rate', type=float, default=0, help='share of connections closed without a response')
+    parser.add_argument('--seed', type=int, default=None)
+
+
+def stub_from_args(args) -> Stub:
+    return Stub(args.data_dir, args.latency_ms, args.jitter_ms, args.error_rate,
+                args.error_status, args.drop_rate, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay recorded PokeAPI/TCGdex responses.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    stub = stub_from_args(args)
+    server = serve(stub, args.host, args.port)
+    print(f"POKEAPI_BASE={stub.base}/pokeapi.co/api/v2")
+    print(f"TCGDEX_BASE={stub.base}/api.tcgdex.net/v2")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
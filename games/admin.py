@@ -0,0 +1,144 @@
+"""Operator endpoints under /admin.
+
+Every route requires the ADMIN_TOKEN environment variable, sent as `X-Admin-Token` or
+`Authorization: Bearer <token>`. Without ADMIN_TOKEN the endpoints do not exist (404).
+"""
+import hmac
+import os
+import threading
+
+from flask import Blueprint, Response, abort, g, jsonify, request
+
+from services import cache_registry, profiler
+
+bp = Blueprint('admin', __name__)
+
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN') or ''
+PROFILE_HEADER = 'X-Profile'
+
+
+def is_admin() -> bool:
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get('X-Admin-Token') or ''
+    auth = request.headers.get('Authorization') or ''
+    if not token and auth.startswith('Bearer '):
+        token = auth[len('Bearer '):]
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+
+@bp.before_request
+def _require_admin():
+    if not ADMIN_TOKEN:
+        abort(404)
+    if not is_admin():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+
+# ---- Profiling ----
+
+@bp.before_app_request
+def _start_request_profile():
+    # Per-request opt-in: X-Profile: 1 from an admin samples only this request's thread
+    if ADMIN_TOKEN and request.headers.get(PROFILE_HEADER) == '1' and is_admin():
+        g.profile_sampler = profiler.Sampler({threading.get_ident()}).start()
+
+
+@bp.after_app_request
+def _finish_request_profile(response):
+    sampler = g.pop('profile_sampler', None)
+    if sampler is not None:
+        response.headers['X-Profile-Id'] = profiler.save(sampler.stop(), 'request')
+    return response
+
+
+@bp.teardown_app_request
+def _stop_request_profile(exc=None):
+    sampler = g.pop('profile_sampler', None)
+    if sampler is not None:
+        sampler.stop()
+
+
+@bp.route('/admin/profile', methods=['POST'])
+def start_profile():
+    data = request.get_json(silent=True) or {}
+    try:
+        seconds = float(data.get('seconds') or request.args.get('seconds') or 10)
+        interval = float(data.get('interval_ms') or request.args.get('interval_ms') or 5) / 1000
+    except Exception:
+        return jsonify({'error': 'Invalid seconds or interval_ms'}), 400
+    profile_id = profiler.start_worker_profile(seconds, interval)
+    if profile_id is None:
+        return jsonify({'error': 'A profile is already running on this worker.'}), 409
+    return jsonify({'id': profile_id, 'pid': os.getpid(), 'seconds': min(seconds, profiler.MAX_SECONDS)}), 202
+
+
+@bp.route('/admin/profile')
+def list_profiles():
+    return jsonify(profiler.list_profiles())
+
+
+@bp.route('/admin/profile/<profile_id>')
+def get_profile(profile_id):
+    st = profiler.status(profile_id)
+    if st is None:
+        return jsonify({'error': 'Unknown profile'}), 404
+    if st == 'running':
+        return jsonify({'id': profile_id, 'status': 'running'}), 202
+    return Response(profiler.load(profile_id) or '', content_type='text/plain; charset=utf-8')
+
+
+# ---- Caches (this worker's; see services/cache_registry.py) ----
+
+@bp.route('/admin/caches')
+def list_caches():
+    return jsonify({'pid': os.getpid(), 'caches': cache_registry.all_stats()})
+
+
+@bp.route('/admin/caches/<name>')
+def get_cache(name):
+    st = cache_registry.stats(name)
+    if st is None:
+        return jsonify({'error': 'Unknown cache'}), 404
+    return jsonify({'pid': os.getpid(), **st})
+
+
+@bp.route('/admin/caches/<name>/invalidate', methods=['POST'])
+def invalidate_cache(name):
+    keys = (request.get_json(silent=True) or {}).get('keys')
+    if keys is not None and not isinstance(keys, list):
+        return jsonify({'error': 'keys must be a list'}), 400
+    try:
+        removed = cache_registry.invalidate(name, keys)
+    except PermissionError:
+        return jsonify({'error': 'This cache is read-only.'}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if removed is None:
+        return jsonify({'error': 'Unknown cache'}), 404
+    return jsonify({'pid': os.getpid(), 'name': name, 'removed': removed})
+
+
+@bp.route('/admin/caches/warm', methods=['POST'])
+def warm_caches():
+    data = request.get_json(silent=True) or {}
+    try:
+        start = int(data.get('start') or request.args.get('start'))
+        end = int(data.get('end') or request.args.get('end') or start)
+    except Exception:
+        return jsonify({'error': 'Invalid start or end'}), 400
+    if start < 1 or end < start or end - start + 1 > cache_registry.MAX_WARM_IDS:
+        return jsonify({'error': f'Expected 1 <= start <= end and at most {cache_registry.MAX_WARM_IDS} ids'}), 400
+    if not cache_registry.warm_range(start, end):
+        return jsonify({'error': 'A warm is already running on this worker.', **cache_registry.warm_status()}), 409
+    return jsonify({'pid': os.getpid(), **cache_registry.warm_status()}), 202
+
+
+@bp.route('/admin/caches/warm')
+def warm_status():
+    return jsonify({'pid': os.getpid(), **cache_registry.warm_status()})
+
+
+@bp.route('/admin/species/<int:pid>/refresh', methods=['POST'])
+def refresh_species(pid):
+    return jsonify({'pid': os.getpid(), **cache_registry.refresh_species(pid)})
@@ -2,11 +2,14 @@ from typing import Set, Tuple
 
 from services.pokemon import (
     SUPPORTED_LANGS,
+    CORE_LANGS,
     get_pokemon_list,
     get_localized_name,
     ensure_language_filled,
-    normalize_name,
+    get_species_metadata,
 )
+from services import aliases, dataset, fuzzy, name_shards
+from services.text_utils import name_key
 
 
 def _display_en_and_slug(pid: int):
@@ -26,7 +29,7 @@ def build_aliases(pid: int, lang: str) -> Tuple[Set[str], str]:
     - PokeAPI slug
     - English display name
     - Localized name in current UI language (with cache warmup)
-    - All supported localized names as a final fallback
+    - Localized names in the core languages as a final fallback
 
     Returns (aliases_set, localized_display_name_for_lang)
     """
@@ -40,9 +43,9 @@ def build_aliases(pid: int, lang: str) -> Tuple[Set[str], str]:
 
     # Base identifiers
     if slug:
-        aliases.add(normalize_name(slug))
+        aliases.add(name_key(slug))
     if display_en:
-        aliases.add(normalize_name(display_en))
+        aliases.add(name_key(display_en))
 
     # Attempt preferred language
     try:
@@ -50,7 +53,7 @@ def build_aliases(pid: int, lang: str) -> Tuple[Set[str], str]:
     except Exception:
         localized = display_en or slug
     if localized:
-        aliases.add(normalize_name(localized))
+        aliases.add(name_key(localized))
 
     # Ensure cache for preferred language and retry once
     try:
@@ -58,20 +61,61 @@ def build_aliases(pid: int, lang: str) -> Tuple[Set[str], str]:
         try:
             localized2 = get_localized_name(pid, l)
             if localized2:
-                aliases.add(normalize_name(localized2))
+                aliases.add(name_key(localized2))
                 localized = localized2 or localized
         except Exception:
             pass
     except Exception:
         pass
 
-    # Add all supported localized names as a final safety net
-    for lang_code in SUPPORTED_LANGS:
+    # Add the core languages' names as a final safety net (other languages stay lazy)
+    for lang_code in CORE_LANGS:
         try:
             nm = get_localized_name(pid, lang_code)
             if nm:
-                aliases.add(normalize_name(nm))
+                aliases.add(name_key(nm))
         except Exception:
             continue
 
     return aliases, (localized or display_en or slug or "")
+
+
+def _cached_display_name(pid: int, lang: str) -> str:
+    """Localized name from in-memory caches only (English display as fallback)."""
+    name = name_shards.get(pid, lang)
+    if name:
+        return name
+    display_en, slug = _display_en_and_slug(pid)
+    return display_en or slug or str(pid)
+
+
+def did_you_mean(guess: str, lang: str):
+    """Localized name of the closest known Pokémon for a guess that is not an exact
+    name in any language (typo tolerance), or None."""
+    if aliases.lookup(guess) is not None:
+        return None
+    pid = fuzzy.did_you_mean(guess)
+    return _cached_display_name(pid, lang) if pid else None
+
+
+def fuzzy_suggestions(q: str, lang: str, limit: int, allowed_ids=None) -> list:
+    """Localized names of species whose aliases are within a small edit distance of q."""
+    names = []
+    for pid, _, _ in fuzzy.match(q, limit=limit * 2):
+        if allowed_ids is not None and pid not in allowed_ids:
+            continue
+        name = _cached_display_name(pid, lang)
+        if name not in names:
+            names.append(name)
+        if len(names) >= limit:
+            break
+    return names
+
+
+def species_meta(pid: int) -> dict:
+    """Color and generation hints ({'color', 'generation'} strings) from the attribute
+    table, or from PokeAPI when the dataset is not built."""
+    attrs = dataset.attrs_for(pid)
+    if attrs is not None:
+        return {'color': attrs['color'] or '', 'generation': str(attrs['generation'] or '')}
+    return get_species_metadata(pid)
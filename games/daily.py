@@ -1,18 +1,22 @@
 from flask import Blueprint, jsonify, render_template, request
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import hashlib
+import json
+import threading
 
+from services.core import POKEAPI_BASE
 from services.pokemon import (
+    SUPPORTED_LANGS,
+    CORE_LANGS,
     get_pokemon_list,
     get_localized_name,
-    ensure_language_filled,
-    normalize_name,
-    SPECIES_NAMES,
     get_sprite_for_pokemon,
     get_species_metadata,
     resolve_variant_guess_to_species_id,
 )
 from services.entries import get_pokedex_entry
+from services import aliases, cache_registry, dataset, evolution, daily_eval, metrics, name_shards
+from .common import did_you_mean
 
 import requests
 import time
@@ -24,8 +28,15 @@ ATTR_CACHE = {}  # id -> attrs dict
 CHAIN_CACHE = {}  # evo_chain_url -> parsed chain data
 SPECIES_CACHE = {}  # id -> species json
 POKEMON_CACHE = {}  # id -> pokemon json
-# Name index per language: normalized name -> id (species id preferred)
-NAME_INDEX = {}  # lang -> { normalized_name: id }
+# Precomputed /api/daily/meta payloads: date_key -> { lang: payload }
+META_CACHE = {}
+_META_LOCK = threading.Lock()  # guards publishing into META_CACHE and _META_KEY_LOCKS
+_META_KEY_LOCKS = {}  # (date_key, lang) -> lock held while that payload is built
+# Precompute tomorrow's answer this long before 00:00 UTC
+ROLLOVER_LEAD_SECONDS = 10 * 60
+ROLLOVER_RETRY_SECONDS = 5 * 60  # next tick when a day could not be fully built
+MAX_CANDIDATE_GUESSES = 200  # far beyond any real game; bounds the feedback matrix per request
+_ROLLOVER_TIMER = None
 
 
 @bp.route('/daily')
@@ -38,15 +49,31 @@ def _today_key_utc() -> str:
     return now.strftime('%Y-%m-%d')
 
 
+def _date_param(raw) -> tuple[str | None, str | None]:
+    """Resolve an optional ?date=YYYY-MM-DD to a date key. Returns (date_key, error).
+    Today is always playable; past dates only when covered by the precomputed calendar.
+    """
+    today = _today_key_utc()
+    if not raw:
+        return today, None
+    try:
+        date_key = datetime.strptime(str(raw).strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None, 'Invalid date'
+    if date_key == today:
+        return today, None
+    if date_key > today or date_key not in dataset.CALENDAR:
+        return None, 'No puzzle available for this date'
+    return date_key, None
+
+
 def _pick_daily_id(date_key: str) -> int:
-    lst = get_pokemon_list()
-    if not lst:
-        return 1
+    # Dates covered by the precomputed calendar are frozen
+    entry = dataset.CALENDAR.get(date_key)
+    if entry:
+        return int(entry['id'])
     # Deterministic selection based on date string
-    h = hashlib.sha256(date_key.encode('utf-8')).hexdigest()
-    num = int(h[:8], 16)
-    idx = num % len(lst)
-    return lst[idx]['id']
+    return dataset.hash_daily_id(date_key, [p['id'] for p in get_pokemon_list()])
 
 
 def _fetch_json(url: str, timeout: int = 12):
@@ -57,8 +84,10 @@ def _fetch_json(url: str, timeout: int = 12):
 
 def _get_species(pid: int):
     if pid in SPECIES_CACHE:
+        metrics.cache_event('daily_species', 'hit')
         return SPECIES_CACHE[pid]
-    j = _fetch_json(f'https://pokeapi.co/api/v2/pokemon-species/{pid}')
+    metrics.cache_event('daily_species', 'miss')
+    j = _fetch_json(f'{POKEAPI_BASE}/pokemon-species/{pid}')
     SPECIES_CACHE[pid] = j
     return j
 
@@ -76,8 +105,10 @@ def _species_id_for_pokemon(pid: int) -> int | None:
 
 def _get_pokemon(pid: int):
     if pid in POKEMON_CACHE:
+        metrics.cache_event('daily_pokemon', 'hit')
         return POKEMON_CACHE[pid]
-    j = _fetch_json(f'https://pokeapi.co/api/v2/pokemon/{pid}')
+    metrics.cache_event('daily_pokemon', 'miss')
+    j = _fetch_json(f'{POKEAPI_BASE}/pokemon/{pid}')
     POKEMON_CACHE[pid] = j
     return j
 
@@ -108,7 +139,9 @@ def _get_chains_for_species_json(species_json: dict):
     if not evo_url:
         return []
     if evo_url in CHAIN_CACHE:
+        metrics.cache_event('daily_chain', 'hit')
         return CHAIN_CACHE[evo_url]
+    metrics.cache_event('daily_chain', 'miss')
     chain_json = _fetch_json(evo_url)
     chains = _parse_chain(chain_json.get('chain') or {})
     CHAIN_CACHE[evo_url] = chains
@@ -117,7 +150,9 @@ def _get_chains_for_species_json(species_json: dict):
 
 def _attrs_for(pid: int):
     if pid in ATTR_CACHE:
+        metrics.cache_event('daily_attrs', 'hit')
         return ATTR_CACHE[pid]
+    metrics.cache_event('daily_attrs', 'miss')
     # Resolve to species id first (forms map to their species)
     species_id = _species_id_for_pokemon(pid) or pid
     sj = _get_species(species_id)
@@ -203,9 +238,9 @@ def _attrs_for_blocking(pid: int, retries: int = 3, delay: float = 0.2):
             last_exc = e
         # Clear simple per-id caches and retry after a short delay
         try:
-            ATTR_CACHE.pop(pid, None)
-            POKEMON_CACHE.pop(pid, None)
-            SPECIES_CACHE.pop(pid, None)
+            for name, cache in (('daily_attrs', ATTR_CACHE), ('daily_pokemon', POKEMON_CACHE), ('daily_species', SPECIES_CACHE)):
+                if cache.pop(pid, None) is not None:
+                    metrics.cache_event(name, 'eviction')
         except Exception:
             pass
         time.sleep(max(0.0, delay))
@@ -220,85 +255,72 @@ def _attrs_for_blocking(pid: int, retries: int = 3, delay: float = 0.2):
     return _attrs_for(pid)
 
 
+def _daily_attrs(pid: int):
+    """Attributes for feedback: precomputed table row when available (pure in-memory),
+    otherwise the live PokeAPI path with retries.
+    """
+    attrs = dataset.attrs_for(pid)
+    if attrs is not None:
+        return attrs
+    return _attrs_for_blocking(pid)
+
+
+for _name, _metric in (('ATTR_CACHE', 'daily_attrs'), ('CHAIN_CACHE', 'daily_chain'), ('SPECIES_CACHE', 'daily_species'),
+                       ('POKEMON_CACHE', 'daily_pokemon'), ('META_CACHE', 'daily_meta')):
+    cache_registry.configure(f'games.daily.{_name}', metric=_metric)
+cache_registry.add_warmer('daily_attrs', _daily_attrs)
+
+
+def _evo_relation(gus: dict, ans: dict) -> str:
+    """Evolution category of the guess relative to the answer.
+    Live attrs carry the answer's family/stage_map; table attrs use the global graph, or
+    the answer's live chain when the graph was not built.
+    """
+    if gus['species_slug'] == ans['species_slug']:
+        return 'same'
+    if 'family' not in ans:
+        if evolution.is_loaded():
+            return evolution.relation(gus['species_id'], ans['species_id'])
+        ans = _attrs_for_blocking(ans['species_id'])
+    if gus['species_slug'] not in ans['family']:
+        return 'unrelated'
+    # both in same family; compare stage indices if available
+    smap = ans['stage_map'] or {}
+    gi = smap.get(gus['species_slug'])
+    ai = smap.get(ans['species_slug'])
+    if gi is None or ai is None:
+        return 'same-family'
+    if gi < ai:
+        return 'pre'
+    if gi > ai:
+        return 'post'
+    return 'same'
+
+
 def _ensure_name_index(lang: str):
-    """Build a fast normalized name -> id index for a language.
-    Ensures localized names for that language are cached, then indexes:
-    - English display names
-    - English API slugs
-    - Localized species names for the requested language
+    """Return the normalized name -> species id index for a language. The index is
+    maintained incrementally by services/aliases.py (name shards and live name fetches).
     """
-    l = (lang or 'en').lower()
-    idx = NAME_INDEX.get(l)
-    if idx:
-        return idx
-    # Make sure localized names are available in SPECIES_NAMES for this language
-    try:
-        ensure_language_filled(l)
-    except Exception:
-        pass
-    idx = {}
-    lst = get_pokemon_list()
-    for p in lst:
-        pid = p['id']
-        # Prefer species id; get_pokemon_list ids are species ids already for list
-        en_name = p.get('display_en') or ''
-        slug = p.get('slug') or ''
-        if en_name:
-            idx[normalize_name(en_name)] = pid
-        if slug:
-            idx[normalize_name(slug)] = pid
-        # Add cached localized names if available
-        loc_map = SPECIES_NAMES.get(pid) or {}
-        loc = loc_map.get(l)
-        if loc:
-            idx[normalize_name(loc)] = pid
-    NAME_INDEX[l] = idx
-    return idx
+    lang = (lang or 'en').lower()
+    if lang in SUPPORTED_LANGS:
+        name_shards.shard(lang)
+    return aliases.index_for(lang)
 
 
 def _resolve_guess_to_id(guess: str, lang: str) -> int | None:
+    """Resolve a guess to a species id with in-memory lookups only (any language,
+    then known forms like "Zacian Crowned"). Unknown names return None without
+    touching PokeAPI.
+    """
     if not guess:
         return None
-    gnorm = normalize_name(guess)
-    # Use fast local index first (no network)
-    idx = _ensure_name_index(lang)
-    pid = idx.get(gnorm)
+    lang = (lang or 'en').lower()
+    if lang in SUPPORTED_LANGS:
+        name_shards.shard(lang)
+    pid = aliases.lookup(guess, lang)
     if pid:
         return pid
-    # Fallback: try English name/slug scan only (no network)
-    for p in get_pokemon_list():
-        if normalize_name(p.get('display_en') or '') == gnorm:
-            return p['id']
-        if normalize_name(p.get('slug') or '') == gnorm:
-            return p['id']
-    # As a stronger fallback for localized inputs (e.g., German names like "Bluzuk"),
-    # resolve deterministically by probing localized names on-demand and caching the result.
-    try:
-        lst = get_pokemon_list()
-        for p in lst:
-            pid_try = p['id']
-            try:
-                loc = get_localized_name(pid_try, lang)
-            except Exception:
-                loc = None
-            if loc and normalize_name(loc) == gnorm:
-                # Cache in the name index for future requests
-                try:
-                    NAME_INDEX.setdefault((lang or 'en').lower(), {})[gnorm] = pid_try
-                except Exception:
-                    pass
-                return pid_try
-    except Exception:
-        pass
-    # Variant/form fallback: try mapping guesses like "Zacian Crowned" to species id
-    try:
-        sid = resolve_variant_guess_to_species_id(guess)
-        if isinstance(sid, int):
-            return sid
-    except Exception:
-        pass
-    # Give up
-    return None
+    return resolve_variant_guess_to_species_id(guess, offline=True)
 
 
 @bp.route('/api/daily/guess', methods=['POST'])
@@ -306,24 +328,30 @@ def api_guess():
     data = request.get_json(silent=True) or {}
     guess_raw = (data.get('guess') or '').strip()
     lang = (data.get('lang') or 'en').lower()
-    date_key = _today_key_utc()
+    date_key, err = _date_param(data.get('date') or request.args.get('date'))
+    if err:
+        return jsonify({'error': err}), 404
     answer_id = _pick_daily_id(date_key)
+    archived = dataset.CALENDAR.get(date_key)
 
     guess_id = _resolve_guess_to_id(guess_raw, lang)
     if not guess_id:
-        # Ensure language names are ready and retry once
-        try:
-            ensure_language_filled(lang)
-            NAME_INDEX.pop((lang or 'en').lower(), None)
-        except Exception:
-            pass
-        guess_id = _resolve_guess_to_id(guess_raw, lang)
-    if not guess_id:
-        return jsonify({'error': 'Unknown Pokémon name'}), 400
-
-    # Build feedback (block until required data is ready)
-    ans = _attrs_for_blocking(answer_id)
-    gus = _attrs_for_blocking(guess_id)
+        out = {'error': 'Unknown Pokémon name'}
+        suggestion = did_you_mean(guess_raw, lang)
+        if suggestion:
+            out['did_you_mean'] = suggestion
+        return jsonify(out), 400
+
+    # Build feedback (table lookup, or block until live data is ready).
+    # Calendar dates use the frozen answer row and never fetch live data.
+    if archived:
+        ans = archived['attrs']
+        gus = dataset.attrs_for(guess_id)
+        if gus is None:
+            return jsonify({'error': 'Unknown Pokémon name'}), 400
+    else:
+        ans = _daily_attrs(answer_id)
+        gus = _daily_attrs(guess_id)
 
     # Types: evaluate per slot (primary and secondary independently)
     ans_types = ans.get('types') or []
@@ -351,25 +379,7 @@ def api_guess():
             gen_dir = 'lower'
 
     # Evolution relation (category)
-    evo = 'unrelated'
-    if gus['species_slug'] == ans['species_slug']:
-        evo = 'same'
-    else:
-        fam = ans['family']
-        if gus['species_slug'] in fam:
-            # both in same family; compare stage indices if available
-            smap = ans['stage_map'] or {}
-            gi = smap.get(gus['species_slug'])
-            ai = smap.get(ans['species_slug'])
-            if gi is not None and ai is not None:
-                if gi < ai:
-                    evo = 'pre'
-                elif gi > ai:
-                    evo = 'post'
-                else:
-                    evo = 'same'
-            else:
-                evo = 'same-family'
+    evo = _evo_relation(gus, ans)
 
     # Height/Weight: binary status with directional hint
     h_dir = None
@@ -422,14 +432,18 @@ def api_guess():
 
     # Localized names for display (use species id to avoid 404 on forms)
     guess_name = get_localized_name(gus.get('species_id') or guess_id, lang)
-    answer_name = get_localized_name(ans.get('species_id') or answer_id, lang)
+    if archived:
+        answer_name = (archived['meta'].get(lang) or archived['meta']['en'])['name']
+    else:
+        answer_name = get_localized_name(ans.get('species_id') or answer_id, lang)
 
-    # Fetch sprite
-    sprite_url = ''
-    try:
-        sprite_url, _ = get_sprite_for_pokemon(gus.get('species_id') or guess_id)
-    except Exception:
-        sprite_url = ''
+    # Sprite from the table when available, otherwise fetch
+    sprite_url = dataset.sprite_for(gus.get('species_id') or guess_id)
+    if not sprite_url:
+        try:
+            sprite_url, _ = get_sprite_for_pokemon(gus.get('species_id') or guess_id)
+        except Exception:
+            sprite_url = ''
 
     fb = {
         'name': guess_name,
@@ -452,11 +466,59 @@ def api_guess():
     })
 
 
+@bp.route('/api/daily/candidates', methods=['POST'])
+def api_candidates():
+    """Count species still consistent with the player's feedback so far.
+    Body: { ids: [species ids guessed], guesses: [names, alternative to ids], lang, hint: bool, date }
+    """
+    data = request.get_json(silent=True) or {}
+    lang = (data.get('lang') or 'en').lower()
+    # The feedback codes need the evolution graph as well as the table
+    if not dataset.is_loaded() or not evolution.is_loaded():
+        return jsonify({'error': 'Candidate evaluation is unavailable'}), 503
+    date_key, err = _date_param(data.get('date') or request.args.get('date'))
+    if err:
+        return jsonify({'error': err}), 404
+    answer_row = dataset.row_for(_pick_daily_id(date_key))
+    if answer_row < 0:
+        return jsonify({'error': 'Candidate evaluation is unavailable'}), 503
+    raw_ids = data.get('ids') or []
+    raw_guesses = data.get('guesses') or []
+    if not isinstance(raw_ids, list) or not isinstance(raw_guesses, list):
+        return jsonify({'error': 'ids and guesses must be lists'}), 400
+    if len(raw_ids) + len(raw_guesses) > MAX_CANDIDATE_GUESSES:
+        return jsonify({'error': f'At most {MAX_CANDIDATE_GUESSES} guesses are supported'}), 400
+    guess_ids = []
+    for x in raw_ids:
+        if isinstance(x, (int, str)) and str(x).isdigit():
+            guess_ids.append(int(x))
+    for g in raw_guesses:
+        pid = _resolve_guess_to_id(str(g or '').strip(), lang)
+        if pid:
+            guess_ids.append(pid)
+    # Repeating a guess adds no information
+    rows = [r for r in dict.fromkeys(dataset.row_for(pid) for pid in guess_ids) if r >= 0]
+    mask = daily_eval.consistent_mask(rows, answer_row)
+    out = {'remaining': int(mask.sum()), 'total': int(len(mask))}
+    if data.get('hint') and out['remaining'] > 1:
+        row, worst = daily_eval.best_guess(mask)
+        if row is not None:
+            pid = int(dataset.ATTRS['id'][row])
+            try:
+                name = get_localized_name(pid, lang)
+            except Exception:
+                name = str(pid)
+            out['hint'] = {'id': pid, 'name': name, 'worst_case_remaining': worst}
+    return jsonify(out)
+
+
 @bp.route('/api/daily/translate', methods=['POST'])
 def api_daily_translate():
     data = request.get_json(silent=True) or {}
     ids = data.get('ids') or []
     lang = (data.get('lang') or 'en').lower()
+    if lang not in SUPPORTED_LANGS:
+        lang = 'en'
     try:
         ids = [int(x) for x in ids if isinstance(x, (int, str)) and str(x).isdigit()]
     except Exception:
@@ -470,41 +532,178 @@ def api_daily_translate():
     return jsonify({ 'names': names })
 
 
-# Provide today’s answer metadata for client hint system (sprite/color/generation)
-@bp.route('/api/daily/meta')
-def api_daily_meta():
-    lang = (request.args.get('lang') or 'en').lower()
-    date_key = _today_key_utc()
-    pid = _pick_daily_id(date_key)
+def _build_meta(pid: int, lang: str) -> tuple[dict, bool]:
+    """Compute the /api/daily/meta payload for an answer id (upstream lookups).
+    Returns (payload, complete); complete is False when a lookup failed and a fallback
+    was used, in which case the payload must not be cached.
+    """
+    complete = True
     try:
         # Localized display name for the species id
         name = get_localized_name(pid, lang)
     except Exception:
+        complete = False
         # Fallback to English if localization fails transiently
         try:
             name = get_localized_name(pid, 'en')
         except Exception:
             name = str(pid)
-    # Fetch sprite and species metadata for hints
-    sprite_url = ''
-    try:
-        sprite_url, _ = get_sprite_for_pokemon(pid)
-    except Exception:
-        sprite_url = ''
-    try:
-        meta = get_species_metadata(pid)
-    except Exception:
-        meta = {'color': '', 'generation': ''}
+    # Sprite and species metadata for hints
+    sprite_url = dataset.sprite_for(pid)
+    if not sprite_url:
+        try:
+            sprite_url, _ = get_sprite_for_pokemon(pid)
+        except Exception:
+            complete = False
+            sprite_url = ''
+    attrs = dataset.attrs_for(pid)
+    if attrs is not None:
+        meta = {'color': attrs['color'] or '', 'generation': str(attrs['generation'] or '')}
+    else:
+        try:
+            meta = get_species_metadata(pid)
+        except Exception:
+            complete = False
+            meta = {'color': '', 'generation': ''}
     # Localized Pokédex entry (flavor text)
     try:
         entry = get_pokedex_entry(pid, lang) or ''
     except Exception:
+        complete = False
         entry = ''
-    return jsonify({
+    return {
         'id': pid,
         'name': name,
         'sprite': sprite_url or '',
         'color': meta.get('color') or '',
         'generation': meta.get('generation') or '',
         'entry': entry,
-    })
+    }, complete
+
+
+def _publish_meta(date_key: str, payloads: dict):
+    # Single assignment: readers see a day's languages either before or after the merge
+    with _META_LOCK:
+        META_CACHE[date_key] = {**(META_CACHE.get(date_key) or {}), **payloads}
+
+
+def _precompute_day(date_key: str) -> bool:
+    """Build meta payloads for the core languages and publish them in one step
+    (other languages are built on first request). Payloads that needed a fallback are
+    left out so they are retried. Returns True when every core language was published."""
+    pid = _pick_daily_id(date_key)
+    built = {lang: _build_meta(pid, lang) for lang in sorted(CORE_LANGS)}
+    try:
+        _daily_attrs(pid)
+    except Exception:
+        pass
+    payloads = {lang: payload for lang, (payload, complete) in built.items() if complete}
+    if payloads:
+        _publish_meta(date_key, payloads)
+    today = _today_key_utc()
+    with _META_LOCK:
+        for old in [k for k in META_CACHE if k < today]:
+            if META_CACHE.pop(old, None) is not None:
+                metrics.cache_event('daily_meta', 'eviction')
+        for key in [k for k in _META_KEY_LOCKS if k[0] < today]:
+            del _META_KEY_LOCKS[key]
+    return len(payloads) == len(built)
+
+
+def _meta_for(date_key: str, lang: str) -> tuple[dict, bool]:
+    """(payload, complete) for a date and language; incomplete payloads are not cached."""
+    archived = dataset.CALENDAR.get(date_key)
+    if archived:
+        payload = archived['meta'].get(lang)
+        if payload is None:
+            # The calendar freezes the core languages; only the name is localized here
+            payload = dict(archived['meta']['en'])
+            localized = name_shards.get(archived['id'], lang)
+            if localized is None:
+                return payload, False
+            payload['name'] = localized
+        return payload, True
+    payload = (META_CACHE.get(date_key) or {}).get(lang)
+    if payload is not None:
+        metrics.cache_event('daily_meta', 'hit')
+        return payload, True
+    metrics.cache_event('daily_meta', 'miss')
+    # Cold miss (e.g. worker started after rollover): build once per day and language, not
+    # per request. Only requests for the same key wait on each other's upstream lookups.
+    with _META_LOCK:
+        key_lock = _META_KEY_LOCKS.setdefault((date_key, lang), threading.Lock())
+    with key_lock:
+        payload = (META_CACHE.get(date_key) or {}).get(lang)
+        if payload is not None:
+            return payload, True
+        payload, complete = _build_meta(_pick_daily_id(date_key), lang)
+        if complete:
+            _publish_meta(date_key, {lang: payload})
+        return payload, complete
+
+
+def _seconds_to_rollover(now: datetime | None = None) -> float:
+    now = now or datetime.now(timezone.utc)
+    nxt = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (nxt - now).total_seconds()
+
+
+def _rollover_tick():
+    """Timer callback: make sure today's and tomorrow's answers are precomputed,
+    then schedule the next run shortly before 00:00 UTC."""
+    global _ROLLOVER_TIMER
+    now = datetime.now(timezone.utc)
+    incomplete = False
+    for date_key in (now.strftime('%Y-%m-%d'), (now + timedelta(days=1)).strftime('%Y-%m-%d')):
+        if not CORE_LANGS <= set(META_CACHE.get(date_key) or {}):
+            try:
+                incomplete |= not _precompute_day(date_key)
+            except Exception:
+                incomplete = True
+    delay = _seconds_to_rollover() - ROLLOVER_LEAD_SECONDS
+    if delay <= 0:
+        delay += 24 * 60 * 60
+    if incomplete:
+        delay = min(delay, ROLLOVER_RETRY_SECONDS)
+    _ROLLOVER_TIMER = threading.Timer(delay, _rollover_tick)
+    _ROLLOVER_TIMER.daemon = True
+    _ROLLOVER_TIMER.start()
+
+
+def start_rollover_scheduler():
+    """Start the per-worker rollover precompute (no-op when already running)."""
+    global _ROLLOVER_TIMER
+    if _ROLLOVER_TIMER is not None:
+        return
+    _ROLLOVER_TIMER = threading.Timer(0, _rollover_tick)
+    _ROLLOVER_TIMER.daemon = True
+    _ROLLOVER_TIMER.start()
+
+
+# Provide today’s answer metadata for client hint system (sprite/color/generation)
+@bp.route('/api/daily/meta')
+def api_daily_meta():
+    lang = (request.args.get('lang') or 'en').lower()
+    if lang not in SUPPORTED_LANGS:
+        lang = 'en'
+    date_key, err = _date_param(request.args.get('date'))
+    if err:
+        return jsonify({'error': err}), 404
+    payload, complete = _meta_for(date_key, lang)
+    resp = jsonify(payload)
+    if not complete:
+        # Built from fallbacks after an upstream failure: let the next request retry
+        resp.cache_control.no_store = True
+        return resp
+    # Cacheable until the next rollover (past days: for a year); the answer for a date never changes
+    if date_key == _today_key_utc():
+        max_age = max(0, int(_seconds_to_rollover()))
+    else:
+        max_age = 365 * 24 * 60 * 60
+        resp.cache_control.immutable = True
+    resp.cache_control.public = True
+    resp.cache_control.max_age = max_age
+    resp.expires = datetime.now(timezone.utc) + timedelta(seconds=max_age)
+    body = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    resp.set_etag(hashlib.sha256(body.encode('utf-8')).hexdigest()[:32])
+    return resp.make_conditional(request)
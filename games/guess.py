@@ -11,15 +11,16 @@ from services.pokemon import (
     get_localized_name,
     get_sprite_for_pokemon,
     ensure_language_filled,
-    normalize_name,
-    SPECIES_NAMES,
     filter_pokemon_list_by_gen,
     pick_random_id_for_gen,
     get_species_metadata,
     resolve_variant_guess_to_species_id,
 )
+from services import derivatives, name_shards, tracing
+from services.text_utils import name_key
 from services.tokens import sign_token as _sign_token, verify_token as _verify_token
-from .common import build_aliases
+from .common import build_aliases, did_you_mean, fuzzy_suggestions
+from .media import proxied_artwork, tile_urls
 
 bp = Blueprint('guess', __name__)
 
@@ -46,11 +47,8 @@ def all_names():
             names = [p['display_en'] for p in lst]
             return jsonify(names)
         ensure_language_filled(lang)
-        names = []
-        for p in lst:
-            pid = p['id']
-            nm = SPECIES_NAMES.get(pid, {}).get(lang) or p['display_en']
-            names.append(nm)
+        localized = name_shards.get_many([p['id'] for p in lst], lang)
+        names = [nm or p['display_en'] for p, nm in zip(lst, localized)]
         return jsonify(names)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -68,18 +66,16 @@ def pokemon_names():
         if lang == 'en':
             names = [p['display_en'] for p in lst]
             return jsonify(names)
-        names_loc = []
-        for p in lst:
-            pid = p['id']
-            name = SPECIES_NAMES.get(pid, {}).get(lang)
-            if not name:
-                try:
-                    # ensure_language_filled will parallel fetch
-                    ensure_language_filled(lang)
-                except Exception:
-                    pass
-                name = SPECIES_NAMES.get(pid, {}).get(lang) or p['display_en']
-            names_loc.append(name)
+        ids = [p['id'] for p in lst]
+        localized = name_shards.get_many(ids, lang)
+        if None in localized:
+            try:
+                # ensure_language_filled will parallel fetch
+                ensure_language_filled(lang)
+            except Exception:
+                pass
+            localized = name_shards.get_many(ids, lang)
+        names_loc = [name or p['display_en'] for p, name in zip(lst, localized)]
         return jsonify(names_loc)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -91,11 +87,13 @@ def pokemon_suggest():
         q = (request.args.get('q') or '').strip()
         limit = int(request.args.get('limit', '20'))
         lang = (request.args.get('lang') or 'en').lower()
+        gen = (request.args.get('gen') or '').strip()
         if lang not in SUPPORTED_LANGS:
             lang = 'en'
         if limit <= 0:
             limit = 20
         lst = get_pokemon_list()
+        lst = filter_pokemon_list_by_gen(lst, gen)
         if not q:
             return jsonify([])
 
@@ -108,17 +106,18 @@ def pokemon_suggest():
                 selected = (starts + contains)[:limit]
             else:
                 selected = starts[:limit]
+            if not selected:
+                selected = fuzzy_suggestions(q, lang, limit, {p['id'] for p in lst})
             return jsonify(selected)
 
-        q_norm = normalize_name(q)
+        q_norm = name_key(q)
         results = []
         seen = set()
 
         cached_entries = []  # list of (id, name)
         missing_ids = []
-        for p in lst:
+        for p, name_loc in zip(lst, name_shards.get_many([p['id'] for p in lst], lang)):
             pid = p['id']
-            name_loc = SPECIES_NAMES.get(pid, {}).get(lang)
             if name_loc:
                 cached_entries.append((pid, name_loc))
             else:
@@ -128,7 +127,7 @@ def pokemon_suggest():
             nonlocal results
             if not name_loc:
                 return False
-            nn = normalize_name(name_loc)
+            nn = name_key(name_loc)
             if nn.startswith(q_norm) or (q_norm in nn and len(results) < limit):
                 if name_loc not in seen:
                     results.append(name_loc)
@@ -141,6 +140,8 @@ def pokemon_suggest():
                 break
             consider(name_loc)
 
+        if not results:
+            results = fuzzy_suggestions(q, lang, limit, {p['id'] for p in lst})
         if len(results) >= limit or not missing_ids:
             return jsonify(results[:limit])
 
@@ -154,11 +155,13 @@ def pokemon_suggest():
             except Exception:
                 return pid, None
 
-        futures = [EXECUTOR.submit(fetch_and_store, pid) for pid in ids_to_fetch]
-        for f in as_completed(futures):
-            pid, name_loc = f.result()
-            if consider(name_loc) and len(results) >= limit:
-                break
+        task = tracing.bind(fetch_and_store)
+        futures = [EXECUTOR.submit(task, pid) for pid in ids_to_fetch]
+        with tracing.span('executor', 'species'):
+            for f in as_completed(futures):
+                pid, name_loc = f.result()
+                if consider(name_loc) and len(results) >= limit:
+                    break
 
         return jsonify(results[:limit])
     except Exception as e:
@@ -180,8 +183,9 @@ def random_sprite():
                 token = _sign_token(pid)
                 TOKENS[token] = { 'name': name, 'id': pid }
                 bg_size = '500% 500%'
-                x = random.randint(15, 85)
-                y = random.randint(15, 85)
+                # The crop position comes from a seed so the server-cut tiles can be cached
+                seed = random.randrange(derivatives.CROP_SEEDS)
+                x, y = derivatives.crop_position(seed)
                 bg_pos = f"{x}% {y}%"
                 display_name = get_localized_name(pid, lang)
                 meta = get_species_metadata(pid)
@@ -189,9 +193,11 @@ def random_sprite():
                     'token': token,
                     'id': pid,
                     'name': display_name,
-                    'sprite': sprite,
+                    'sprite': proxied_artwork(pid, sprite),
                     'bg_size': bg_size,
                     'bg_pos': bg_pos,
+                    # Pre-cut crops, one per zoom-out step; the full sprite is only loaded on reveal
+                    'tiles': tile_urls(pid, seed),
                     'color': meta.get('color') or '',
                     'generation': meta.get('generation') or '',
                 })
@@ -229,7 +235,7 @@ def check_guess():
     if not answer:
         return jsonify({"error": "Invalid token"}), 400
 
-    guess_norm = normalize_name(guess)
+    guess_norm = name_key(guess)
 
     aliases, localized = build_aliases(answer['id'], lang)
     if guess_norm in aliases:
@@ -249,6 +255,9 @@ def check_guess():
         pass
 
     # No match — incorrect
-    # Return localized name for UI messaging (current language or fallback)
-    # Return localized name (best-effort) for UI messaging
-    return jsonify({'correct': False, 'name': localized})
+    # Return localized name (best-effort) for UI messaging, plus a typo suggestion if any
+    out = {'correct': False, 'name': localized}
+    suggestion = did_you_mean(guess, lang)
+    if suggestion:
+        out['did_you_mean'] = suggestion
+    return jsonify(out)
@@ -0,0 +1,165 @@
+import os
+import re
+
+from flask import Blueprint, abort, current_app, send_file
+
+from services import cries, dataset, derivatives, media_cache
+from services.pokemon import artwork_url, get_cry_for_pokemon, get_pokemon_list
+
+bp = Blueprint('media', __name__)
+
+TCG_ASSETS_BASE = 'https://assets.tcgdex.net'
+MEDIA_MAX_AGE = 365 * 24 * 60 * 60
+DERIVED_MAX_AGE = 7 * 24 * 60 * 60
+# <lang>/<serie>/<set>/<card>/<quality>.<ext>, as built by games/tcg.py
+_CARD_PATH = re.compile(r'^[a-z-]+(/[A-Za-z0-9._-]+){3}/(low|high)\.(webp|png|jpg)$')
+_KNOWN_IDS = (None, frozenset())  # (species list the ids were taken from, species ids)
+
+
+def enabled() -> bool:
+    return (os.environ.get('MEDIA_PROXY') or '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def _known_ids() -> frozenset:
+    """Species ids the games serve: the species list plus the species of known forms."""
+    global _KNOWN_IDS
+    lst = get_pokemon_list()
+    if _KNOWN_IDS[0] is not lst:
+        _KNOWN_IDS = (lst, frozenset(p['id'] for p in lst) | frozenset(dataset.FORMS.values()))
+    return _KNOWN_IDS[1]
+
+
+def _require_species(pid: int):
+    """404 for ids that are not a species, before anything is fetched or rendered for them."""
+    if dataset.row_for(pid) >= 0:
+        return
+    try:
+        known = pid in _known_ids()
+    except Exception as e:
+        current_app.logger.warning('Species list unavailable: %s', e)
+        abort(502)
+    if not known:
+        abort(404)
+
+
+def _serve(key: str, resolve_url):
+    try:
+        entry = media_cache.get(key, resolve_url)
+    except Exception as e:
+        current_app.logger.warning('Media fetch failed for %s: %s', key, e)
+        abort(502)
+    return _send(entry)
+
+
+def _send(entry):
+    if not entry:
+        abort(404)
+    # The blob is addressed by its content hash, so the response never changes: let
+    # browsers and CDNs keep it forever and answer revalidations/Range requests from disk
+    resp = send_file(
+        entry['path'], mimetype=entry['mimetype'], conditional=True,
+        etag=entry['hash'], max_age=MEDIA_MAX_AGE,
+    )
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+@bp.route('/media/artwork/<int:pid>')
+def artwork(pid: int):
+    _require_species(pid)
+    return _serve(f"artwork:{pid}", lambda: artwork_url(pid))
+
+
+@bp.route('/media/cry/<int:pid>')
+def cry(pid: int):
+    _require_species(pid)
+    # The recorded URL avoids a PokeAPI round trip; species missing from it are looked up live
+    return _serve(f"cry:{pid}", lambda: cries.url_for(pid) or get_cry_for_pokemon(pid)[0])
+
+
+def _serve_derived(pid: int, variant: str, level: int):
+    _require_species(pid)
+    try:
+        path = derivatives.get(pid, variant, level)
+    except LookupError:
+        abort(404)  # no artwork upstream
+    except Exception as e:
+        current_app.logger.warning('Derivative failed for %s/%s/%s: %s', variant, pid, level, e)
+        abort(502)
+    if not path:
+        abort(404)
+    resp = send_file(path, mimetype=derivatives.mimetype(), conditional=True, max_age=DERIVED_MAX_AGE)
+    resp.cache_control.public = True
+    return resp
+
+
+@bp.route('/media/silhouette/<int:pid>')
+def silhouette(pid: int):
+    return _serve_derived(pid, 'silhouette', 0)
+
+
+@bp.route('/media/pixelate/<int:pid>/<int:level>')
+def pixelate(pid: int, level: int):
+    return _serve_derived(pid, 'pixelate', level)
+
+
+@bp.route('/media/tile/<int:pid>/<int:seed>/<int:level>')
+def tile(pid: int, seed: int, level: int):
+    _require_species(pid)
+    try:
+        entry = derivatives.tile(pid, seed, level)
+    except LookupError:
+        abort(404)  # no artwork upstream
+    except Exception as e:
+        current_app.logger.warning('Tile failed for %s/%s/%s: %s', pid, seed, level, e)
+        abort(502)
+    return _send(entry)
+
+
+@bp.route('/media/card/<path:asset>')
+def card(asset: str):
+    if not _CARD_PATH.match(asset) or '..' in asset:
+        abort(404)
+    return _serve(f"card:{asset}", lambda: f"{TCG_ASSETS_BASE}/{asset}")
+
+
+def proxied_artwork(pid: int, upstream: str) -> str:
+    """URL the client should load a species' artwork from: the /media proxy when
+    MEDIA_PROXY is enabled, the upstream URL otherwise."""
+    if not upstream or not enabled():
+        return upstream
+    return f"/media/artwork/{int(pid)}"
+
+
+def proxied_cry(pid: int, upstream: str) -> str:
+    if not upstream or not enabled():
+        return upstream
+    return f"/media/cry/{int(pid)}"
+
+
+def proxied_card(upstream: str) -> str:
+    prefix = TCG_ASSETS_BASE + '/'
+    if not upstream or not enabled() or not upstream.startswith(prefix):
+        return upstream
+    asset = upstream[len(prefix):]
+    return f"/media/card/{asset}" if _CARD_PATH.match(asset) else upstream
+
+
+def derived_urls(pid: int, variant: str) -> list:
+    """URLs of a species' server-rendered derivative levels (coarsest first), queued for
+    rendering in the background; [] when derivatives are unavailable."""
+    if not derivatives.available():
+        return []
+    derivatives.note_round(pid, variant)
+    if variant == 'silhouette':
+        return [f"/media/silhouette/{int(pid)}"]
+    return [f"/media/pixelate/{int(pid)}/{level}" for level in range(derivatives.VARIANTS[variant])]
+
+
+def tile_urls(pid: int, seed: int) -> list:
+    """URLs of the sprite-crop tiles for a round, one per zoom step (most zoomed in first);
+    [] when derivatives are unavailable."""
+    if not derivatives.available():
+        return []
+    return [f"/media/tile/{int(pid)}/{int(seed)}/{level}" for level in range(len(derivatives.TILE_ZOOMS))]
@@ -0,0 +1,10 @@
+from flask import Blueprint, Response
+
+from services import metrics
+
+bp = Blueprint('metrics', __name__)
+
+
+@bp.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -8,6 +8,7 @@ from services.pokemon import (
     get_species_metadata,
 )
 from services.tokens import sign_token as _sign_token
+from .media import derived_urls, proxied_artwork
 
 bp = Blueprint('pixelate', __name__)
 
@@ -37,7 +38,9 @@ def random_pixelate():
                     'token': token,
                     'id': pid,
                     'name': display_name,
-                    'sprite': sprite,
+                    'sprite': proxied_artwork(pid, sprite),
+                    # One small pre-pixelated image per level (coarsest first, last is full detail)
+                    'levels': derived_urls(pid, 'pixelate'),
                     'color': meta.get('color') or '',
                     'generation': meta.get('generation') or '',
                 })
@@ -1,21 +1,22 @@
 from flask import Blueprint, jsonify, render_template, request, current_app
 import random
 import secrets
-import re
 
 from services.pokemon import (
     SUPPORTED_LANGS,
     get_pokemon_list,
     get_localized_name,
     get_pokedex_entry,
-    normalize_name,
     pick_random_id_for_gen,
     get_species_metadata,
-    get_sprite_for_pokemon,
+    artwork_url,
     resolve_variant_guess_to_species_id,
 )
+from services import dex_entries
+from services.entries import mask_names
 from services.tokens import sign_token as _sign_token, verify_token as _verify_token
-from .common import build_aliases
+from .common import build_aliases, species_meta
+from .media import proxied_artwork
 
 bp = Blueprint('pokedex', __name__, url_prefix='/pokedex')
 
@@ -29,6 +30,22 @@ def index():
 
 
 
+def _live_masked_entry(pid: int, lang: str, display_name: str) -> str:
+    """Fetch an entry from PokeAPI and mask the localized and English names (no dataset)."""
+    entry = get_pokedex_entry(pid, lang)
+    if not entry:
+        return ''
+    try:
+        display_en = get_localized_name(pid, 'en')
+    except Exception:
+        display_en = None
+    return mask_names(entry, [display_name, display_en])
+
+
+def _sprite_for(pid: int) -> str:
+    return proxied_artwork(pid, artwork_url(pid))
+
+
 @bp.route('/api/random-entry')
 def random_entry():
     try:
@@ -36,31 +53,20 @@ def random_entry():
         gen = (request.args.get('gen') or '').strip()
         if lang not in SUPPORTED_LANGS:
             lang = 'en'
+        prebuilt = dex_entries.is_loaded()
         for _ in range(30):
             pid = pick_random_id_for_gen(gen)
-            entry = get_pokedex_entry(pid, lang)
-            if entry:
+            display_name = get_localized_name(pid, lang)
+            # Entries are masked at build time; the live path masks on the fly
+            if prebuilt:
+                masked_entry = dex_entries.random_entry(pid, lang)
+            else:
+                masked_entry = _live_masked_entry(pid, lang, display_name)
+            if masked_entry:
                 token = _sign_token(pid)
-                # store canonical english slug for robust matching
-                display_name = get_localized_name(pid, lang)
-                # Mask the Pokémon's name in the entry (replace letters with underscores)
-                def mask_letters(s: str) -> str:
-                    return ''.join('_' if ch.isalpha() else ch for ch in s)
-                masked_entry = entry
-                if display_name:
-                    pattern = re.compile(re.escape(display_name), flags=re.IGNORECASE)
-                    masked_entry = pattern.sub(lambda m: mask_letters(m.group(0)), masked_entry)
-                # Also try masking the English name in case it appears in the localized entry
-                try:
-                    display_en = get_localized_name(pid, 'en')
-                except Exception:
-                    display_en = None
-                if display_en and display_en.lower() != (display_name or '').lower():
-                    pattern_en = re.compile(re.escape(display_en), flags=re.IGNORECASE)
-                    masked_entry = pattern_en.sub(lambda m: mask_letters(m.group(0)), masked_entry)
                 TOKENS[token] = {'name': display_name, 'id': pid}
-                meta = get_species_metadata(pid)
-                sprite_url, _ = get_sprite_for_pokemon(pid)
+                meta = species_meta(pid)
+                sprite_url = _sprite_for(pid)
                 return jsonify({
                     'token': token,
                     'id': pid,
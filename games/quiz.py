@@ -1,7 +1,94 @@
-from flask import Blueprint, render_template
+from flask import Blueprint, jsonify, render_template, request
+
+from services.pokemon import SUPPORTED_LANGS, get_localized_name
+from services.core import GEN_ID_RANGES
+from services import dataset, name_shards, quiz_bank
+from services.tokens import sign_token as _sign_token, verify_token as _verify_token
+from .media import proxied_artwork
 
 bp = Blueprint('quiz', __name__)
 
+# Kinds whose options are species (rendered with name and artwork) rather than values
+SPECIES_KINDS = {'height', 'weight', 'evolution'}
+
+
 @bp.route('/quiz')
 def quiz():
-    return render_template('quiz.html', title='Quiz (Coming Soon)', active_page='quiz')
+    return render_template('quiz.html', active_page='quiz')
+
+
+def _parse_gens(gen: str) -> set:
+    g = (gen or '').lower().strip()
+    if not g or g in {'all', 'any', '0'}:
+        return set()
+    return {int(s) for s in g.replace('|', ',').split(',') if s.strip() in GEN_ID_RANGES}
+
+
+# Question ids pack (generation, difficulty, row) into the signed token's integer
+def _qid(gen: int, difficulty: int, row: int) -> int:
+    return ((gen << 2 | difficulty) << 20) | row
+
+
+def _unpack_qid(qid: int):
+    return qid >> 22, (qid >> 20) & 3, qid & 0xFFFFF
+
+
+def _species(pid: int, lang: str) -> dict:
+    return {
+        'id': pid,
+        'name': name_shards.get(pid, lang) or get_localized_name(pid, lang),
+        'sprite': proxied_artwork(pid, dataset.sprite_for(pid)),
+    }
+
+
+def _option(kind: str, value: int, lang: str) -> dict:
+    if kind in SPECIES_KINDS:
+        return _species(value, lang)
+    if kind == 'color':
+        return {'value': dataset.COLOR_NAMES[value]}
+    if kind == 'type':
+        return {'value': dataset.TYPE_NAMES[value]}
+    return {'value': value}
+
+
+@bp.route('/api/quiz/question')
+def random_question():
+    try:
+        lang = (request.args.get('lang') or 'en').lower()
+        if lang not in SUPPORTED_LANGS:
+            lang = 'en'
+        gens = _parse_gens(request.args.get('gen'))
+        difficulty = (request.args.get('difficulty') or '').lower()
+        difficulty = quiz_bank.DIFFICULTIES.index(difficulty) if difficulty in quiz_bank.DIFFICULTIES else None
+        if not quiz_bank.is_loaded():
+            return jsonify({'error': 'The quiz is not available.'}), 503
+        # With a single generation selected, "which generation" would give itself away
+        picked = quiz_bank.pick(gens, difficulty, exclude_kinds=('generation',) if len(gens) == 1 else ())
+        if picked is None:
+            picked = quiz_bank.pick(None, difficulty)
+        if picked is None:
+            return jsonify({'error': 'Could not find a question.'}), 500
+        q = quiz_bank.question(*picked)
+        return jsonify({
+            'token': _sign_token(_qid(*picked)),
+            'kind': q['kind'],
+            'difficulty': q['difficulty'],
+            'subject': _species(q['subject'], lang) if q['subject'] else None,
+            'options': [_option(q['kind'], v, lang) for v in q['options']],
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/quiz/answer', methods=['POST'])
+def check_answer():
+    data = request.get_json(silent=True) or {}
+    qid = _verify_token(data.get('token')) if data.get('token') else None
+    q = quiz_bank.question(*_unpack_qid(qid)) if qid is not None and qid >= 0 else None
+    if not q:
+        return jsonify({'error': 'Invalid token'}), 400
+    try:
+        choice = int(data.get('choice'))
+    except Exception:
+        return jsonify({'error': 'Invalid choice'}), 400
+    return jsonify({'correct': choice == q['answer'], 'answer': q['answer']})
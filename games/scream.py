@@ -9,14 +9,16 @@ from services.pokemon import (
     get_pokemon_list,
     get_localized_name,
     ensure_language_filled,
-    normalize_name,
-    SPECIES_NAMES,
     filter_pokemon_list_by_gen,
     pick_random_id_for_gen,
     get_cry_for_pokemon,
     get_species_metadata,
 )
+from services import cries, name_shards, tracing
+from services.text_utils import name_key
 from services.tokens import sign_token as _sign_token, verify_token as _verify_token
+from .common import fuzzy_suggestions
+from .media import proxied_cry
 
 bp = Blueprint('scream', __name__)
 
@@ -43,11 +45,8 @@ def all_names():
             names = [p['display_en'] for p in lst]
             return jsonify(names)
         ensure_language_filled(lang)
-        names = []
-        for p in lst:
-            pid = p['id']
-            nm = SPECIES_NAMES.get(pid, {}).get(lang) or p['display_en']
-            names.append(nm)
+        localized = name_shards.get_many([p['id'] for p in lst], lang)
+        names = [nm or p['display_en'] for p, nm in zip(lst, localized)]
         return jsonify(names)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -65,17 +64,16 @@ def pokemon_names():
         if lang == 'en':
             names = [p['display_en'] for p in lst]
             return jsonify(names)
-        names_loc = []
-        for p in lst:
-            pid = p['id']
-            name = SPECIES_NAMES.get(pid, {}).get(lang)
-            if not name:
-                try:
-                    ensure_language_filled(lang)
-                except Exception:
-                    pass
-                name = SPECIES_NAMES.get(pid, {}).get(lang) or p['display_en']
-            names_loc.append(name)
+        ids = [p['id'] for p in lst]
+        localized = name_shards.get_many(ids, lang)
+        if None in localized:
+            try:
+                # ensure_language_filled will parallel fetch
+                ensure_language_filled(lang)
+            except Exception:
+                pass
+            localized = name_shards.get_many(ids, lang)
+        names_loc = [name or p['display_en'] for p, name in zip(lst, localized)]
         return jsonify(names_loc)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -106,17 +104,18 @@ def pokemon_suggest():
                 selected = (starts + contains)[:limit]
             else:
                 selected = starts[:limit]
+            if not selected:
+                selected = fuzzy_suggestions(q, lang, limit, {p['id'] for p in lst})
             return jsonify(selected)
 
-        q_norm = normalize_name(q)
+        q_norm = name_key(q)
         results = []
         seen = set()
 
         cached_entries = []  # list of (id, name)
         missing_ids = []
-        for p in lst:
+        for p, name_loc in zip(lst, name_shards.get_many([p['id'] for p in lst], lang)):
             pid = p['id']
-            name_loc = SPECIES_NAMES.get(pid, {}).get(lang)
             if name_loc:
                 cached_entries.append((pid, name_loc))
             else:
@@ -126,7 +125,7 @@ def pokemon_suggest():
             nonlocal results
             if not name_loc:
                 return False
-            nn = normalize_name(name_loc)
+            nn = name_key(name_loc)
             if nn.startswith(q_norm) or (q_norm in nn and len(results) < limit):
                 if name_loc not in seen:
                     results.append(name_loc)
@@ -139,6 +138,8 @@ def pokemon_suggest():
                 break
             consider(name_loc)
 
+        if not results:
+            results = fuzzy_suggestions(q, lang, limit, {p['id'] for p in lst})
         if len(results) >= limit or not missing_ids:
             return jsonify(results[:limit])
 
@@ -152,11 +153,13 @@ def pokemon_suggest():
             except Exception:
                 return pid, None
 
-        futures = [EXECUTOR.submit(fetch_and_store, pid) for pid in ids_to_fetch]
-        for f in as_completed(futures):
-            pid, name_loc = f.result()
-            if consider(name_loc) and len(results) >= limit:
-                break
+        task = tracing.bind(fetch_and_store)
+        futures = [EXECUTOR.submit(task, pid) for pid in ids_to_fetch]
+        with tracing.span('executor', 'species'):
+            for f in as_completed(futures):
+                pid, name_loc = f.result()
+                if consider(name_loc) and len(results) >= limit:
+                    break
 
         return jsonify(results[:limit])
     except Exception as e:
@@ -172,20 +175,25 @@ def random_cry():
             lang = 'en'
         for _ in range(20):
             pid = pick_random_id_for_gen(gen)
-            audio, name = get_cry_for_pokemon(pid)
+            audio = cries.url_for(pid)
+            name = None
+            if not audio:
+                audio, name = get_cry_for_pokemon(pid)
             if audio:
                 # Use stateless signed token; also keep legacy mapping for backward compatibility
                 token = _sign_token(pid)
-                TOKENS[token] = {'name': name, 'id': pid}
                 display_name = get_localized_name(pid, lang)
+                TOKENS[token] = {'name': name or display_name, 'id': pid}
                 meta = get_species_metadata(pid)
                 return jsonify({
                     'token': token,
                     'id': pid,
                     'name': display_name,
-                    'audio': audio,
+                    'audio': proxied_cry(pid, audio),
                     'color': meta.get('color') or '',
                     'generation': meta.get('generation') or '',
+                    # Precomputed duration and envelope so the visualizer draws before the audio loads
+                    **(cries.info(pid) or {}),
                 })
         return jsonify({"error": "Could not find a cry audio."}), 500
     except Exception as e:
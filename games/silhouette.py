@@ -10,6 +10,7 @@ from services.pokemon import (
     get_species_metadata,
 )
 from services.tokens import sign_token as _sign_token
+from .media import derived_urls, proxied_artwork
 
 bp = Blueprint('silhouette', __name__)
 
@@ -40,7 +41,9 @@ def random_silhouette():
                     'token': token,
                     'id': pid,
                     'name': display_name,
-                    'sprite': sprite,
+                    'sprite': proxied_artwork(pid, sprite),
+                    # Black mask rendered server-side; the artwork itself is only needed on reveal
+                    'silhouette': (derived_urls(pid, 'silhouette') or [''])[0],
                     'bg_size': 'contain',
                     'bg_pos': 'center center',
                     'color': meta.get('color') or '',
@@ -1,7 +1,10 @@
-from flask import Blueprint, jsonify, render_template, request, current_app
+from flask import Blueprint, jsonify, make_response, render_template, request, current_app
 import os
 import random
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -11,9 +14,12 @@ from services.pokemon import (
     get_localized_name,
     get_pokemon_list,
     pick_random_id_for_gen,
-    get_species_metadata,
 )
+from services.core import TCGDEX_BASE
+from services import cache_registry, dataset, metrics, tcg_index, tracing
 from services.tokens import sign_token as _sign_token
+from .common import species_meta
+from .media import proxied_card
 
 bp = Blueprint('tcg', __name__)
 
@@ -67,13 +73,127 @@ def _get_tcg_session():
 # Simple in-memory cache for card image URLs, keyed by language + display name
 TCG_IMAGE_CACHE = {}
 TCG_IMAGE_TTL = 24 * 60 * 60  # 24 hours
+cache_registry.configure(
+    'games.tcg.TCG_IMAGE_CACHE', metric='tcg_image',
+    ages=lambda: [e['exp'] - TCG_IMAGE_TTL for e in list(TCG_IMAGE_CACHE.values())],
+)
+
+# Reload the card index when `python -m services.ingest tcg --refresh` (run on a schedule,
+# outside the web workers) wrote a newer one
+TCG_INDEX_CHECK_SECONDS = 10 * 60
+_REFRESH_TIMER = None
+
+# Live search: recent successful TCGdex round trips (seconds). A request still running
+# after the p95 of these gets a hedged duplicate; the first response wins.
+TCG_LATENCIES = deque(maxlen=256)
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY = 1.0  # seconds, until enough samples are collected
+_HTTP_EXECUTOR = ThreadPoolExecutor(max_workers=16)   # individual HTTP attempts
+_QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=8)   # per-language searches (English fallback)
+metrics.register_executor('tcg_http', _HTTP_EXECUTOR)
+metrics.register_executor('tcg_query', _QUERY_EXECUTOR)
+
+
+# TCGdex serves each card as {image base}/{low|high}.{png|jpg|webp}
+TCG_LOW_WIDTH = 245    # px width of the 'low' variant ('high' is 600)
+TCG_CARD_ASPECT = 600 / 825
+# While blurred, the card may be upscaled this much without visible loss
+TCG_BLURRED_UPSCALE = 2.0
+CLIENT_HINT_HEADERS = 'Sec-CH-DPR, Sec-CH-Viewport-Width, DPR, Viewport-Width'
+
+
+def _hint_float(args_name, *header_names):
+    for raw in [request.args.get(args_name)] + [request.headers.get(h) for h in header_names]:
+        try:
+            v = float(raw)
+            if v > 0:
+                return v
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _image_variants():
+    """Pick TCGdex asset variants from client hints: query params w/h (card box in CSS px),
+    dpr, webp=1 and save=1, or the Sec-CH-*/DPR/Viewport-Width, Save-Data and Accept headers.
+    Returns ((quality, ext) for the blurred round image, (quality, ext) for the reveal)."""
+    ext = 'webp' if request.args.get('webp') == '1' or 'image/webp' in (request.headers.get('Accept') or '') else 'png'
+    save_data = request.args.get('save') == '1' or (request.headers.get('Save-Data') or '').lower() == 'on'
+    width = _hint_float('w', 'Sec-CH-Viewport-Width', 'Viewport-Width')
+    height = _hint_float('h')
+    dpr = _hint_float('dpr', 'Sec-CH-DPR', 'DPR') or 1.0
+    if width is None:
+        # No size hint (older clients): keep full quality unless the user asked to save data
+        return ('low' if save_data else 'high', ext), ('high', ext)
+    card_px = min(width, height * TCG_CARD_ASPECT if height else width) * dpr
+    hq = 'low' if card_px <= TCG_LOW_WIDTH else 'high'
+    first = 'low' if save_data or card_px <= TCG_LOW_WIDTH * TCG_BLURRED_UPSCALE else hq
+    return (first, ext), (hq, ext)
+
+
+def _card_image_url(image: str, quality: str, ext: str) -> str:
+    if image.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
+        return image
+    return f"{image.rstrip('/')}/{quality}.{ext}"
+
+
+def _hedge_delay() -> float:
+    samples = sorted(TCG_LATENCIES)
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    return samples[int(0.95 * (len(samples) - 1))]
+
+
+def _timed_get(url, params, headers, timeout):
+    t0 = time.perf_counter()
+    resp = _get_tcg_session().get(url, params=params, headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    TCG_LATENCIES.append(time.perf_counter() - t0)
+    data = resp.json() or []
+    return data if isinstance(data, list) else []
+
+
+def _hedged_get(url, params, headers, timeout):
+    """GET a TCGdex card list, sending a duplicate request when the first one is slower
+    than the recent p95. Returns the first successful response's cards."""
+    task = tracing.bind(_timed_get)
+    with tracing.span('executor', 'tcg_http'):
+        first = _HTTP_EXECUTOR.submit(task, url, params, headers, timeout)
+        done, _ = wait([first], timeout=_hedge_delay())
+        if done:
+            return first.result()
+        _log_debug('Hedging slow TCG request', url=url, params=params)
+        pending = {first, _HTTP_EXECUTOR.submit(task, url, params, headers, timeout)}
+        last_exc = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                try:
+                    return f.result()
+                except Exception as e:
+                    last_exc = e
+        raise last_exc
+
+
+def _with_app_context(fn):
+    """Wrap fn so it runs inside the current app context (keeps _log_debug on the app logger)
+    and reports to the submitting request's trace."""
+    try:
+        app = current_app._get_current_object()
+    except RuntimeError:
+        return fn
+
+    def run(*args, **kwargs):
+        with app.app_context():
+            return fn(*args, **kwargs)
+    return tracing.bind(run)
 
 
 def _find_card_image_for_pokemon(display_name, lang, display_en=None):
     """Query TCGdex API for a card image for the given display name in the selected language.
-    Returns (image_url, card_id) or (None, None). Falls back to English if needed.
+    Returns (image_url, card_id) or (None, None). The English fallback search runs
+    concurrently with the selected language; the selected language wins when both match.
     """
-    session = _get_tcg_session()
     timeout = (5, 8)  # (connect, read) seconds
     headers = { 'User-Agent': 'pokemon-games/1.0 (+https://example.local)' }
 
@@ -83,53 +203,38 @@ def _find_card_image_for_pokemon(display_name, lang, display_en=None):
             img = c.get('image')
             if not img:
                 continue
-            if isinstance(img, str) and not img.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
-                img_url = img.rstrip('/') + '/high.png'
-            else:
-                img_url = img
             cid = c.get('id') or c.get('localId') or None
-            out.append((img_url, cid))
+            # Image base URL; the quality/extension is chosen per request (_card_image_url)
+            out.append((img, cid))
         return out
 
     def _query_one(q_lang, name_for_lang):
-        base = f'https://api.tcgdex.net/v2/{q_lang}/cards'
+        base = f'{TCGDEX_BASE}/{tcg_index.tcgdex_lang(q_lang)}/cards'
         # Cache per language+name
         now = time.time()
         cache_key = f"{q_lang}:{name_for_lang}"
         cached = TCG_IMAGE_CACHE.get(cache_key)
         if cached and cached.get('exp', 0) > now:
+            metrics.cache_event('tcg_image', 'hit')
             _log_debug('Cache hit for display name', lang=q_lang, display_name=name_for_lang)
             return cached['url'], cached['id']
-
-        params_primary = { 'name': name_for_lang }
-        first_word = name_for_lang.split()[0]
-        params_fallback = { 'name': first_word }
+        metrics.cache_event('tcg_image', 'miss')
+        if cached:
+            metrics.cache_event('tcg_image', 'eviction')  # expired; replaced below
 
         # Primary request
         t0 = time.perf_counter()
-        _log_debug('Searching TCG cards (primary)', lang=q_lang, display_name=name_for_lang, params=params_primary)
-        req_primary = requests.Request('GET', base, params=params_primary, headers=headers)
-        prepped_primary = session.prepare_request(req_primary)
-        _log_debug('Primary request URL', url=prepped_primary.url)
-        resp = session.send(prepped_primary, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json() or []
-        cards = data if isinstance(data, list) else []
+        _log_debug('Searching TCG cards (primary)', lang=q_lang, display_name=name_for_lang)
+        cards = _hedged_get(base, { 'name': name_for_lang }, headers, timeout)
         _log_debug('Primary query returned cards', count=len(cards), ms=round((time.perf_counter()-t0)*1000))
         candidates = _collect_candidates(cards)
-        _log_debug('Primary candidates filtered', candidates=len(candidates))
 
-        # Fallback by first word
-        if not candidates:
+        # Fallback by first word (skipped when it would repeat the primary query)
+        first_word = name_for_lang.split()[0]
+        if not candidates and first_word != name_for_lang:
             t1 = time.perf_counter()
-            _log_debug('No primary candidates, trying fallback', lang=q_lang, params=params_fallback)
-            req_fallback = requests.Request('GET', base, params=params_fallback, headers=headers)
-            prepped_fallback = session.prepare_request(req_fallback)
-            _log_debug('Fallback request URL', url=prepped_fallback.url)
-            resp2 = session.send(prepped_fallback, timeout=timeout)
-            resp2.raise_for_status()
-            data2 = resp2.json() or []
-            cards2 = data2 if isinstance(data2, list) else []
+            _log_debug('No primary candidates, trying fallback', lang=q_lang, first_word=first_word)
+            cards2 = _hedged_get(base, { 'name': first_word }, headers, timeout)
             _log_debug('Fallback query returned cards', count=len(cards2), ms=round((time.perf_counter()-t1)*1000))
             candidates = _collect_candidates(cards2)
 
@@ -142,7 +247,11 @@ def _find_card_image_for_pokemon(display_name, lang, display_en=None):
         TCG_IMAGE_CACHE[cache_key] = { 'url': choice[0], 'id': choice[1], 'exp': now + TCG_IMAGE_TTL }
         return choice
 
-    # First try the selected language
+    # Start the English fallback right away instead of after the selected language misses
+    fallback = None
+    if lang != 'en':
+        fallback = _QUERY_EXECUTOR.submit(_with_app_context(_query_one), 'en', display_en or display_name)
+
     try:
         res = _query_one(lang, display_name)
         if res and res[0]:
@@ -150,10 +259,10 @@ def _find_card_image_for_pokemon(display_name, lang, display_en=None):
     except Exception as e:
         _log_debug('Exception during TCG fetch (selected lang)', error=str(e), lang=lang, display_name=display_name)
 
-    # Fallback to English
-    if lang != 'en':
+    if fallback is not None:
         try:
-            res = _query_one('en', display_en or display_name)
+            with tracing.span('executor', 'tcg_query'):
+                res = fallback.result()
             if res and res[0]:
                 return res
         except Exception as e:
@@ -163,9 +272,60 @@ def _find_card_image_for_pokemon(display_name, lang, display_en=None):
     return None, None
 
 
+def _refresh_tick():
+    """Timer callback: reload the card index when a newer one was written, then check
+    again later. Rebuilding it is left to the ingest CLI, never done in a web worker."""
+    global _REFRESH_TIMER
+    data_dir = dataset.DATA_DIR
+    try:
+        if tcg_index.index_mtime(data_dir) > tcg_index.LOADED_MTIME:
+            tcg_index.load(data_dir)
+    except Exception as e:
+        _log_debug('TCG index reload failed', error=str(e))
+    _REFRESH_TIMER = threading.Timer(TCG_INDEX_CHECK_SECONDS, _refresh_tick)
+    _REFRESH_TIMER.daemon = True
+    _REFRESH_TIMER.start()
+
+
+def start_index_refresher():
+    """Start the per-worker card index refresher (no-op when already running)."""
+    global _REFRESH_TIMER
+    if _REFRESH_TIMER is not None:
+        return
+    _REFRESH_TIMER = threading.Timer(TCG_INDEX_CHECK_SECONDS, _refresh_tick)
+    _REFRESH_TIMER.daemon = True
+    _REFRESH_TIMER.start()
+
+
+def _round_payload(pid, lang, image_base):
+    token = _sign_token(pid)
+    display_name = get_localized_name(pid, lang)
+    meta = species_meta(pid)
+    first, hq = _image_variants()
+    image_url = proxied_card(_card_image_url(image_base, *first))
+    _log_debug('Found image for round', pid=pid, display_name=display_name, image_url=image_url)
+    resp = jsonify({
+        'token': token,
+        'id': pid,
+        'name': display_name,
+        'image': image_url,
+        # Full-quality variant for the unblurred card; clients load it only on reveal
+        'image_hq': proxied_card(_card_image_url(image_base, *hq)),
+        'bg_size': 'contain',
+        'bg_pos': 'center center',
+        'color': meta.get('color') or '',
+        'generation': meta.get('generation') or '',
+    })
+    resp.vary.update(['Accept', 'Save-Data', 'Sec-CH-DPR', 'Sec-CH-Viewport-Width', 'DPR', 'Viewport-Width'])
+    return resp
+
+
 @bp.route('/tcg')
 def index():
-    return render_template('tcg.html', active_page='tcg')
+    resp = make_response(render_template('tcg.html', active_page='tcg'))
+    # Ask Chromium browsers to send DPR/viewport hints with the round API requests
+    resp.headers['Accept-CH'] = CLIENT_HINT_HEADERS
+    return resp
 
 
 @bp.route('/api/tcg/random')
@@ -176,9 +336,18 @@ def random_tcg():
         if lang not in SUPPORTED_LANGS:
             lang = 'en'
 
-        # We'll try multiple times to find a card image for a random Pokémon
-        lst = get_pokemon_list()
         _log_debug('Starting TCG random round', lang=lang, gen=gen or 'all')
+        if tcg_index.is_loaded():
+            # Local index: pick a card in O(1); retries only skip species without cards
+            for _ in range(20):
+                pid = pick_random_id_for_gen(gen)
+                image_base, _card_id = tcg_index.pick(pid, lang)
+                if image_base:
+                    return _round_payload(pid, lang, image_base)
+            return jsonify({'error': 'Could not find a TCG card image.'}), 500
+
+        # No index built: try multiple times to find a card image for a random Pokémon via search
+        lst = get_pokemon_list()
         for attempt in range(1, 9):
             pid = pick_random_id_for_gen(gen)
             _log_debug('Attempt pick', attempt=attempt, pid=pid)
@@ -196,20 +365,7 @@ def random_tcg():
             _log_debug('Resolved names', pid=pid, display_en=display_en, display_local=display_local, lang=lang)
             image_url, _card_id = _find_card_image_for_pokemon(display_local, lang, display_en)
             if image_url:
-                token = _sign_token(pid)
-                display_name = get_localized_name(pid, lang)
-                meta = get_species_metadata(pid)
-                _log_debug('Found image for round', pid=pid, display_name=display_name, image_url=image_url)
-                return jsonify({
-                    'token': token,
-                    'id': pid,
-                    'name': display_name,
-                    'image': image_url,
-                    'bg_size': 'contain',
-                    'bg_pos': 'center center',
-                    'color': meta.get('color') or '',
-                    'generation': meta.get('generation') or '',
-                })
+                return _round_payload(pid, lang, image_url)
         _log_debug('Exhausted attempts without finding card image')
         return jsonify({'error': 'Could not find a TCG card image.'}), 500
     except Exception as e:
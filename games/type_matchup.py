@@ -1,7 +1,74 @@
-from flask import Blueprint, render_template
+from flask import Blueprint, jsonify, render_template, request
+
+from services.pokemon import (
+    SUPPORTED_LANGS,
+    get_localized_name,
+    pick_random_id_for_gen,
+)
+from services import dataset, type_chart
+from services.tokens import sign_token as _sign_token, verify_token as _verify_token
+from .media import proxied_artwork
 
 bp = Blueprint('type_matchup', __name__)
 
+
+def _chart_ready() -> bool:
+    # Rounds need the species type table; the chart can be built live once if missing
+    return dataset.is_loaded() and type_chart.ensure_loaded(dataset.TYPE_NAMES)
+
+
 @bp.route('/type-matchup')
 def type_matchup():
-    return render_template('type_matchup.html', title='Type Matchup (Coming Soon)', active_page='type')
+    return render_template('type_matchup.html', active_page='type')
+
+
+@bp.route('/api/type-matchup/random')
+def random_matchup():
+    try:
+        lang = (request.args.get('lang') or 'en').lower()
+        gen = (request.args.get('gen') or '').strip()
+        if lang not in SUPPORTED_LANGS:
+            lang = 'en'
+        if not _chart_ready():
+            return jsonify({'error': 'Type data is not available.'}), 503
+        for _ in range(20):
+            pid = pick_random_id_for_gen(gen)
+            attrs = dataset.attrs_for(pid)
+            multipliers = type_chart.profile(attrs['types']) if attrs else None
+            # Skip defenders without any super-effective attacking type
+            if multipliers is None or not (multipliers >= type_chart.SUPER_EFFECTIVE).any():
+                continue
+            return jsonify({
+                'token': _sign_token(pid),
+                'id': pid,
+                'name': get_localized_name(pid, lang),
+                'sprite': proxied_artwork(pid, dataset.sprite_for(pid)),
+                'types': attrs['types'],
+                'attack_types': type_chart.NAMES,
+            })
+        return jsonify({'error': 'Could not find a Pokémon.'}), 500
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/type-matchup/check', methods=['POST'])
+def check_matchup():
+    if not _chart_ready():
+        return jsonify({'error': 'Type data is not available.'}), 503
+    data = request.get_json(silent=True) or {}
+    pid = _verify_token(data.get('token')) if data.get('token') else None
+    attrs = dataset.attrs_for(pid) if pid is not None else None
+    if not attrs:
+        return jsonify({'error': 'Invalid token'}), 400
+    attack = (data.get('attack') or '').strip().lower()
+    if attack not in type_chart.INDEX_OF:
+        return jsonify({'error': 'Unknown type'}), 400
+    multipliers = type_chart.profile(attrs['types'])
+    multiplier = float(multipliers[type_chart.INDEX_OF[attack]])
+    return jsonify({
+        'correct': multiplier >= type_chart.SUPER_EFFECTIVE,
+        'multiplier': multiplier,
+        'super_effective': [
+            type_chart.NAMES[i] for i in (multipliers >= type_chart.SUPER_EFFECTIVE).nonzero()[0]
+        ],
+    })
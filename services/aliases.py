@@ -0,0 +1,64 @@
+from .text_utils import name_key, normalize_name
+from . import cache_registry, fuzzy
+
+# Normalized name -> species id indexes. Entries are only ever added (incrementally, as names
+# are loaded from the dataset or fetched live), so lookups never trigger a rebuild.
+LANG_INDEX = {}    # lang -> { normalized alias: species id }
+GLOBAL_INDEX = {}  # normalized alias in any loaded language (incl. slugs) -> species id
+FORMS = {}         # normalized form/variety slug (e.g. 'charizardmegax') -> species id
+
+
+def add(pid: int, name: str, lang: str | None = None):
+    """Index one name for a species. The first species registered for an alias wins."""
+    if not name:
+        return
+    key = name_key(name)
+    if not key:
+        return
+    if lang:
+        LANG_INDEX.setdefault(lang, {}).setdefault(key, pid)
+    if key not in GLOBAL_INDEX:
+        GLOBAL_INDEX[key] = pid
+        fuzzy.add(key, pid)
+
+
+def register_species(pid: int, slug: str, display_en: str):
+    add(pid, slug, 'en')
+    add(pid, display_en, 'en')
+
+
+def register_form(slug: str, pid: int):
+    key = normalize_name(slug)
+    if key:
+        FORMS.setdefault(key, pid)
+
+
+def lookup(name: str, lang: str | None = None):
+    """Resolve a free-text name to a species id: requested language first, then any
+    language. Pure dict lookups, returns None for unknown names."""
+    key = name_key(name or '')
+    if not key:
+        return None
+    if lang:
+        pid = (LANG_INDEX.get(lang) or {}).get(key)
+        if pid:
+            return pid
+    return GLOBAL_INDEX.get(key)
+
+
+def lookup_form(candidates):
+    """Return the species id for the first known form slug among candidates, or None."""
+    for cand in candidates or []:
+        pid = FORMS.get(normalize_name(cand))
+        if pid:
+            return pid
+    return None
+
+
+def index_for(lang: str) -> dict:
+    return LANG_INDEX.get(lang) or {}
+
+
+# Derived from the name shards and only ever added to: clear those instead
+for _name in ('LANG_INDEX', 'GLOBAL_INDEX', 'FORMS'):
+    cache_registry.configure(f'services.aliases.{_name}', readonly=True)
@@ -0,0 +1,362 @@
+"""Inventory and control of this worker's in-memory caches (served under /admin/caches).
+
+Caches register themselves by convention: every module-level dict, list, set or Counter
+of a `services.*` or `games.*` module whose name ends in CACHE, TOKENS, SHARDS, _META,
+_INDEX, FORMS, _LIST, _NAMES or _TO_ID is a cache, and so is every function
+wrapped in functools.lru_cache. Modules holding read-only snapshots of the offline
+dataset are skipped. A cache is addressed as "<module>.<ATTR>", e.g.
+"services.pokemon.SPECIES_META", and is re-read from its module on every call, so
+rebinding a global (as _set_pokemon_list does) is picked up.
+
+A module can refine how one of its caches is handled with configure() (per-species
+forget, read-only, hit/miss metric name, entry ages) and can register per-species
+warmers with add_warmer(); refresh_species() and warm_range() use both.
+
+Entry ages come from configure(ages=...) when a cache stores timestamps, otherwise from
+the first observe() scan that saw the key (every OBSERVE_SECONDS once started).
+"""
+import functools
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from werkzeug.local import LocalProxy
+
+from . import metrics
+
+PACKAGES = ('services.', 'games.')
+# Dataset snapshots and bookkeeping, not caches (services.core only holds unused copies)
+SKIP_MODULES = {
+    'services.cache_registry', 'services.core', 'services.cries', 'services.dataset',
+    'services.evolution', 'services.ingest', 'services.metrics', 'services.profiler',
+    'services.quiz_bank', 'services.tcg_index', 'services.tracing', 'services.type_chart',
+}
+CACHE_NAME = re.compile(r'^_?[A-Z0-9_]*(CACHE|TOKENS|SHARDS|_META|_INDEX|FORMS|_LIST|_NAMES|_TO_ID)$')
+CONTAINERS = (dict, list, set, Counter)
+SIZE_SAMPLE = 64           # entries measured per cache for the byte estimate
+AGE_TRACK_LIMIT = 50000    # keys whose first sighting is remembered, per cache
+AGE_BUCKETS = [(60, '<1m'), (600, '<10m'), (3600, '<1h'), (86400, '<1d'), (float('inf'), '>=1d')]
+OBSERVE_SECONDS = 60
+MAX_WARM_IDS = 2000
+
+_OVERRIDES = {}  # cache name -> { 'forget', 'readonly', 'metric', 'ages' }
+_WARMERS = {}    # warmer name -> fn(species id)
+_SEEN = {}       # cache name -> { key: first seen (epoch seconds) }
+_WARM = {'running': False, 'done': 0, 'total': 0, 'errors': 0, 'range': None}
+_WARM_LOCK = threading.Lock()
+_TIMER = None
+_LOG = logging.getLogger(__name__)
+
+
+def configure(name: str, *, forget=None, readonly: bool = False, metric: str | None = None, ages=None):
+    """Refine a discovered cache.
+    forget(pid) drops one species (default: pop the species id as a key); readonly caches
+    are listed but never cleared; metric is the cache label of its hit/miss counters in
+    services.metrics; ages() returns the insertion time of every entry.
+    """
+    _OVERRIDES[name] = {'forget': forget, 'readonly': readonly, 'metric': metric, 'ages': ages}
+
+
+def add_warmer(name: str, fn):
+    """fn(pid) fills this module's per-species caches (a no-op for what is already cached)."""
+    _WARMERS[name] = fn
+
+
+def _is_lru(obj) -> bool:
+    return isinstance(obj, functools._lru_cache_wrapper)
+
+
+def discover() -> dict:
+    """name -> (module, attribute) for every cache of the loaded modules."""
+    found, seen_ids = {}, set()
+    for mod_name, mod in sorted(sys.modules.items()):
+        if not mod_name.startswith(PACKAGES) or mod_name in SKIP_MODULES or mod is None:
+            continue
+        for attr, obj in list(vars(mod).items()):
+            if isinstance(obj, LocalProxy):
+                continue  # Flask's request/g/current_app: any attribute access needs a context
+            if _is_lru(obj):
+                if getattr(obj, '__module__', None) != mod_name:
+                    continue  # imported from elsewhere
+            elif not (isinstance(obj, CONTAINERS) and CACHE_NAME.match(attr)):
+                continue
+            if id(obj) in seen_ids:
+                continue
+            seen_ids.add(id(obj))
+            found[f"{mod_name}.{attr}"] = (mod, attr)
+    return found
+
+
+def _get(name: str, caches: dict | None = None):
+    caches = caches if caches is not None else discover()
+    ref = caches.get(name)
+    return None if ref is None else getattr(ref[0], ref[1], None)
+
+
+def _keys(obj) -> list:
+    if isinstance(obj, list):
+        return [i for i, v in enumerate(list(obj)) if v is not None]
+    return list(obj)
+
+
+def _deep_size(obj, depth: int = 4) -> int:
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes  # numpy arrays
+    size = sys.getsizeof(obj)
+    if depth <= 0:
+        return size
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, depth - 1) + _deep_size(v, depth - 1) for k, v in list(obj.items()))
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(v, depth - 1) for v in list(obj))
+    return size
+
+
+def _estimate_bytes(obj) -> int:
+    """Container overhead plus the measured size of up to SIZE_SAMPLE entries, extrapolated."""
+    if isinstance(obj, dict):
+        items = list(obj.items())
+    else:
+        items = [(v, None) for v in list(obj)]
+    if not items:
+        return sys.getsizeof(obj)
+    sample = items[::max(1, len(items) // SIZE_SAMPLE)][:SIZE_SAMPLE]
+    measured = sum(_deep_size(k) + (_deep_size(v) if v is not None else 0) for k, v in sample)
+    return sys.getsizeof(obj) + int(measured * len(items) / len(sample))
+
+
+def _nested_entries(obj):
+    """Entries inside per-language shards (a dict of lists/dicts), else None."""
+    if not isinstance(obj, dict) or not obj:
+        return None
+    values = list(obj.values())
+    if not all(isinstance(v, (list, dict)) for v in values):
+        return None
+    return sum(len(_keys(v)) for v in values)
+
+
+def _hit_ratio(metric: str | None, counters: dict):
+    if not metric:
+        return None, None, None
+    hits = counters.get(('hit', metric), 0)
+    misses = counters.get(('miss', metric), 0)
+    total = hits + misses
+    return hits, misses, (round(hits / total, 4) if total else None)
+
+
+def _cache_counters() -> dict:
+    out = {}
+    for name, labels, v in metrics.snapshot()['counters']:
+        if name == 'pokemon_cache_events_total':
+            lab = dict(labels)
+            out[(lab.get('event'), lab.get('cache'))] = v
+    return out
+
+
+def observe(caches: dict | None = None):
+    """Record the first sighting of every new key (for the age distribution)."""
+    now = time.time()
+    caches = caches if caches is not None else discover()
+    for name in caches:
+        obj = _get(name, caches)
+        if not isinstance(obj, CONTAINERS) or (_OVERRIDES.get(name) or {}).get('ages'):
+            continue
+        try:
+            keys = _keys(obj)
+        except Exception:
+            continue
+        seen = _SEEN.get(name) or {}
+        current = {}
+        for k in keys:
+            t = seen.get(k)
+            if t is None:
+                if len(current) >= AGE_TRACK_LIMIT:
+                    continue
+                t = now
+            current[k] = t
+        _SEEN[name] = current
+
+
+def _age_histogram(stamps, now: float) -> dict:
+    hist = {label: 0 for _, label in AGE_BUCKETS}
+    for t in stamps:
+        age = now - t
+        for bound, label in AGE_BUCKETS:
+            if age < bound:
+                hist[label] += 1
+                break
+    return hist
+
+
+def stats(name: str, caches: dict | None = None, counters: dict | None = None) -> dict | None:
+    caches = caches if caches is not None else discover()
+    if name not in caches:
+        return None
+    obj = _get(name, caches)
+    opts = _OVERRIDES.get(name) or {}
+    counters = counters if counters is not None else _cache_counters()
+    out = {'name': name, 'readonly': bool(opts.get('readonly'))}
+    if _is_lru(obj):
+        info = obj.cache_info()
+        total = info.hits + info.misses
+        out.update({'kind': 'lru_cache', 'entries': info.currsize, 'maxsize': info.maxsize,
+                    'bytes': None, 'hits': info.hits, 'misses': info.misses,
+                    'hit_ratio': round(info.hits / total, 4) if total else None, 'ages': None})
+        return out
+    try:
+        entries, nbytes = len(obj), _estimate_bytes(obj)
+    except Exception:
+        entries, nbytes = len(obj), None
+    hits, misses, ratio = _hit_ratio(opts.get('metric'), counters)
+    now = time.time()
+    if opts.get('ages'):
+        try:
+            ages = _age_histogram(opts['ages'](), now)
+        except Exception:
+            ages = None
+    else:
+        seen = _SEEN.get(name)
+        ages = _age_histogram(seen.values(), now) if seen is not None else None
+    out.update({'kind': type(obj).__name__, 'entries': entries, 'nested_entries': _nested_entries(obj),
+                'bytes': nbytes, 'hits': hits, 'misses': misses, 'hit_ratio': ratio, 'ages': ages})
+    return out
+
+
+def all_stats() -> list:
+    caches = discover()
+    observe(caches)
+    counters = _cache_counters()
+    return [stats(name, caches, counters) for name in caches]
+
+
+def _coerce_key(obj, key):
+    if key in obj:
+        return key
+    if isinstance(key, str) and key.lstrip('-').isdigit() and int(key) in obj:
+        return int(key)
+    return None
+
+
+def invalidate(name: str, keys=None):
+    """Clear a cache, or drop only the given keys. Returns the number of entries removed,
+    None for an unknown cache, or raises PermissionError for a read-only one."""
+    caches = discover()
+    if name not in caches:
+        return None
+    obj = _get(name, caches)
+    if (_OVERRIDES.get(name) or {}).get('readonly'):
+        raise PermissionError(name)
+    if _is_lru(obj):
+        if keys:
+            raise ValueError('lru_cache entries can only be cleared all at once')
+        n = obj.cache_info().currsize
+        obj.cache_clear()
+        return n
+    if not keys:
+        n = len(obj)
+        obj.clear()
+        _SEEN.pop(name, None)
+        return n
+    removed = 0
+    for key in keys:
+        if isinstance(obj, list):
+            try:
+                i = int(key)
+            except (TypeError, ValueError):
+                continue
+            if 0 <= i < len(obj) and obj[i] is not None:
+                obj[i] = None
+                removed += 1
+            continue
+        k = _coerce_key(obj, key)
+        if k is None:
+            continue
+        if isinstance(obj, set):
+            obj.discard(k)
+        else:
+            obj.pop(k, None)
+        removed += 1
+    return removed
+
+
+def _forget(name: str, obj, pid: int) -> int:
+    opts = _OVERRIDES.get(name) or {}
+    if opts.get('forget'):
+        return int(opts['forget'](pid) or 0)
+    if opts.get('readonly') or not isinstance(obj, dict):
+        return 0
+    return int(obj.pop(pid, None) is not None)
+
+
+def refresh_species(pid: int) -> dict:
+    """Drop one species from every cache, then run every warmer for it."""
+    caches = discover()
+    forgotten = {}
+    for name in caches:
+        obj = _get(name, caches)
+        if _is_lru(obj):
+            continue
+        try:
+            n = _forget(name, obj, pid)
+        except Exception:
+            n = 0
+        if n:
+            forgotten[name] = n
+    return {'id': pid, 'forgotten': forgotten, 'warmed': _run_warmers(pid)}
+
+
+def _run_warmers(pid: int) -> dict:
+    out = {}
+    for name, fn in list(_WARMERS.items()):
+        try:
+            fn(pid)
+            out[name] = 'ok'
+        except Exception as e:
+            out[name] = f"{type(e).__name__}: {e}"
+    return out
+
+
+def warm_status() -> dict:
+    return dict(_WARM)
+
+
+def warm_range(start: int, end: int) -> bool:
+    """Run every warmer for species start..end (inclusive) on a background thread.
+    Returns False when a warm is already running on this worker."""
+    if not _WARM_LOCK.acquire(blocking=False):
+        return False
+    ids = list(range(start, end + 1))
+    _WARM.update({'running': True, 'done': 0, 'total': len(ids), 'errors': 0, 'range': [start, end]})
+
+    def run():
+        try:
+            for pid in ids:
+                _WARM['errors'] += sum(1 for v in _run_warmers(pid).values() if v != 'ok')
+                _WARM['done'] += 1
+        finally:
+            _WARM['running'] = False
+            _WARM_LOCK.release()
+
+    threading.Thread(target=run, name='cache-warm', daemon=True).start()
+    return True
+
+
+def _tick():
+    global _TIMER
+    try:
+        observe()
+    except Exception:
+        _LOG.exception('cache observer scan failed')
+    _TIMER = threading.Timer(OBSERVE_SECONDS, _tick)
+    _TIMER.daemon = True
+    _TIMER.start()
+
+
+def start_observer():
+    """Scan for new cache keys every OBSERVE_SECONDS (once per worker process)."""
+    if _TIMER is None:
+        _tick()
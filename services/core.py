@@ -1,8 +1,15 @@
+import os
 from concurrent.futures import ThreadPoolExecutor
 
 # Constants
-POKEAPI_BASE = 'https://pokeapi.co/api/v2'
-SUPPORTED_LANGS = {'en', 'es', 'fr', 'de'}
+# Upstream APIs; override to point at a mirror or the load-test stand-in (benchmarks/upstream_stub.py)
+POKEAPI_BASE = (os.environ.get('POKEAPI_BASE') or 'https://pokeapi.co/api/v2').rstrip('/')
+TCGDEX_BASE = (os.environ.get('TCGDEX_BASE') or 'https://api.tcgdex.net/v2').rstrip('/')
+# Languages with full UI translations; their names are warmed and precomputed eagerly
+CORE_LANGS = {'en', 'es', 'fr', 'de'}
+# Every language PokeAPI has species names for (lowercased PokeAPI codes). Names for the
+# other languages are loaded per worker on first use (see services/name_shards.py).
+SUPPORTED_LANGS = CORE_LANGS | {'it', 'ja', 'ja-hrkt', 'roomaji', 'ko', 'zh-hans', 'zh-hant'}
 
 # Generation ID ranges (National Dex) — inclusive
 GEN_ID_RANGES = {
@@ -0,0 +1,123 @@
+"""Cry durations and waveform envelopes (built by `python -m services.ingest cries`).
+
+PokeAPI cries are Ogg Vorbis files. Decoding Vorbis needs a native codec, so the ingest
+step reads only the Ogg container, using the standard library. The duration is the
+last page's granule position (in samples) divided by the sample rate from the Vorbis
+identification header. The envelope comes from how many bytes each audio packet spends
+per sample: silence codes to a few bytes, loud passages to many. That is good enough for
+a visualizer, but it is not a true PCM peak.
+
+Stored as DATA_DIR/cries.npz: id, duration_ms, url and peaks (one row of PEAK_BUCKETS
+int8 values in 0..127 per species).
+"""
+import os
+import struct
+
+import numpy as np
+
+CRIES_FILE = 'cries.npz'
+PEAK_BUCKETS = 256
+
+TABLE = {}  # column name -> np.ndarray, one row per species
+ROW_OF = np.full(0, -1, dtype=np.int32)  # species id -> row index (or -1)
+
+_PAGE_HEADER = struct.Struct('<4sBBqIIIB')  # capture, version, flags, granule, serial, seq, crc, segments
+
+
+def _packets(data: bytes):
+    """Yield (packet bytes, granule position of the page the packet ends on) for the
+    first logical stream of an Ogg file."""
+    pos, serial, buf = 0, None, []
+    while pos + _PAGE_HEADER.size <= len(data):
+        capture, _, _, granule, page_serial, _, _, nsegs = _PAGE_HEADER.unpack_from(data, pos)
+        if capture != b'OggS':
+            raise ValueError('not an Ogg stream')
+        lacing = data[pos + _PAGE_HEADER.size:pos + _PAGE_HEADER.size + nsegs]
+        body = pos + _PAGE_HEADER.size + nsegs
+        pos = body + sum(lacing)
+        if serial is None:
+            serial = page_serial
+        elif page_serial != serial:
+            continue
+        for seg in lacing:
+            buf.append(data[body:body + seg])
+            body += seg
+            if seg < 255:  # a lacing value below 255 ends the packet
+                yield b''.join(buf), granule
+                buf = []
+
+
+def analyze(data: bytes, buckets: int = PEAK_BUCKETS):
+    """Return (duration in seconds, int8 envelope of `buckets` values) for an Ogg Vorbis file."""
+    packets = list(_packets(data))
+    if len(packets) < 4 or packets[0][0][:7] != b'\x01vorbis':
+        raise ValueError('not an Ogg Vorbis stream')
+    rate = struct.unpack_from('<I', packets[0][0], 12)[0]
+    audio = packets[3:]  # identification, comment and setup headers come first
+    total = max((g for _, g in audio if g > 0), default=0)
+    if not rate or not total:
+        raise ValueError('empty Ogg Vorbis stream')
+    # Packets completed on one page share its granule; spread them evenly over the
+    # samples between the previous page's granule and this one
+    spans, start, i = [], 0, 0
+    while i < len(audio):
+        g = audio[i][1]
+        j = i
+        while j < len(audio) and audio[j][1] == g:
+            j += 1
+        if g > start:
+            step = (g - start) / (j - i)
+            for k in range(i, j):
+                lo = start + step * (k - i)
+                spans.append((lo, lo + step, len(audio[k][0])))
+            start = g
+        i = j
+    env = np.zeros(buckets, dtype=np.float64)
+    for lo, hi, size in spans:
+        density = size / (hi - lo)
+        b0 = min(buckets - 1, int(lo * buckets / total))
+        b1 = max(b0 + 1, min(buckets, int(np.ceil(hi * buckets / total))))
+        np.maximum(env[b0:b1], density, out=env[b0:b1])
+    top = env.max()
+    peaks = np.rint(env * (127 / top)) if top > 0 else env
+    return total / rate, peaks.astype(np.int8)
+
+
+def load(data_dir: str) -> bool:
+    """Load DATA_DIR/cries.npz. Returns True when the table is available."""
+    global TABLE, ROW_OF
+    path = os.path.join(data_dir, CRIES_FILE)
+    if not os.path.exists(path):
+        return False
+    with np.load(path, allow_pickle=False) as z:
+        cols = {k: z[k] for k in z.files}
+    ids = cols['id']
+    row_of = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int32)
+    row_of[ids] = np.arange(len(ids), dtype=np.int32)
+    TABLE, ROW_OF = cols, row_of
+    return True
+
+
+def _row(pid) -> int:
+    try:
+        pid = int(pid)
+    except Exception:
+        return -1
+    return int(ROW_OF[pid]) if 0 <= pid < len(ROW_OF) else -1
+
+
+def url_for(pid) -> str:
+    """Cry audio URL recorded for a species ('' if unknown)."""
+    row = _row(pid)
+    return str(TABLE['url'][row]) if row >= 0 else ''
+
+
+def info(pid):
+    """{'duration': seconds, 'peaks': [0..127] * PEAK_BUCKETS} for a species, or None."""
+    row = _row(pid)
+    if row < 0 or TABLE['duration_ms'][row] <= 0:
+        return None
+    return {
+        'duration': round(int(TABLE['duration_ms'][row]) / 1000, 3),
+        'peaks': TABLE['peaks'][row].tolist(),
+    }
@@ -0,0 +1,194 @@
+"""Vectorized daily-puzzle feedback over the whole species table.
+
+Feedback for one (guess, answer) pair is packed into a small integer code with the
+same semantics as the per-field evaluation in games/daily.py::api_guess, so a
+player's history can be applied to every species at once: a species is still a
+candidate when it would have produced exactly the observed codes.
+
+Run `python -m services.daily_eval --games 2000` to simulate random-but-consistent
+players for puzzle balancing.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from . import dataset, evolution
+
+# Evolution relation categories, as returned by services/evolution.py::relation
+EVO_CODES = {'unrelated': 0, 'same': 1, 'pre': 2, 'post': 3, 'same-family': 4}
+# Directional fields: 0 wrong without hint (unknown), 1 correct, 2 answer is higher, 3 lower
+DIRS = (None, None, 'higher', 'lower')
+
+_TABLE = {}  # cached row-aligned int arrays, rebuilt when the dataset is reloaded
+
+
+def _table():
+    cols = dataset.ATTRS
+    if _TABLE.get('src') is cols:
+        return _TABLE
+    ids = cols['id'].astype(np.intp)
+    covered = ids < len(evolution.FAMILY)
+    fam = np.full(len(ids), -1, dtype=np.int32)
+    stage = np.full(len(ids), -1, dtype=np.int8)
+    fam[covered] = evolution.FAMILY[ids[covered]]
+    stage[covered] = evolution.STAGE[ids[covered]]
+    _TABLE.clear()
+    _TABLE.update({
+        'src': cols,
+        'id': ids,
+        'type1': cols['type1'],
+        'type2': cols['type2'],
+        'generation': cols['generation'],
+        'height': cols['height'],
+        'weight': cols['weight'],
+        'stage_num': cols['stage'],
+        'color': cols['color'],
+        'family': fam,
+        'evo_stage': stage,
+    })
+    return _TABLE
+
+
+def _directional(g, a, known):
+    both = known(g) & known(a)
+    return np.where(~both, 0, np.where(g == a, 1, np.where(g < a, 2, 3)))
+
+
+def feedback_codes(guess_rows, answer_rows=None) -> np.ndarray:
+    """Return packed feedback codes with shape (len(guess_rows), len(answer_rows)).
+    `answer_rows` defaults to every row of the table.
+    """
+    t = _table()
+    g = np.asarray(guess_rows, dtype=np.intp).reshape(-1, 1)
+    a = np.arange(len(t['id'])) if answer_rows is None else np.asarray(answer_rows, dtype=np.intp)
+    a = a.reshape(1, -1)
+
+    def col(name):
+        c = t[name]
+        return c[g].astype(np.int32), c[a].astype(np.int32)
+
+    gt1, at1 = col('type1')
+    gt2, at2 = col('type2')
+    gg, ag = col('generation')
+    gh, ah = col('height')
+    gw, aw = col('weight')
+    gs, as_ = col('stage_num')
+    gc, ac = col('color')
+    gf, af = col('family')
+    ge, ae = col('evo_stage')
+    same = g == a
+
+    code = (gt1 == at1).astype(np.int32)
+    code |= (gt2 == at2).astype(np.int32) << 1
+    code |= _directional(gg, ag, lambda v: v > 0) << 2
+    code |= _directional(gh, ah, lambda v: v >= 0) << 4
+    code |= _directional(gw, aw, lambda v: v >= 0) << 6
+    code |= _directional(gs, as_, lambda v: v > 0) << 8
+    code |= ((gc == ac) & (gc >= 0)).astype(np.int32) << 10
+    evo = np.select(
+        [same, (gf != af) | (gf < 0), (ge < 0) | (ae < 0), ge < ae, ge > ae],
+        [EVO_CODES['same'], EVO_CODES['unrelated'], EVO_CODES['same-family'], EVO_CODES['pre'], EVO_CODES['post']],
+        default=EVO_CODES['same'],
+    )
+    code |= evo.astype(np.int32) << 11
+    code |= same.astype(np.int32) << 14
+    return code
+
+
+def decode(code: int) -> dict:
+    """Expand a packed code into per-field statuses (mirrors the api_guess feedback)."""
+    code = int(code)
+
+    def directional(shift):
+        v = (code >> shift) & 3
+        return {'status': 'correct' if v == 1 else 'wrong', 'dir': DIRS[v]}
+
+    evo_names = {v: k for k, v in EVO_CODES.items()}
+    return {
+        'types': ['correct' if code & 1 else 'wrong', 'correct' if code & 2 else 'wrong'],
+        'generation': directional(2),
+        'height': directional(4),
+        'weight': directional(6),
+        'evo_stage': directional(8),
+        'color': 'correct' if code & (1 << 10) else 'wrong',
+        'evolution': evo_names.get((code >> 11) & 7, 'unrelated'),
+        'correct': bool(code & (1 << 14)),
+    }
+
+
+def consistent_mask(guess_rows, answer_row: int) -> np.ndarray:
+    """Boolean mask over all rows: species that would have produced the same feedback
+    as `answer_row` for every guess in the history.
+    """
+    n = len(_table()['id'])
+    if len(guess_rows) == 0:
+        return np.ones(n, dtype=bool)
+    codes = feedback_codes(guess_rows)
+    observed = codes[:, answer_row:answer_row + 1]
+    return (codes == observed).all(axis=0)
+
+
+def best_guess(mask: np.ndarray, pool_size: int = 256, rng=None):
+    """Pick the candidate that minimizes the worst-case number of remaining candidates.
+    Evaluates at most `pool_size` remaining species. Returns (row, worst_case) or (None, 0).
+    """
+    rows = np.flatnonzero(mask)
+    if len(rows) == 0:
+        return None, 0
+    pool = rows
+    if len(pool) > pool_size:
+        pool = (rng or np.random.default_rng()).choice(rows, size=pool_size, replace=False)
+    codes = np.sort(feedback_codes(pool, rows), axis=1)
+    # Largest run of equal codes per guess = worst-case bucket size
+    worst = np.empty(len(pool), dtype=np.int64)
+    for i, row in enumerate(codes):
+        _, counts = np.unique(row, return_counts=True)
+        worst[i] = counts.max()
+    i = int(worst.argmin())
+    return int(pool[i]), int(worst[i])
+
+
+def simulate(games: int, rng=None, max_guesses: int = 30):
+    """Play `games` puzzles with a player who always guesses a random species that is still
+    consistent with their feedback. Returns (guess counts per game, total guesses evaluated).
+    """
+    rng = rng or np.random.default_rng()
+    n = len(_table()['id'])
+    counts = np.zeros(games, dtype=np.int32)
+    evaluated = 0
+    for i in range(games):
+        answer = int(rng.integers(n))
+        mask = np.ones(n, dtype=bool)
+        for turn in range(1, max_guesses + 1):
+            guess = int(rng.choice(np.flatnonzero(mask)))
+            codes = feedback_codes([guess])[0]
+            evaluated += 1
+            if guess == answer:
+                break
+            mask &= codes == codes[answer]
+        counts[i] = turn
+    return counts, evaluated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate daily puzzles against the species table.')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--data-dir', default=dataset.DATA_DIR)
+    args = parser.parse_args(argv)
+    if not dataset.load(args.data_dir):
+        parser.error(f"no dataset in {args.data_dir}; run python -m services.ingest first")
+    t0 = time.perf_counter()
+    counts, evaluated = simulate(args.games, np.random.default_rng(args.seed))
+    dt = time.perf_counter() - t0
+    print(f"games={args.games} species={len(dataset.ATTRS['id'])} guesses={evaluated} "
+          f"({evaluated / dt:.0f} guesses/s)")
+    print(f"guesses per game: mean={counts.mean():.2f} p50={np.percentile(counts, 50):.0f} "
+          f"p90={np.percentile(counts, 90):.0f} max={counts.max()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+
+from . import cries, evolution, quiz_bank, tcg_index, type_chart
+
+_LOG = logging.getLogger(__name__)
+
+# Directory holding the offline-built dataset (see services/ingest.py)
+DATA_DIR = os.environ.get('POKEMON_DATA_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'
+)
+ATTRS_FILE = 'species_attrs.npz'
+CALENDAR_FILE = 'daily_calendar.json'
+NAMES_DIR = 'names'  # names/<lang>.json: { species id: localized display name }
+FORMS_FILE = 'forms.json'  # { form/variety slug: species id }
+ENTRIES_DIR = 'entries'  # entries/<lang>.json: { species id: [masked Pokédex entries] }
+
+# Canonical vocabularies; codes are list indexes (PokeAPI id - 1), -1 means none/unknown
+TYPE_NAMES = [
+    'normal', 'fighting', 'flying', 'poison', 'ground', 'rock', 'bug', 'ghost', 'steel',
+    'fire', 'water', 'grass', 'electric', 'psychic', 'ice', 'dragon', 'dark', 'fairy',
+]
+COLOR_NAMES = ['black', 'blue', 'brown', 'gray', 'green', 'pink', 'purple', 'red', 'white', 'yellow']
+
+# Column-oriented species attribute table: column name -> np.ndarray (one row per species)
+ATTRS = {}
+ROW_OF = np.full(0, -1, dtype=np.int32)  # species id -> row index (or -1)
+# Frozen daily answers: date_key -> { 'id', 'attrs': attrs_for() dict, 'meta': { lang: meta payload } }
+CALENDAR = {}
+NAME_LANGS = set()  # languages with a names/<lang>.json file (read lazily by services/name_shards.py)
+ENTRY_LANGS = set()  # languages with an entries/<lang>.json file (read lazily by services/dex_entries.py)
+FORMS = {}  # form/variety slug -> species id
+_NAMES_PATH = os.path.join(DATA_DIR, NAMES_DIR)
+_ENTRIES_PATH = os.path.join(DATA_DIR, ENTRIES_DIR)
+
+
+def load(data_dir: str | None = None) -> bool:
+    """Load the dataset tables from disk. Returns True when the attribute table is available.
+    Missing files are not an error: callers fall back to live PokeAPI lookups.
+    """
+    global ATTRS, ROW_OF, TYPE_NAMES, COLOR_NAMES, CALENDAR, NAME_LANGS, FORMS, _NAMES_PATH
+    global ENTRY_LANGS, _ENTRIES_PATH
+    data_dir = data_dir or DATA_DIR
+    has_evolution = evolution.load(data_dir)
+    tcg_index.load(data_dir)
+    cries.load(data_dir)
+    type_chart.load(data_dir)
+    quiz_bank.load(data_dir)
+    CALENDAR = load_calendar(data_dir)
+    _NAMES_PATH = os.path.join(data_dir, NAMES_DIR)
+    NAME_LANGS, FORMS = _scan_names(data_dir)
+    _ENTRIES_PATH = os.path.join(data_dir, ENTRIES_DIR)
+    ENTRY_LANGS = _scan_langs(_ENTRIES_PATH)
+    path = os.path.join(data_dir, ATTRS_FILE)
+    if not os.path.exists(path):
+        return False
+    if not has_evolution:
+        _LOG.warning('%s has no %s: daily evolution feedback falls back to live PokeAPI chains '
+                     '(run python -m services.ingest evolution)', data_dir, evolution.EVOLUTION_FILE)
+    with np.load(path, allow_pickle=False) as z:
+        cols = {k: z[k] for k in z.files}
+    TYPE_NAMES = [str(t) for t in cols.pop('type_names')]
+    COLOR_NAMES = [str(c) for c in cols.pop('color_names')]
+    ids = cols['id']
+    row_of = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int32)
+    row_of[ids] = np.arange(len(ids), dtype=np.int32)
+    # Swap in the new table in one go so readers never see a half-loaded state
+    ATTRS, ROW_OF = cols, row_of
+    return True
+
+
+def load_calendar(data_dir: str) -> dict:
+    path = os.path.join(data_dir, CALENDAR_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return (json.load(f) or {}).get('dates') or {}
+
+
+def _scan_langs(lang_dir: str) -> set:
+    """Languages with a <lang>.json file in a per-language directory."""
+    if not os.path.isdir(lang_dir):
+        return set()
+    return {fn[:-len('.json')] for fn in os.listdir(lang_dir) if fn.endswith('.json')}
+
+
+def _scan_names(data_dir: str):
+    langs = _scan_langs(os.path.join(data_dir, NAMES_DIR))
+    forms = {}
+    path = os.path.join(data_dir, FORMS_FILE)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            forms = {k: int(v) for k, v in json.load(f).items()}
+    return langs, forms
+
+
+def names_file(lang: str) -> str | None:
+    """Path of the name shard for a language, or None when it was not built."""
+    if lang not in NAME_LANGS:
+        return None
+    return os.path.join(_NAMES_PATH, f"{lang}.json")
+
+
+def entries_file(lang: str) -> str | None:
+    """Path of the masked Pokédex entry shard for a language, or None when it was not built."""
+    if lang not in ENTRY_LANGS:
+        return None
+    return os.path.join(_ENTRIES_PATH, f"{lang}.json")
+
+
+def is_loaded() -> bool:
+    return bool(ATTRS)
+
+
+def row_for(pid) -> int:
+    """Return the table row for a species id, or -1 when the id is not covered."""
+    try:
+        pid = int(pid)
+    except Exception:
+        return -1
+    if 0 <= pid < len(ROW_OF):
+        return int(ROW_OF[pid])
+    return -1
+
+
+def _code_name(names, code):
+    code = int(code)
+    return names[code] if 0 <= code < len(names) else None
+
+
+def attrs_for(pid):
+    """Return the daily-puzzle attributes for a species id from the table, or None.
+    Same fields as the live `_attrs_for` in games/daily.py, except that evolution
+    relations come from services/evolution.py instead of per-species family sets.
+    """
+    row = row_for(pid)
+    if row < 0:
+        return None
+    cols = ATTRS
+    types = [_code_name(TYPE_NAMES, cols[k][row]) for k in ('type1', 'type2')]
+    types = [t for t in types if t]
+    height = int(cols['height'][row])
+    weight = int(cols['weight'][row])
+    gen = int(cols['generation'][row])
+    stage = int(cols['stage'][row])
+    stage_total = int(cols['stage_total'][row])
+    return {
+        'types': types,
+        'height': height if height >= 0 else None,
+        'weight': weight if weight >= 0 else None,
+        'color': _code_name(COLOR_NAMES, cols['color'][row]),
+        'generation': gen if gen > 0 else None,
+        'species_slug': str(cols['slug'][row]),
+        'species_id': int(cols['id'][row]),
+        'stage_num': stage if stage > 0 else None,
+        'stage_total': stage_total if stage_total > 0 else None,
+    }
+
+
+def hash_daily_id(date_key: str, ids: list[int]) -> int:
+    """Deterministically map a UTC date key (YYYY-MM-DD) onto the species id list."""
+    if not ids:
+        return 1
+    h = hashlib.sha256(date_key.encode('utf-8')).hexdigest()
+    return ids[int(h[:8], 16) % len(ids)]
+
+
+def sprite_for(pid) -> str:
+    """Return the official artwork URL recorded for a species id ('' if unknown)."""
+    row = row_for(pid)
+    if row < 0:
+        return ''
+    return str(ATTRS['sprite'][row])
@@ -0,0 +1,225 @@
+"""Server-side derivatives of the official artwork for the silhouette and pixelate games.
+
+The artwork is fitted into a CANVAS x CANVAS square. From that square this module
+derives a black silhouette mask and one image per pixelation level. Each level is
+stored at its coarse resolution (CANVAS // block pixels per side), and the client
+scales it up without smoothing. Files are cached under
+DATA_DIR/derived/<variant>/<id>/<level>.<ext>. They are rendered on first request, and
+in the background for species that were just served or are requested often.
+
+Sprite-crop tiles are small square crops of the same square, cut at one of CROP_SEEDS
+positions for each zoom step of the sprite game. There are too many of them to keep
+all, so they go through the size-bounded media cache.
+"""
+import io
+import os
+import threading
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow missing: games fall back to client-side effects
+    Image = None
+
+from . import dataset, media_cache, metrics, tracing
+from .pokemon import artwork_url
+
+DERIVED_DIR = 'derived'
+CANVAS = 512
+SQUARE_MEMO = 4  # fitted artworks kept in memory: the rounds being cut right now
+# Block size (canvas px) per pixelation level, coarsest first; same steps as static/pixelate.js
+PIXEL_BLOCKS = [64, 48, 32, 24, 16, 12, 8, 6, 4, 3, 2, 1]
+VARIANTS = {'silhouette': 1, 'pixelate': len(PIXEL_BLOCKS)}  # variant -> number of levels
+POPULAR_COUNT = 50
+TILE_SIZE = 256
+TILE_ZOOMS = list(range(500, 99, -25))  # background-size % per wrong guess, as in static/game.js
+CROP_GRID = 8  # crop centres on an 8 x 8 grid spanning 15%..85%, like the old random bg_pos
+CROP_SEEDS = CROP_GRID * CROP_GRID
+PRECOMPUTE_SECONDS = 15 * 60
+
+# Requests render on a small CPU-bound pool; background prefetches get their own single
+# worker so they never hold up a player waiting for a level
+_POOL = ThreadPoolExecutor(max_workers=max(2, min(4, os.cpu_count() or 1)))
+_BACKGROUND = ThreadPoolExecutor(max_workers=1)
+metrics.register_executor('derivatives', _POOL)
+metrics.register_executor('derivatives_background', _BACKGROUND)
+RENDER_LOCK_STRIPES = 64
+# Striped by species id, so a species' levels are rendered once without a lock per id
+_PID_LOCKS = [threading.Lock() for _ in range(RENDER_LOCK_STRIPES)]
+POPULARITY = Counter()  # species id -> rounds served by this worker
+_TIMER = None
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def _format():
+    if features.check('webp'):
+        return 'WEBP', '.webp', 'image/webp'
+    return 'PNG', '.png', 'image/png'
+
+
+def mimetype() -> str:
+    return _format()[2]
+
+
+def _path(pid: int, variant: str, level: int) -> str:
+    return os.path.join(dataset.DATA_DIR, DERIVED_DIR, variant, str(int(pid)), f"{level}{_format()[1]}")
+
+
+def _is_rendered(pid: int, variant: str) -> bool:
+    return os.path.exists(_path(pid, variant, VARIANTS[variant] - 1))
+
+
+def _artwork_bytes(pid: int) -> bytes:
+    entry = media_cache.get(f"artwork:{pid}", lambda: artwork_url(pid))
+    if not entry:
+        raise LookupError(f"no artwork for species {pid}")
+    with open(entry['path'], 'rb') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=SQUARE_MEMO)
+def _square(pid: int):
+    """The species' artwork fitted into the canvas, kept while the crops of a round are cut
+    (each is a 1 MB RGBA image, and finished crops are on disk anyway)."""
+    return _fit(_artwork_bytes(pid))
+
+
+def _fit(data: bytes):
+    img = Image.open(io.BytesIO(data)).convert('RGBA')
+    img.thumbnail((CANVAS, CANVAS), Image.LANCZOS)
+    square = Image.new('RGBA', (CANVAS, CANVAS), (0, 0, 0, 0))
+    square.paste(img, ((CANVAS - img.width) // 2, (CANVAS - img.height) // 2))
+    return square
+
+
+def _derive(square, variant: str):
+    if variant == 'silhouette':
+        mask = Image.new('RGBA', square.size, (0, 0, 0, 0))
+        mask.putalpha(square.getchannel('A'))
+        yield mask
+        return
+    for block in PIXEL_BLOCKS:
+        side = max(1, CANVAS // block)
+        yield square if side == CANVAS else square.resize((side, side), Image.BOX)
+
+
+def _save(img, path: str):
+    fmt = _format()[0]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    if fmt == 'WEBP':
+        # Lossless keeps the hard pixel edges (and the mask) exact
+        img.save(tmp, format=fmt, lossless=True, quality=80, method=4)
+    else:
+        img.save(tmp, format=fmt, optimize=True)
+    os.replace(tmp, path)
+
+
+def render(pid: int, variant: str):
+    """Render every level of a variant for a species (no-op when cached on disk)."""
+    with _PID_LOCKS[pid % RENDER_LOCK_STRIPES]:
+        if _is_rendered(pid, variant):
+            return
+        square = _fit(_artwork_bytes(pid))
+        # The last level is written last: its presence marks the variant complete
+        for level, img in enumerate(_derive(square, variant)):
+            _save(img, _path(pid, variant, level))
+
+
+def get(pid: int, variant: str, level: int, timeout: float = 30):
+    """Return the file path of one derivative, rendering it on the worker pool if needed.
+    Returns None for unknown variants/levels or when Pillow is not installed."""
+    if not available() or variant not in VARIANTS or not 0 <= level < VARIANTS[variant]:
+        return None
+    path = _path(pid, variant, level)
+    if not os.path.exists(path):
+        with tracing.span('executor', 'derivatives'):
+            _POOL.submit(tracing.bind(render), pid, variant).result(timeout=timeout)
+    return path
+
+
+def crop_position(seed: int):
+    """(x, y) background-position percentages of a crop seed."""
+    step = 70 / (CROP_GRID - 1)
+    return round(15 + step * (seed % CROP_GRID)), round(15 + step * (seed // CROP_GRID % CROP_GRID))
+
+
+def _render_tile(pid: int, seed: int, level: int) -> bytes:
+    # Same window the browser showed with background-size z% and background-position x% y%:
+    # 1/z of the image, offset by (1 - 1/z) * x
+    square = _square(pid)
+    zoom = TILE_ZOOMS[level] / 100
+    x, y = crop_position(seed)
+    side = CANVAS / zoom
+    left = (CANVAS - side) * x / 100
+    top = (CANVAS - side) * y / 100
+    img = square.resize((TILE_SIZE, TILE_SIZE), Image.BICUBIC, box=(left, top, left + side, top + side))
+    buf = io.BytesIO()
+    fmt = _format()[0]
+    if fmt == 'WEBP':
+        img.save(buf, format=fmt, quality=80, method=4)
+    else:
+        img.save(buf, format=fmt, optimize=True)
+    return buf.getvalue()
+
+
+def tile(pid: int, seed: int, level: int, timeout: float = 30):
+    """Return the media cache entry of a sprite-crop tile, rendering it on the worker pool
+    on a miss. Returns None for unknown seeds/levels or when Pillow is not installed."""
+    if not available() or not 0 <= seed < CROP_SEEDS or not 0 <= level < len(TILE_ZOOMS):
+        return None
+    key = f"tile:{pid}:{seed}:{level}"
+    entry = media_cache.lookup(key)
+    if entry:
+        return entry
+    with tracing.span('executor', 'derivatives'):
+        data = _POOL.submit(tracing.bind(_render_tile), pid, seed, level).result(timeout=timeout)
+    return media_cache.store(key, data, mimetype())
+
+
+def _prefetch(pid: int, variant: str):
+    try:
+        render(pid, variant)
+    except Exception:
+        pass  # the request path retries and reports the error
+
+
+def note_round(pid: int, variant: str):
+    """Record that a round for the species was served and render its levels in the
+    background so they are on disk before the client asks for them."""
+    if not available():
+        return
+    POPULARITY[pid] += 1
+    if not _is_rendered(pid, variant):
+        _BACKGROUND.submit(_prefetch, pid, variant)
+
+
+def precompute_popular(n: int = POPULAR_COUNT):
+    """Render both variants for the n most requested species that are not cached yet."""
+    for pid, _ in POPULARITY.most_common(n):
+        for variant in VARIANTS:
+            if not _is_rendered(pid, variant):
+                _BACKGROUND.submit(_prefetch, pid, variant)
+
+
+def _tick():
+    global _TIMER
+    precompute_popular()
+    _TIMER = threading.Timer(PRECOMPUTE_SECONDS, _tick)
+    _TIMER.daemon = True
+    _TIMER.start()
+
+
+def start_precompute():
+    """Start the periodic background precompute of popular species (once per process)."""
+    global _TIMER
+    if _TIMER is not None or not available():
+        return
+    _TIMER = threading.Timer(PRECOMPUTE_SECONDS, _tick)
+    _TIMER.daemon = True
+    _TIMER.start()
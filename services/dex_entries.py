@@ -0,0 +1,57 @@
+"""Precomputed Pokédex entries with every name of the species masked out.
+
+Built by `python -m services.ingest entries`. Like the name shards, each language is a
+list indexed by species id (a tuple of masked flavor texts, or None), read from
+DATA_DIR/entries/<lang>.json the first time the language is used on this worker.
+"""
+import json
+import os
+import random
+import threading
+
+from . import dataset
+
+SHARDS = {}  # lang -> [tuple of masked entries or None], indexed by species id
+_LOCK = threading.Lock()
+
+
+def _read(lang: str) -> list:
+    path = dataset.entries_file(lang)
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        mapping = {int(k): tuple(v) for k, v in json.load(f).items() if v}
+    entries = [None] * (max(mapping) + 1 if mapping else 0)
+    for pid, texts in mapping.items():
+        entries[pid] = texts
+    return entries
+
+
+def shard(lang: str) -> list:
+    entries = SHARDS.get(lang)
+    if entries is not None:
+        return entries
+    with _LOCK:
+        entries = SHARDS.get(lang)
+        if entries is None:
+            entries = _read(lang)
+            SHARDS[lang] = entries
+    return entries
+
+
+def is_loaded() -> bool:
+    return bool(dataset.ENTRY_LANGS)
+
+
+def entries_for(pid: int, lang: str) -> tuple:
+    """Masked entries for a species in the language, falling back to English."""
+    for code in (lang, 'en'):
+        entries = shard(code)
+        if 0 <= pid < len(entries) and entries[pid]:
+            return entries[pid]
+    return ()
+
+
+def random_entry(pid: int, lang: str) -> str | None:
+    texts = entries_for(pid, lang)
+    return random.choice(texts) if texts else None
@@ -1,7 +1,66 @@
+import re
+
 import requests
 from .core import POKEAPI_BASE, SUPPORTED_LANGS
 
 
+def clean_flavor_text(txt: str) -> str:
+    if not isinstance(txt, str):
+        txt = str(txt or '')
+    # Replace form feed and newlines with spaces, compress spaces
+    txt = txt.replace('\f', ' ').replace('\n', ' ').replace('\r', ' ')
+    return ' '.join(txt.split())
+
+
+def _mask_letters(s: str) -> str:
+    return ''.join('_' if ch.isalpha() else ch for ch in s)
+
+
+def mask_names(txt: str, names) -> str:
+    """Replace every letter of any of `names` occurring in the text (case-insensitive)
+    with an underscore, longest names first."""
+    names = sorted({n for n in names if n}, key=len, reverse=True)
+    if not names:
+        return txt
+    pattern = re.compile('|'.join(re.escape(n) for n in names), flags=re.IGNORECASE)
+    return pattern.sub(lambda m: _mask_letters(m.group(0)), txt)
+
+
+def flavor_texts_by_lang(species_json: dict) -> dict:
+    """Return { lang: [distinct cleaned flavor texts] } (lowercased language codes)."""
+    out = {}
+    for e in species_json.get('flavor_text_entries', []) or []:
+        lang_name = ((e.get('language') or {}).get('name') or '').lower()
+        txt = clean_flavor_text(e.get('flavor_text') or '')
+        if lang_name and txt:
+            texts = out.setdefault(lang_name, [])
+            if txt not in texts:
+                texts.append(txt)
+    return out
+
+
+def pick_flavor_text(species_json: dict, lang: str) -> str:
+    """Pick a cleaned flavor text from a species JSON: requested language, then English,
+    then any available. Returns '' when the species has none.
+    """
+    entries = species_json.get('flavor_text_entries', []) or []
+    # Try in preferred language
+    for e in entries:
+        lang_name = ((e.get('language') or {}).get('name') or '').lower()
+        if lang_name == lang and e.get('flavor_text'):
+            return clean_flavor_text(e['flavor_text'])
+    # Fallback to English
+    for e in entries:
+        lang_name = (e.get('language') or {}).get('name')
+        if lang_name == 'en' and e.get('flavor_text'):
+            return clean_flavor_text(e['flavor_text'])
+    # Any available
+    for e in entries:
+        if e.get('flavor_text'):
+            return clean_flavor_text(e['flavor_text'])
+    return ''
+
+
 def get_pokedex_entry(poke_id: int, lang: str) -> str:
     """Fetch a Pokédex flavor text for given Pokémon id in the requested language.
     Falls back to English, then to any available, and cleans whitespace/newlines.
@@ -14,30 +73,6 @@ def get_pokedex_entry(poke_id: int, lang: str) -> str:
         url = f"{POKEAPI_BASE}/pokemon-species/{poke_id}"
         r = requests.get(url, timeout=12)
         r.raise_for_status()
-        j = r.json()
-        entries = j.get('flavor_text_entries', []) or []
-
-        def clean(txt: str) -> str:
-            if not isinstance(txt, str):
-                txt = str(txt or '')
-            # Replace form feed and newlines with spaces, compress spaces
-            txt = txt.replace('\f', ' ').replace('\n', ' ').replace('\r', ' ')
-            return ' '.join(txt.split())
-
-        # Try in preferred language
-        for e in entries:
-            lang_name = (e.get('language') or {}).get('name')
-            if lang_name == l and e.get('flavor_text'):
-                return clean(e['flavor_text'])
-        # Fallback to English
-        for e in entries:
-            lang_name = (e.get('language') or {}).get('name')
-            if lang_name == 'en' and e.get('flavor_text'):
-                return clean(e['flavor_text'])
-        # Any available
-        for e in entries:
-            if e.get('flavor_text'):
-                return clean(e['flavor_text'])
-        return ''
+        return pick_flavor_text(r.json(), l)
     except Exception:
         return ''
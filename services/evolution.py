@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+
+EVOLUTION_FILE = 'evolution.npz'
+
+# Global evolution graph, all arrays indexed directly by species id (built by services/ingest.py):
+#   FAMILY[id]    dense family id (-1 when unknown)
+#   STAGE[id]     0-based stage index within the family (-1 when unknown)
+#   PATH_LEN[id]  number of stages on the species' evolution path (0 when unknown)
+#   PARENT[id]    species id it evolves from (0 for family roots)
+#   CHILD_PTR/CHILD_IDS  CSR adjacency: species it evolves into are
+#                        CHILD_IDS[CHILD_PTR[id]:CHILD_PTR[id + 1]]
+FAMILY = np.full(0, -1, dtype=np.int32)
+STAGE = np.full(0, -1, dtype=np.int8)
+PATH_LEN = np.zeros(0, dtype=np.int8)
+PARENT = np.zeros(0, dtype=np.int16)
+CHILD_PTR = np.zeros(1, dtype=np.int32)
+CHILD_IDS = np.zeros(0, dtype=np.int16)
+
+
+def load(data_dir: str) -> bool:
+    """Load the evolution graph from DATA_DIR. Returns True when available."""
+    global FAMILY, STAGE, PATH_LEN, PARENT, CHILD_PTR, CHILD_IDS
+    path = os.path.join(data_dir, EVOLUTION_FILE)
+    if not os.path.exists(path):
+        return False
+    with np.load(path, allow_pickle=False) as z:
+        g = {k: z[k] for k in z.files}
+    FAMILY, STAGE, PATH_LEN = g['family'], g['stage'], g['path_len']
+    PARENT, CHILD_PTR, CHILD_IDS = g['parent'], g['child_ptr'], g['child_ids']
+    return True
+
+
+def is_loaded() -> bool:
+    return len(FAMILY) > 0
+
+
+def _covered(pid) -> bool:
+    return isinstance(pid, (int, np.integer)) and 0 < pid < len(FAMILY) and FAMILY[pid] >= 0
+
+
+def family_of(pid) -> int:
+    return int(FAMILY[pid]) if _covered(pid) else -1
+
+
+def same_family(a, b) -> bool:
+    return _covered(a) and _covered(b) and FAMILY[a] == FAMILY[b]
+
+
+def family_members(pid) -> list[int]:
+    """Return all species ids in the same family, ordered by id."""
+    if not _covered(pid):
+        return []
+    return np.flatnonzero(FAMILY == FAMILY[pid]).tolist()
+
+
+def pre_evolution(pid) -> int | None:
+    if not _covered(pid):
+        return None
+    parent = int(PARENT[pid])
+    return parent or None
+
+
+def evolutions(pid) -> list[int]:
+    if not _covered(pid):
+        return []
+    return CHILD_IDS[CHILD_PTR[pid]:CHILD_PTR[pid + 1]].tolist()
+
+
+def stage_info(pid):
+    """Return (1-based stage number, total stages on its path) or (None, None)."""
+    if not _covered(pid) or STAGE[pid] < 0:
+        return None, None
+    return int(STAGE[pid]) + 1, int(PATH_LEN[pid]) or None
+
+
+def relation(guess_id, answer_id) -> str:
+    """Daily evolution category of a guess relative to the answer:
+    'same', 'pre', 'post', 'same-family' or 'unrelated'. Stage indexes are compared
+    across the whole family (a sibling branch at the same stage counts as 'same').
+    """
+    if guess_id == answer_id:
+        return 'same'
+    if not same_family(guess_id, answer_id):
+        return 'unrelated'
+    gi, ai = int(STAGE[guess_id]), int(STAGE[answer_id])
+    if gi < 0 or ai < 0:
+        return 'same-family'
+    if gi < ai:
+        return 'pre'
+    if gi > ai:
+        return 'post'
+    return 'same'
@@ -0,0 +1,111 @@
+"""Typo-tolerant name matching ("did you mean").
+
+Normalized aliases are kept in a trigram inverted index. A query only looks at keys
+sharing enough trigrams to possibly be within the edit budget (each edit destroys at
+most three trigrams), and verifies the best of those with a bounded Levenshtein
+distance (bit-parallel), so it never scans the whole alias list.
+"""
+from collections import Counter
+from itertools import chain
+
+from .text_utils import name_key
+
+MIN_QUERY_LEN = 4
+MAX_VERIFY = 24  # candidates verified per query, best trigram overlap first
+
+_KEYS = []       # key index -> normalized alias
+_PIDS = []       # key index -> species id
+_KEY_IDX = {}    # normalized alias -> key index
+_POSTINGS = {}   # trigram -> [key index, ...]
+
+
+def _trigrams(key: str) -> set:
+    padded = f"${key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_distance(key: str) -> int:
+    return 1 if len(key) <= 5 else 2
+
+
+def add(key: str, pid: int):
+    """Index a normalized alias (idempotent; the first species registered wins)."""
+    if not key or key in _KEY_IDX:
+        return
+    idx = len(_KEYS)
+    _KEYS.append(key)
+    _PIDS.append(pid)
+    _KEY_IDX[key] = idx
+    for tg in _trigrams(key):
+        _POSTINGS.setdefault(tg, []).append(idx)
+
+
+def _peq(pattern: str) -> dict:
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _myers(pattern: str, peq: dict, text: str) -> int:
+    """Levenshtein distance via Myers' bit-parallel algorithm (pattern encoded in peq)."""
+    m = len(pattern)
+    if not m:
+        return len(text)
+    mask = (1 << m) - 1
+    hi = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & hi:
+            score += 1
+        elif mh & hi:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def match(query: str, limit: int = 1, normalized: bool = False):
+    """Return up to `limit` (species id, alias, distance) tuples closest to the query,
+    best first. Exact alias matches are not special-cased (distance 0).
+    """
+    key = query if normalized else name_key(query or '')
+    if len(key) < MIN_QUERY_LEN:
+        return []
+    max_dist = max_distance(key)
+    grams = _trigrams(key)
+    counts = Counter(chain.from_iterable(_POSTINGS.get(tg, ()) for tg in grams))
+    need = max(1, len(grams) - 3 * max_dist)
+    cands = [(c, idx) for idx, c in counts.items() if c >= need and abs(len(_KEYS[idx]) - len(key)) <= max_dist]
+    cands.sort(reverse=True)
+    peq = _peq(key)
+    out = []
+    seen_pids = set()
+    for shared, idx in cands[:MAX_VERIFY]:
+        d = _myers(key, peq, _KEYS[idx])
+        if d <= max_dist:
+            out.append((d, -shared, idx))
+    out.sort()
+    results = []
+    for d, _, idx in out:
+        pid = _PIDS[idx]
+        if pid in seen_pids:
+            continue
+        seen_pids.add(pid)
+        results.append((pid, _KEYS[idx], d))
+        if len(results) >= limit:
+            break
+    return results
+
+
+def did_you_mean(query: str):
+    """Return the species id of the closest alias within the edit budget, or None."""
+    res = match(query, limit=1)
+    return res[0][0] if res else None
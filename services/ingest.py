@@ -0,0 +1,583 @@
+"""Offline dataset builder.
+
+Fetches everything the games need from PokeAPI once and writes compact tables
+under DATA_DIR, which the app loads at startup (see services/dataset.py).
+Raw upstream responses are kept under DATA_DIR/raw so re-runs are incremental.
+
+Usage:
+    python -m services.ingest            # build all stages
+    python -m services.ingest attrs      # build selected stages only
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+import requests
+
+from .core import POKEAPI_BASE, TCGDEX_BASE, GEN_ID_RANGES, CORE_LANGS, SUPPORTED_LANGS
+from .entries import flavor_texts_by_lang, mask_names, pick_flavor_text
+from .text_utils import name_key
+from . import cries, dataset, evolution, quiz_bank, tcg_index, type_chart
+
+RAW_DIR = 'raw'
+MAX_WORKERS = 8
+# Rolling window of daily answers frozen into the calendar
+CALENDAR_PAST_DAYS = 365
+CALENDAR_AHEAD_DAYS = 7
+
+
+def _raw_path(data_dir: str, url: str, suffix: str = '.json') -> str:
+    """Map an upstream URL to its file under DATA_DIR/raw/<host>/<path>[@query].json."""
+    u = urlparse(url)
+    path = u.path.strip('/')
+    if path.startswith('api/v2/'):
+        path = path[len('api/v2/'):]
+    if u.query:
+        path += '@' + u.query
+    return os.path.join(data_dir, RAW_DIR, u.netloc.split(':')[0], path + suffix)
+
+
+def get_json(url: str, data_dir: str, retries: int = 4, refresh: bool = False):
+    """GET a JSON document, reading/writing the on-disk raw cache (`refresh` skips the read)."""
+    path = _raw_path(data_dir, url)
+    if not refresh and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    last_exc = None
+    for attempt in range(retries):
+        try:
+            r = requests.get(url, timeout=20)
+            r.raise_for_status()
+            j = r.json()
+            break
+        except Exception as e:
+            last_exc = e
+            time.sleep(0.5 * (attempt + 1))
+    else:
+        raise last_exc
+    _save_json(path, j)
+    return j
+
+
+def get_bytes(url: str, data_dir: str, retries: int = 4) -> bytes:
+    """GET a binary file (e.g. a cry), kept under DATA_DIR/raw with its own extension."""
+    path = _raw_path(data_dir, url, suffix='')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    last_exc = None
+    for attempt in range(retries):
+        try:
+            r = requests.get(url, timeout=20)
+            r.raise_for_status()
+            data = r.content
+            break
+        except Exception as e:
+            last_exc = e
+            time.sleep(0.5 * (attempt + 1))
+    else:
+        raise last_exc
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return data
+
+
+def _id_from_url(url: str):
+    parts = [p for p in (url or '').strip('/').split('/') if p]
+    return int(parts[-1]) if parts and parts[-1].isdigit() else None
+
+
+def parse_chain_paths(node, path_prefix=None, out=None):
+    """Walk an evolution chain node into species-name paths (one per node, root first).
+    Same traversal as games/daily.py::_parse_chain so stage numbers match the live path.
+    """
+    if out is None:
+        out = []
+    if path_prefix is None:
+        path_prefix = []
+    species = (node.get('species') or {}).get('name')
+    cur_path = path_prefix + [species] if species else path_prefix
+    if species:
+        out.append(cur_path)
+    for nxt in node.get('evolves_to') or []:
+        parse_chain_paths(nxt, cur_path, out)
+    return out
+
+
+def species_ids(data_dir: str) -> list[int]:
+    """Return all species ids (National Dex order) within the known generation ranges."""
+    j = get_json(f"{POKEAPI_BASE}/pokemon-species?limit=20000", data_dir)
+    max_id = max(hi for (_, hi) in GEN_ID_RANGES.values())
+    ids = [_id_from_url(it.get('url')) for it in j.get('results', [])]
+    return sorted(i for i in ids if isinstance(i, int) and i <= max_id)
+
+
+def fetch_species_bundle(pid: int, data_dir: str):
+    """Fetch (species json, default pokemon json, evolution chain json) for one species."""
+    sj = get_json(f"{POKEAPI_BASE}/pokemon-species/{pid}", data_dir)
+    default_pid = None
+    for v in sj.get('varieties') or []:
+        if v.get('is_default'):
+            default_pid = _id_from_url((v.get('pokemon') or {}).get('url'))
+            break
+    pj = get_json(f"{POKEAPI_BASE}/pokemon/{default_pid or pid}", data_dir)
+    evo_url = (sj.get('evolution_chain') or {}).get('url')
+    cj = get_json(evo_url, data_dir) if evo_url else {}
+    return sj, pj, cj
+
+
+def _bundles(ids, data_dir):
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        return list(ex.map(lambda pid: fetch_species_bundle(pid, data_dir), ids))
+
+
+def build_attrs(data_dir: str):
+    """Build the column-oriented species attribute table used by the daily puzzle."""
+    ids = species_ids(data_dir)
+    bundles = _bundles(ids, data_dir)
+    type_code = {t: i for i, t in enumerate(dataset.TYPE_NAMES)}
+    color_code = {c: i for i, c in enumerate(dataset.COLOR_NAMES)}
+    n = len(ids)
+    cols = {
+        'id': np.array(ids, dtype=np.int16),
+        'type1': np.full(n, -1, dtype=np.int8),
+        'type2': np.full(n, -1, dtype=np.int8),
+        'height': np.full(n, -1, dtype=np.int32),  # decimeters
+        'weight': np.full(n, -1, dtype=np.int32),  # hectograms
+        'color': np.full(n, -1, dtype=np.int8),
+        'generation': np.zeros(n, dtype=np.int8),
+        'stage': np.zeros(n, dtype=np.int8),
+        'stage_total': np.zeros(n, dtype=np.int8),
+    }
+    slugs = []
+    sprites = []
+    for row, (sj, pj, cj) in enumerate(bundles):
+        types = sorted(pj.get('types', []), key=lambda t: t.get('slot', 99))
+        for k, t in zip(('type1', 'type2'), types):
+            cols[k][row] = type_code.get((t.get('type') or {}).get('name'), -1)
+        if isinstance(pj.get('height'), int):
+            cols['height'][row] = pj['height']
+        if isinstance(pj.get('weight'), int):
+            cols['weight'][row] = pj['weight']
+        cols['color'][row] = color_code.get((sj.get('color') or {}).get('name'), -1)
+        cols['generation'][row] = _id_from_url((sj.get('generation') or {}).get('url')) or 0
+        slug = sj.get('name') or ''
+        # Stage numbers use the last path containing the species, like the live evaluator
+        for path in parse_chain_paths(cj.get('chain') or {}):
+            if slug in path:
+                cols['stage'][row] = path.index(slug) + 1
+                cols['stage_total'][row] = len(path)
+        sprites_j = pj.get('sprites') or {}
+        art = ((sprites_j.get('other') or {}).get('official-artwork') or {}).get('front_default')
+        slugs.append(slug)
+        sprites.append(art or sprites_j.get('front_default') or '')
+    cols['slug'] = np.array(slugs, dtype=np.str_)
+    cols['sprite'] = np.array(sprites, dtype=np.str_)
+    cols['type_names'] = np.array(dataset.TYPE_NAMES, dtype=np.str_)
+    cols['color_names'] = np.array(dataset.COLOR_NAMES, dtype=np.str_)
+    _save_npz(os.path.join(data_dir, dataset.ATTRS_FILE), cols)
+    return n
+
+
+def build_evolution(data_dir: str):
+    """Build the global evolution graph (family, stage, path length, pre/post links)."""
+    ids = species_ids(data_dir)
+    bundles = _bundles(ids, data_dir)
+    size = (max(ids) if ids else 0) + 1
+    family = np.full(size, -1, dtype=np.int32)
+    stage = np.full(size, -1, dtype=np.int8)
+    path_len = np.zeros(size, dtype=np.int8)
+    parent = np.zeros(size, dtype=np.int16)
+    children = {}
+    family_ids = {}  # evolution chain id -> dense family id
+
+    def walk(node, fam, depth, parent_id):
+        sid = _id_from_url((node.get('species') or {}).get('url'))
+        if not sid or sid >= size:
+            return
+        family[sid] = fam
+        stage[sid] = depth
+        parent[sid] = parent_id
+        if parent_id:
+            children.setdefault(parent_id, []).append(sid)
+        for nxt in node.get('evolves_to') or []:
+            walk(nxt, fam, depth + 1, sid)
+
+    slug_to_id = {sj.get('name'): sj.get('id') for sj, _, _ in bundles}
+    for _, _, cj in bundles:
+        chain_id = cj.get('id')
+        if not chain_id or chain_id in family_ids:
+            continue
+        family_ids[chain_id] = len(family_ids)
+        walk(cj.get('chain') or {}, family_ids[chain_id], 0, 0)
+        # Path length follows the last path containing the species (live evaluator semantics)
+        for path in parse_chain_paths(cj.get('chain') or {}):
+            for sp in path:
+                sid = slug_to_id.get(sp)
+                if sid and sid < size:
+                    path_len[sid] = len(path)
+    child_ptr = np.zeros(size + 1, dtype=np.int32)
+    child_ids = []
+    for sid in range(size):
+        kids = sorted(children.get(sid, []))
+        child_ids.extend(kids)
+        child_ptr[sid + 1] = len(child_ids)
+    _save_npz(os.path.join(data_dir, evolution.EVOLUTION_FILE), {
+        'family': family,
+        'stage': stage,
+        'path_len': path_len,
+        'parent': parent,
+        'child_ptr': child_ptr,
+        'child_ids': np.array(child_ids, dtype=np.int16),
+    })
+    return len(family_ids)
+
+
+def localized_names(species_json: dict, langs=None) -> dict:
+    """Return { lang: display name } from a species JSON, for `langs` or every language
+    PokeAPI has (lowercased codes). English uses the title-cased slug, matching
+    get_pokemon_list()/get_localized_name.
+    """
+    out = {'en': (species_json.get('name') or '').replace('-', ' ').title()}
+    for entry in species_json.get('names', []) or []:
+        lang = ((entry.get('language') or {}).get('name') or '').lower()
+        if lang and (langs is None or lang in langs) and lang != 'en' and entry.get('name'):
+            out[lang] = entry['name']
+    return out
+
+
+def build_names(data_dir: str):
+    """Write one name file per language PokeAPI provides, plus the form/variety
+    slug -> species id table."""
+    ids = species_ids(data_dir)
+    names = {lang: {} for lang in CORE_LANGS}
+    forms = {}
+    for pid in ids:
+        sj = get_json(f"{POKEAPI_BASE}/pokemon-species/{pid}", data_dir)
+        for lang, name in localized_names(sj).items():
+            names.setdefault(lang, {})[pid] = name
+        for v in sj.get('varieties') or []:
+            slug = (v.get('pokemon') or {}).get('name')
+            if slug:
+                forms.setdefault(slug, pid)
+    out_dir = os.path.join(data_dir, dataset.NAMES_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    for lang, mapping in names.items():
+        _save_json(os.path.join(out_dir, f"{lang}.json"), mapping)
+    _save_json(os.path.join(data_dir, dataset.FORMS_FILE), forms)
+    return len(ids)
+
+
+def build_entries(data_dir: str):
+    """Write masked Pokédex entries per language: every distinct flavor text of a species
+    with all of its names (in any language) masked out. English also receives another
+    language's entries for species that have no English text."""
+    ids = species_ids(data_dir)
+    out = {lang: {} for lang in CORE_LANGS}
+    for pid in ids:
+        sj = get_json(f"{POKEAPI_BASE}/pokemon-species/{pid}", data_dir)
+        names = set(localized_names(sj).values())
+        names.update(n.get('name') for n in sj.get('names') or [])
+        names.add((sj.get('name') or '').replace('-', ' '))
+        texts = flavor_texts_by_lang(sj)
+        if texts and 'en' not in texts:
+            texts['en'] = next(iter(texts.values()))
+        for lang, lst in texts.items():
+            if lang in SUPPORTED_LANGS:
+                out.setdefault(lang, {})[pid] = [mask_names(t, names) for t in lst]
+    out_dir = os.path.join(data_dir, dataset.ENTRIES_DIR)
+    for lang, mapping in out.items():
+        _save_json(os.path.join(out_dir, f"{lang}.json"), mapping)
+    return len(ids)
+
+
+def _card_name_index(data_dir: str, langs) -> dict:
+    """name_key(localized name) -> species id from the built name files of `langs`."""
+    index = {}
+    for lang in langs:
+        path = os.path.join(data_dir, dataset.NAMES_DIR, f"{lang}.json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for pid, name in json.load(f).items():
+                    index.setdefault(name_key(name), int(pid))
+    return index
+
+
+def name_trie(index: dict) -> dict:
+    """Character trie over the names of a _card_name_index (names of 2+ characters); the
+    species id of a complete name is stored under the '' key of its last node."""
+    root = {}
+    for name, pid in index.items():
+        if len(name) < 2:
+            continue
+        node = root
+        for ch in name:
+            node = node.setdefault(ch, {})
+        node.setdefault('', pid)
+    return root
+
+
+def _longest_contained(key: str, trie: dict):
+    """Species id of the longest trie name occurring anywhere in key (leftmost on ties)."""
+    best_len, best = 0, None
+    for i in range(len(key)):
+        node = trie
+        for j in range(i, len(key)):
+            node = node.get(key[j])
+            if node is None:
+                break
+            if '' in node and j + 1 - i > best_len:
+                best_len, best = j + 1 - i, node['']
+    return best
+
+
+def match_card_species(card_name: str, index: dict, max_words: int = 3, trie: dict | None = None):
+    """Map a TCG card name ("Dark Charizard", "Team Rocket's Meowth", "Mr. Mime ex") to a
+    species id: the longest run of words that is a known name wins. Names written without
+    spaces (ja, zh, ko) fall back to the longest known name contained in the card name,
+    found with `trie` (name_trie(index); pass it when matching many cards)."""
+    words = (card_name or '').split()
+    for n in range(min(max_words, len(words)), 0, -1):
+        for i in range(len(words) - n + 1):
+            pid = index.get(name_key(' '.join(words[i:i + n])))
+            if pid:
+                return pid
+    key = name_key(card_name or '')
+    if key.isascii():
+        return None
+    return _longest_contained(key, trie if trie is not None else name_trie(index))
+
+
+def build_tcg(data_dir: str, refresh: bool = False):
+    """Build the per-language TCG card index (species id -> card ids and image URLs) from
+    the bulk TCGdex card lists. `refresh` re-downloads the lists instead of using data/raw."""
+    groups = {}  # TCGdex lang -> app languages whose names identify its cards
+    for lang in SUPPORTED_LANGS:
+        groups.setdefault(tcg_index.tcgdex_lang(lang), {'en'}).add(lang)
+    out_dir = os.path.join(data_dir, tcg_index.TCG_DIR)
+    total = 0
+    for code, langs in sorted(groups.items()):
+        try:
+            cards = get_json(f"{TCGDEX_BASE}/{code}/cards", data_dir, refresh=refresh)
+        except Exception as e:
+            print(f"[ingest] tcg: skipping {code}: {e}")
+            continue
+        index = _card_name_index(data_dir, sorted(langs))
+        trie = name_trie(index)
+        by_species = {}
+        for c in cards if isinstance(cards, list) else []:
+            img = c.get('image')
+            pid = match_card_species(c.get('name'), index, trie=trie) if img else None
+            if pid:
+                by_species.setdefault(pid, []).append((c.get('id') or c.get('localId') or '', img))
+        size = (max(by_species) if by_species else 0) + 1
+        ptr = np.zeros(size + 1, dtype=np.int32)
+        card_ids, images = [], []
+        for pid in range(size):
+            for cid, img in by_species.get(pid, []):
+                card_ids.append(cid)
+                images.append(img.rstrip('/'))
+            ptr[pid + 1] = len(card_ids)
+        _save_npz(os.path.join(out_dir, f"{code}.npz"), {
+            'ptr': ptr,
+            'card_ids': np.array(card_ids, dtype=np.str_),
+            'images': np.array(images, dtype=np.str_),
+        })
+        total += len(card_ids)
+    return total
+
+
+def build_types(data_dir: str):
+    """Build the type effectiveness matrix and dual-type defensive profiles (services/type_chart.py)."""
+    names = list(dataset.TYPE_NAMES)
+    type_jsons = {name: get_json(f"{POKEAPI_BASE}/type/{name}", data_dir) for name in names}
+    chart = type_chart.chart_from_types(type_jsons, names)
+    _save_npz(os.path.join(data_dir, type_chart.TYPE_CHART_FILE), {
+        'type_names': np.array(names, dtype=np.str_),
+        'chart': chart,
+        'profiles': type_chart.profiles_for(chart),
+    })
+    return len(names)
+
+
+def _cry_row(pid: int, data_dir: str):
+    pj = get_json(f"{POKEAPI_BASE}/pokemon/{pid}", data_dir)
+    url = (pj.get('cries') or {}).get('latest') or (pj.get('cries') or {}).get('legacy') or ''
+    if not url:
+        return url, 0, np.zeros(cries.PEAK_BUCKETS, dtype=np.int8)
+    try:
+        duration, peaks = cries.analyze(get_bytes(url, data_dir))
+    except Exception as e:
+        print(f"[ingest] cries: no envelope for {pid}: {e}")
+        return url, 0, np.zeros(cries.PEAK_BUCKETS, dtype=np.int8)
+    return url, int(round(duration * 1000)), peaks
+
+
+def build_cries(data_dir: str):
+    """Record each species' cry URL, duration and waveform envelope (see services/cries.py)."""
+    ids = species_ids(data_dir)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        rows = list(ex.map(lambda pid: _cry_row(pid, data_dir), ids))
+    _save_npz(os.path.join(data_dir, cries.CRIES_FILE), {
+        'id': np.array(ids, dtype=np.int16),
+        'url': np.array([r[0] for r in rows], dtype=np.str_),
+        'duration_ms': np.array([r[1] for r in rows], dtype=np.int32),
+        'peaks': np.stack([r[2] for r in rows]) if rows else np.zeros((0, cries.PEAK_BUCKETS), dtype=np.int8),
+    })
+    return sum(1 for r in rows if r[1] > 0)
+
+
+def build_quiz(data_dir: str):
+    """Generate the quiz question bank (services/quiz_bank.py). Only generations whose
+    species data changed since the last build are regenerated."""
+    if not dataset.load(data_dir):
+        build_attrs(data_dir)
+        dataset.load(data_dir)
+    if not evolution.is_loaded():
+        build_evolution(data_dir)
+        evolution.load(data_dir)
+    quiz_dir = os.path.join(data_dir, quiz_bank.QUIZ_DIR)
+    old = quiz_bank.read_manifest(data_dir).get('shards', {})
+    shards = {}
+    rebuilt = 0
+    for gen in sorted(g for g in set(dataset.ATTRS['generation'].tolist()) if g > 0):
+        fp = quiz_bank.fingerprint(gen)
+        for d in range(len(quiz_bank.DIFFICULTIES)):
+            name = quiz_bank.shard_name(gen, d)
+            path = os.path.join(quiz_dir, f"{name}.npy")
+            if old.get(name, {}).get('fingerprint') == fp and os.path.exists(path):
+                shards[name] = old[name]
+                continue
+            bank = quiz_bank.generate(gen, d, random.Random(f"{fp}:{d}"))
+            _save_npy(path, bank)
+            shards[name] = {
+                'generation': gen,
+                'difficulty': quiz_bank.DIFFICULTIES[d],
+                'fingerprint': fp,
+                'rows': len(bank),
+                'kind_ptr': quiz_bank.kind_offsets(bank),
+            }
+            rebuilt += 1
+    for name in set(old) - set(shards):
+        try:
+            os.remove(os.path.join(quiz_dir, f"{name}.npy"))
+        except OSError:
+            pass
+    _save_json(os.path.join(quiz_dir, quiz_bank.MANIFEST_FILE), {
+        'version': quiz_bank.QUIZ_VERSION,
+        'kinds': quiz_bank.KINDS,
+        'columns': quiz_bank.COLUMNS,
+        'shards': shards,
+    })
+    print(f"[ingest] quiz: {rebuilt} of {len(shards)} shards regenerated")
+    return sum(s['rows'] for s in shards.values())
+
+
+def build_calendar(data_dir: str):
+    """Freeze daily answers (id, attribute row, meta payload per language) for a rolling
+    window of dates. Dates already in the calendar are kept as-is so their answer never changes.
+    """
+    if not dataset.load(data_dir):
+        build_attrs(data_dir)
+        dataset.load(data_dir)
+    ids = species_ids(data_dir)
+    dates = dict(dataset.load_calendar(data_dir))
+    today = datetime.now(timezone.utc).date()
+    oldest = (today - timedelta(days=CALENDAR_PAST_DAYS)).isoformat()
+    dates = {k: v for k, v in dates.items() if k >= oldest}
+    for offset in range(-CALENDAR_PAST_DAYS, CALENDAR_AHEAD_DAYS + 1):
+        date_key = (today + timedelta(days=offset)).isoformat()
+        if date_key in dates:
+            continue
+        pid = dataset.hash_daily_id(date_key, ids)
+        attrs = dataset.attrs_for(pid)
+        if attrs is None:
+            continue
+        sj = get_json(f"{POKEAPI_BASE}/pokemon-species/{pid}", data_dir)
+        names = localized_names(sj, CORE_LANGS)
+        meta = {}
+        for lang in sorted(CORE_LANGS):
+            meta[lang] = {
+                'id': pid,
+                'name': names.get(lang) or names['en'],
+                'sprite': dataset.sprite_for(pid),
+                'color': attrs['color'] or '',
+                'generation': str(attrs['generation'] or ''),
+                'entry': pick_flavor_text(sj, lang),
+            }
+        dates[date_key] = {'id': pid, 'attrs': attrs, 'meta': meta}
+    _save_json(os.path.join(data_dir, dataset.CALENDAR_FILE), {'dates': dict(sorted(dates.items()))})
+    return len(dates)
+
+
+def _save_json(path: str, obj):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _save_npy(path: str, arr: np.ndarray):
+    # Plain .npy (not .npz) so the app can memory-map it
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.save(f, arr, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def _save_npz(path: str, cols: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp.npz'
+    np.savez_compressed(tmp, **cols)
+    os.replace(tmp, path)
+
+
+# Stage name -> builder(data_dir) -> row count; run in declaration order
+STAGES = {
+    'attrs': build_attrs,
+    'evolution': build_evolution,
+    'names': build_names,
+    'entries': build_entries,
+    'tcg': build_tcg,
+    'cries': build_cries,
+    'types': build_types,
+    'quiz': build_quiz,
+    'calendar': build_calendar,
+}
+REFRESHABLE = {'tcg'}  # stages taking refresh=True to bypass the raw cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the offline Pokémon dataset.')
+    parser.add_argument('stages', nargs='*', help=f"stages to build (default: all of {', '.join(STAGES)})")
+    parser.add_argument('--data-dir', default=dataset.DATA_DIR)
+    parser.add_argument('--refresh', action='store_true',
+                        help='re-download the upstream lists of the stages that support it (tcg)')
+    args = parser.parse_args(argv)
+    unknown = [s for s in args.stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    for name in args.stages or list(STAGES):
+        t0 = time.perf_counter()
+        if name in REFRESHABLE:
+            count = STAGES[name](args.data_dir, refresh=args.refresh)
+        else:
+            count = STAGES[name](args.data_dir)
+        print(f"[ingest] {name}: {count} rows in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
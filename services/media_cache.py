@@ -0,0 +1,211 @@
+"""Size-bounded on-disk cache for proxied media (artwork, TCG cards, cries).
+
+Each blob is stored once under DATA_DIR/media/blobs/<aa>/<sha256><ext>, keyed by the
+hash of its content. A small key file maps each proxied asset (e.g. 'artwork:25') to
+its blob; assets upstream does not have get a key file marking them missing for
+NEGATIVE_TTL. When the files under DATA_DIR/media (blobs and key files) grow past MAX_BYTES,
+the least recently used ones are evicted.
+
+Every gunicorn worker writes into the same directory but only sees its own writes, so a
+worker re-measures the directory after it has added RESCAN_BYTES: together the workers
+overshoot the bound by at most one RESCAN_BYTES each.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+
+import requests
+
+from . import dataset
+
+MEDIA_DIR = 'media'
+MAX_BYTES = int(os.environ.get('MEDIA_CACHE_MAX_BYTES') or 512 * 1024 * 1024)
+MAX_ASSET_BYTES = 20 * 1024 * 1024
+RESCAN_BYTES = MAX_BYTES // 16  # local writes after which the directory size is re-measured
+TOUCH_INTERVAL = 60 * 60  # refresh a file's recency (mtime) at most this often
+NEGATIVE_TTL = 60 * 60  # how long an asset upstream does not have is answered from the marker
+EXTENSIONS = {
+    'image/png': '.png', 'image/webp': '.webp', 'image/jpeg': '.jpg', 'image/gif': '.gif',
+    'audio/ogg': '.ogg', 'audio/mpeg': '.mp3', 'audio/wav': '.wav',
+}
+
+_LOCK = threading.Lock()
+_KEY_LOCKS = {}  # key -> Lock, so concurrent misses for one asset fetch it once
+_TOTAL = None    # bytes under the cache root at the last scan, plus this worker's writes since
+_UNSCANNED = 0   # bytes this worker wrote since the last scan
+
+
+def _root() -> str:
+    return os.path.join(dataset.DATA_DIR, MEDIA_DIR)
+
+
+def _key_path(key: str) -> str:
+    h = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(_root(), 'keys', h[:2], h + '.json')
+
+
+def _blob_path(digest: str, ext: str) -> str:
+    return os.path.join(_root(), 'blobs', digest[:2], digest + ext)
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _read_key(key_path: str):
+    """(key file contents, key file mtime), or (None, 0) when there is no key file."""
+    try:
+        with open(key_path, 'r', encoding='utf-8') as f:
+            return json.load(f), os.fstat(f.fileno()).st_mtime
+    except (OSError, ValueError):
+        return None, 0
+
+
+def lookup(key: str):
+    """Return { 'path', 'hash', 'mimetype' } for a cached asset, or None."""
+    key_path = _key_path(key)
+    entry, key_mtime = _read_key(key_path)
+    if not entry or entry.get('missing'):
+        return None
+    path = _blob_path(entry['hash'], entry['ext'])
+    now = time.time()
+    try:
+        if now - os.path.getmtime(path) > TOUCH_INTERVAL:
+            os.utime(path)
+        if now - key_mtime > TOUCH_INTERVAL:
+            os.utime(key_path)
+    except OSError:
+        return None  # evicted
+    return {'path': path, 'hash': entry['hash'], 'mimetype': entry['mimetype']}
+
+
+def _mimetype(resp, url: str) -> str:
+    ctype = (resp.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+    if not ctype.startswith(('image/', 'audio/')):
+        # Raw GitHub serves binaries as octet-stream/text: trust the file extension instead
+        ctype = (mimetypes.guess_type(url)[0] or '').lower()
+    return ctype
+
+
+def fetch(key: str, url: str):
+    """Download an asset, store it and map `key` to it. Returns the lookup() entry."""
+    with _LOCK:
+        key_lock = _KEY_LOCKS.setdefault(key, threading.Lock())
+    try:
+        with key_lock:
+            entry = lookup(key) or _download(key, url)
+    finally:
+        with _LOCK:
+            _KEY_LOCKS.pop(key, None)
+    return entry
+
+
+def _download(key: str, url: str):
+    resp = requests.get(url, timeout=20, stream=True)
+    resp.raise_for_status()
+    mimetype = _mimetype(resp, url)
+    if not mimetype.startswith(('image/', 'audio/')):
+        raise ValueError(f"unsupported media type {mimetype or 'unknown'} for {key}")
+    chunks, size = [], 0
+    for chunk in resp.iter_content(64 * 1024):
+        size += len(chunk)
+        if size > MAX_ASSET_BYTES:
+            raise ValueError(f"asset too large for {key}")
+        chunks.append(chunk)
+    return store(key, b''.join(chunks), mimetype, url)
+
+
+def store(key: str, data: bytes, mimetype: str, url: str = ''):
+    """Store content under `key` (e.g. an image rendered locally). Returns the lookup() entry."""
+    digest = hashlib.sha256(data).hexdigest()
+    ext = EXTENSIONS.get(mimetype) or mimetypes.guess_extension(mimetype) or ''
+    path = _blob_path(digest, ext)
+    added = 0
+    if not os.path.exists(path):
+        _write_atomic(path, data)
+        added += len(data)
+    key_data = json.dumps({'hash': digest, 'ext': ext, 'mimetype': mimetype, 'url': url}).encode('utf-8')
+    _write_atomic(_key_path(key), key_data)
+    _account(added + len(key_data))
+    return lookup(key)
+
+
+def is_missing(key: str) -> bool:
+    """True when `key` was recorded as missing upstream less than NEGATIVE_TTL ago."""
+    entry, mtime = _read_key(_key_path(key))
+    return bool(entry and entry.get('missing')) and time.time() - mtime < NEGATIVE_TTL
+
+
+def store_missing(key: str):
+    """Record that upstream has no asset for `key`, so get() answers None for a while."""
+    data = json.dumps({'missing': True}).encode('utf-8')
+    _write_atomic(_key_path(key), data)
+    _account(len(data))
+
+
+def get(key: str, resolve_url):
+    """Return the cached entry for `key`, fetching it from resolve_url() on a miss.
+    Returns None when no upstream URL is known or upstream answers 404; both are
+    remembered for NEGATIVE_TTL."""
+    entry = lookup(key)
+    if entry:
+        return entry
+    if is_missing(key):
+        return None
+    url = resolve_url()
+    if not url:
+        store_missing(key)
+        return None
+    try:
+        return fetch(key, url)
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 404:
+            raise
+        store_missing(key)
+        return None
+
+
+def _files():
+    """(path, size, mtime) of every file under the cache root (blobs and key files)."""
+    for dirpath, _, files in os.walk(_root()):
+        for fn in files:
+            if not fn.endswith('.tmp'):
+                path = os.path.join(dirpath, fn)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+
+def _account(added: int):
+    global _TOTAL, _UNSCANNED
+    with _LOCK:
+        _UNSCANNED += added
+        if _TOTAL is None or _UNSCANNED >= RESCAN_BYTES:
+            # Other workers' writes and evictions only show up on disk
+            _TOTAL, _UNSCANNED = sum(size for _, size, _ in _files()), 0
+        else:
+            _TOTAL += added
+        if _TOTAL <= MAX_BYTES:
+            return
+        # Evict least recently used files down to 90% of the budget; a removed key file
+        # or a key file whose blob was removed simply becomes a miss
+        files = sorted(_files(), key=lambda b: b[2])
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if total <= MAX_BYTES * 0.9:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        _TOTAL, _UNSCANNED = total, 0
@@ -0,0 +1,298 @@
+"""Process metrics, exported in the Prometheus text format at /metrics.
+
+Recording is lock-free: every thread counts into its own dicts, so a hot path pays for
+one dict update and takes no lock. Every FLUSH_SECONDS (and on every scrape) a worker
+folds its threads' counts into a snapshot and writes it to METRICS_DIR/<pid>.json. The
+/metrics endpoint of whichever gunicorn worker answers merges the snapshots of all
+workers started by the same master:
+  - counters and histograms are summed over every snapshot, including those of workers
+    that have exited, so totals never go backwards when a worker is recycled;
+  - gauges are reported per live worker, with a `pid` label.
+
+Metric names use the `pokemon_` prefix. Histograms share the LATENCY_BUCKETS bounds.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from urllib.parse import urlparse
+
+import requests
+
+from . import tracing
+
+FLUSH_SECONDS = 10
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+# name -> (type, help); only registered names are exported
+METRICS = {
+    'pokemon_http_requests_total': ('counter', 'HTTP requests served, by route, method and status.'),
+    'pokemon_http_request_duration_seconds': ('histogram', 'HTTP request latency by route.'),
+    'pokemon_upstream_requests_total': ('counter', 'Outgoing HTTP requests by upstream host.'),
+    'pokemon_upstream_errors_total': ('counter', 'Failed outgoing HTTP requests (exceptions and 5xx/429 responses) by host.'),
+    'pokemon_upstream_request_duration_seconds': ('histogram', 'Outgoing HTTP request latency by upstream host.'),
+    'pokemon_cache_events_total': ('counter', 'In-memory cache lookups and evictions, by cache and event (hit, miss, eviction).'),
+    'pokemon_executor_queue_depth': ('gauge', 'Tasks waiting in a thread pool queue.'),
+    'pokemon_warmup_species': ('gauge', 'Species name warmup progress (state: done, total).'),
+    'pokemon_warmup_complete': ('gauge', '1 once the species name warmup has finished.'),
+}
+
+_LOCAL = threading.local()
+_THREADS = []      # (thread, counters, histograms) for every thread that recorded something
+_BASE = ({}, {})   # counts of exited threads
+_GAUGES = {}       # (name, labels) -> callable returning the current value
+_LOCK = threading.Lock()
+_TIMER = None
+
+
+def _metrics_dir() -> str:
+    # Workers of one gunicorn master share a parent pid, hence a directory
+    return os.environ.get('METRICS_DIR') or os.path.join(
+        tempfile.gettempdir(), 'pokemon-metrics', str(os.getppid())
+    )
+
+
+def _state():
+    try:
+        return _LOCAL.state
+    except AttributeError:
+        state = _LOCAL.state = ({}, {})
+        with _LOCK:
+            _THREADS.append((threading.current_thread(), *state))
+        return state
+
+
+def inc(name: str, labels: tuple = (), value: float = 1):
+    """Add to a counter. labels is a tuple of (label, value) pairs in a fixed order."""
+    counters = _state()[0]
+    key = (name, labels)
+    counters[key] = counters.get(key, 0) + value
+
+
+def observe(name: str, labels: tuple, seconds: float):
+    """Record one histogram observation."""
+    histograms = _state()[1]
+    key = (name, labels)
+    h = histograms.get(key)
+    if h is None:
+        # Per-bucket counts (last slot is +Inf), then sum and count
+        h = histograms[key] = [0] * (len(LATENCY_BUCKETS) + 3)
+    h[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    h[-2] += seconds
+    h[-1] += 1
+
+
+def cache_event(cache: str, event: str, n: int = 1):
+    """Count n events of a cache (bulk lookups record their hits and misses in one call)."""
+    if n:
+        inc('pokemon_cache_events_total', (('cache', cache), ('event', event)), n)
+        tracing.record_cache(cache, event, n)
+
+
+def register_gauge(name: str, labels: tuple, fn):
+    """Report fn() as a gauge of this worker at every snapshot."""
+    _GAUGES[(name, labels)] = fn
+
+
+def register_executor(name: str, executor):
+    register_gauge('pokemon_executor_queue_depth', (('executor', name),), executor._work_queue.qsize)
+
+
+def observe_request(route: str, method: str, status: int, seconds: float):
+    inc('pokemon_http_requests_total', (('route', route), ('method', method), ('status', str(status))))
+    observe('pokemon_http_request_duration_seconds', (('route', route),), seconds)
+
+
+# ---- Upstream HTTP calls ----
+
+def _instrumented_send(send):
+    def wrapper(session, request, **kwargs):
+        host = urlparse(request.url).hostname or 'unknown'
+        t0 = time.perf_counter()
+        try:
+            resp = send(session, request, **kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - t0
+            inc('pokemon_upstream_requests_total', (('host', host),))
+            inc('pokemon_upstream_errors_total', (('host', host), ('kind', type(e).__name__)))
+            observe('pokemon_upstream_request_duration_seconds', (('host', host),), elapsed)
+            tracing.record_upstream(host, elapsed, error=True)
+            raise
+        elapsed = time.perf_counter() - t0
+        failed = resp.status_code >= 500 or resp.status_code == 429
+        inc('pokemon_upstream_requests_total', (('host', host),))
+        if failed:
+            inc('pokemon_upstream_errors_total', (('host', host), ('kind', f"http_{resp.status_code}")))
+        observe('pokemon_upstream_request_duration_seconds', (('host', host),), elapsed)
+        if tracing.current() is not None:
+            # Without stream=True the body is already read; streamed bodies count their declared size
+            nbytes = int(resp.headers.get('Content-Length') or 0) if kwargs.get('stream') else len(resp.content)
+            tracing.record_upstream(host, elapsed, nbytes, failed)
+        return resp
+    wrapper._metrics_wrapped = True
+    return wrapper
+
+
+def instrument_requests():
+    """Count and time every request made through `requests` (all sessions use Session.send)."""
+    send = requests.Session.send
+    if not getattr(send, '_metrics_wrapped', False):
+        requests.Session.send = _instrumented_send(send)
+
+
+# ---- Snapshots ----
+
+def _merge_into(dst, counters, histograms):
+    for key, v in counters.items():
+        dst[0][key] = dst[0].get(key, 0) + v
+    for key, h in histograms.items():
+        cur = dst[1].get(key)
+        dst[1][key] = list(h) if cur is None else [a + b for a, b in zip(cur, h)]
+
+
+def snapshot() -> dict:
+    """This worker's totals (counters, histograms) and current gauge values."""
+    with _LOCK:
+        live = []
+        for entry in _THREADS:
+            thread, counters, histograms = entry
+            if thread.is_alive():
+                live.append(entry)
+            else:
+                _merge_into(_BASE, counters.copy(), histograms.copy())
+        _THREADS[:] = live
+        total = ({}, {})
+        _merge_into(total, _BASE[0], _BASE[1])
+        for _, counters, histograms in live:
+            _merge_into(total, counters.copy(), {k: list(v) for k, v in histograms.copy().items()})
+    gauges = []
+    for (name, labels), fn in list(_GAUGES.items()):
+        try:
+            gauges.append([name, list(labels), float(fn())])
+        except Exception:
+            pass
+    return {
+        'pid': os.getpid(),
+        'counters': [[n, list(l), v] for (n, l), v in total[0].items()],
+        'histograms': [[n, list(l), h] for (n, l), h in total[1].items()],
+        'gauges': gauges,
+    }
+
+
+def flush() -> dict:
+    """Write this worker's snapshot to METRICS_DIR and return it."""
+    snap = snapshot()
+    path = os.path.join(_metrics_dir(), f"{snap['pid']}.json")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(snap, f)
+        os.replace(tmp, path)
+    except Exception:
+        pass  # metrics must never break the app
+    return snap
+
+
+def _tick():
+    global _TIMER
+    flush()
+    _TIMER = threading.Timer(FLUSH_SECONDS, _tick)
+    _TIMER.daemon = True
+    _TIMER.start()
+
+
+def start_flusher():
+    """Start the periodic snapshot writer (once per worker process)."""
+    global _TIMER
+    if _TIMER is not None:
+        return
+    _TIMER = threading.Timer(FLUSH_SECONDS, _tick)
+    _TIMER.daemon = True
+    _TIMER.start()
+    atexit.register(flush)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _snapshots(own: dict) -> list:
+    snaps = [own]
+    d = _metrics_dir()
+    try:
+        names = os.listdir(d)
+    except OSError:
+        return snaps
+    for fn in names:
+        if not fn.endswith('.json') or fn == f"{own['pid']}.json":
+            continue
+        try:
+            with open(os.path.join(d, fn), 'r', encoding='utf-8') as f:
+                snaps.append(json.load(f))
+        except Exception:
+            continue
+    return snaps
+
+
+def _fmt_labels(labels) -> str:
+    if not labels:
+        return ''
+    parts = []
+    for k, v in labels:
+        v = str(v).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _fmt_value(v) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def render() -> str:
+    """Prometheus text exposition of all workers' metrics."""
+    counters, histograms, gauges = {}, {}, {}
+    for snap in _snapshots(flush()):
+        for name, labels, v in snap.get('counters', []):
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + v
+        for name, labels, h in snap.get('histograms', []):
+            key = (name, tuple(map(tuple, labels)))
+            cur = histograms.get(key)
+            histograms[key] = list(h) if cur is None else [a + b for a, b in zip(cur, h)]
+        pid = snap.get('pid')
+        if pid == os.getpid() or (isinstance(pid, int) and _alive(pid)):
+            for name, labels, v in snap.get('gauges', []):
+                gauges[(name, tuple(map(tuple, labels)) + (('pid', str(pid)),))] = v
+
+    by_name = {}
+    for store in (counters, histograms, gauges):
+        for (name, labels), v in store.items():
+            by_name.setdefault(name, []).append((labels, v))
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        series = sorted(by_name.get(name, []))
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, v in series:
+            if kind != 'histogram':
+                lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(v)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ['+Inf'], v[:-2]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_value(v[-2])}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {_fmt_value(v[-1])}")
+    return '\n'.join(lines) + '\n'
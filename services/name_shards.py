@@ -0,0 +1,116 @@
+"""Localized species names, one compact shard per language.
+
+A shard is a list indexed by species id holding interned display names (None when
+unknown). It is read from DATA_DIR/names/<lang>.json the first time the language is used
+on this worker and then filled in by live PokeAPI lookups, so memory grows with the
+languages actually requested rather than with every language PokeAPI knows. Only
+SUPPORTED_LANGS get a shard; any other code has no names, so callers fall back to English.
+"""
+import json
+import os
+import sys
+import threading
+
+from . import aliases, cache_registry, dataset, metrics
+from .core import SUPPORTED_LANGS
+
+SHARDS = {}  # lang -> [localized name or None], indexed by species id
+COMPLETE = set()  # languages read from the dataset: a missing name there means PokeAPI has none
+_LOCK = threading.Lock()
+
+
+def _read(lang: str) -> list:
+    if dataset.NAME_LANGS:
+        # Names were built: a language without a file has no names upstream either
+        COMPLETE.add(lang)
+    path = dataset.names_file(lang)
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        mapping = {int(k): v for k, v in json.load(f).items() if v}
+    names = [None] * (max(mapping) + 1 if mapping else 0)
+    for pid, name in mapping.items():
+        names[pid] = sys.intern(name)
+    return names
+
+
+def shard(lang: str) -> list:
+    """Return the shard for a language, loading it (and its aliases) on first use."""
+    names = SHARDS.get(lang)
+    if names is not None:
+        return names
+    if lang not in SUPPORTED_LANGS:
+        return []  # not stored, so arbitrary ?lang= values cannot grow SHARDS
+    with _LOCK:
+        names = SHARDS.get(lang)
+        if names is None:
+            names = _read(lang)
+            for pid, name in enumerate(names):
+                if name:
+                    aliases.add(pid, name, lang)
+            SHARDS[lang] = names
+    return names
+
+
+def get(pid: int, lang: str) -> str | None:
+    names = shard(lang)
+    name = names[pid] if 0 <= pid < len(names) else None
+    metrics.cache_event('species_names', 'hit' if name else 'miss')
+    return name
+
+
+def get_many(ids, lang: str) -> list:
+    """get() for every id of a scan, with the hits and misses counted once per call."""
+    names = shard(lang)
+    n = len(names)
+    out = [names[pid] if 0 <= pid < n else None for pid in ids]
+    misses = out.count(None)
+    metrics.cache_event('species_names', 'hit', len(out) - misses)
+    metrics.cache_event('species_names', 'miss', misses)
+    return out
+
+
+def put(pid: int, lang_map: dict):
+    """Record live-fetched names ({ lang: name }) for the languages loaded on this worker."""
+    with _LOCK:
+        for lang, name in (lang_map or {}).items():
+            names = SHARDS.get(lang)
+            if names is None or not name:
+                continue
+            if pid >= len(names):
+                names.extend([None] * (pid + 1 - len(names)))
+            names[pid] = sys.intern(name)
+            aliases.add(pid, name, lang)
+
+
+def missing(ids, lang: str) -> list:
+    """Species ids among `ids` that still need a live lookup for the language."""
+    names = shard(lang)
+    if lang in COMPLETE or lang not in SUPPORTED_LANGS:
+        return []
+    n = len(names)
+    return [pid for pid in ids if pid >= n or names[pid] is None]
+
+
+def is_complete(lang: str) -> bool:
+    """True when no live lookup can add names for the language."""
+    shard(lang)
+    return lang in COMPLETE or lang not in SUPPORTED_LANGS
+
+
+def loaded_langs() -> list:
+    return list(SHARDS)
+
+
+def forget(pid: int) -> int:
+    """Drop one species' names from every loaded shard (they are fetched again on demand)."""
+    n = 0
+    with _LOCK:
+        for names in SHARDS.values():
+            if 0 <= pid < len(names) and names[pid] is not None:
+                names[pid] = None
+                n += 1
+    return n
+
+
+cache_registry.configure('services.name_shards.SHARDS', forget=forget, metric='species_names')
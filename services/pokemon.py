@@ -6,23 +6,29 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import unicodedata
 
 import requests
-from .core import POKEAPI_BASE, SUPPORTED_LANGS
+from .core import POKEAPI_BASE, SUPPORTED_LANGS, CORE_LANGS
+from . import aliases, cache_registry, dataset, metrics, name_shards, tracing
 
 # In-memory caches and executors shared across games
 POKEMON_NAMES = []  # English display names list (title-cased)
 POKEMON_LIST = []   # List of dicts: { 'id': int, 'slug': str, 'display_en': str }
 DISPLAY_TO_ID = {}  # English display name -> id
-SPECIES_NAMES = {}  # id -> { lang: localized_display }
 SPECIES_META = {}   # id -> { 'color': str, 'generation': str }
 VARIANT_GUESS_CACHE = {}  # normalized guess -> base species id (or None if unknown)
 
 
 # Thread pool for parallel species fetches (bounded to be polite to PokeAPI)
 EXECUTOR = ThreadPoolExecutor(max_workers=8)
+metrics.register_executor('species', EXECUTOR)
 
 # Warmup flags
 WARMED = False
 WARMUP_SCHEDULED = False
+WARMUP_TOTAL = 0  # species queued by warm_up_all_names
+WARMUP_DONE = 0   # ... and finished (successfully or not)
+metrics.register_gauge('pokemon_warmup_species', (('state', 'total'),), lambda: WARMUP_TOTAL)
+metrics.register_gauge('pokemon_warmup_species', (('state', 'done'),), lambda: WARMUP_DONE)
+metrics.register_gauge('pokemon_warmup_complete', (), lambda: int(WARMED))
 
 # Generation ID ranges (National Dex) — inclusive
 # Source: https://bulbapedia.bulbagarden.net/wiki/List_of_Pok%C3%A9mon_by_National_Pok%C3%A9dex_number
@@ -121,10 +127,33 @@ def get_pokemon_list():
         max_species_id = 1025
     lst = [p for p in lst if isinstance(p.get('id'), int) and p['id'] <= max_species_id]
     lst.sort(key=lambda x: x['id'])
+    _set_pokemon_list(lst)
+    return POKEMON_LIST
+
+
+def _set_pokemon_list(lst):
+    global POKEMON_LIST, DISPLAY_TO_ID, POKEMON_NAMES
+    for p in lst:
+        aliases.register_species(p['id'], p['slug'], p['display_en'])
     POKEMON_LIST = lst
     DISPLAY_TO_ID = {p['display_en']: p['id'] for p in lst}
     POKEMON_NAMES = [p['display_en'] for p in lst]
-    return POKEMON_LIST
+
+
+def load_prebuilt():
+    """Seed the species list, localized names and alias index from the offline dataset
+    (no-op for parts that were not built). Call after dataset.load().
+    """
+    if dataset.is_loaded() and not POKEMON_LIST:
+        lst = []
+        for pid, slug in zip(dataset.ATTRS['id'].tolist(), dataset.ATTRS['slug'].tolist()):
+            lst.append({'id': pid, 'slug': slug, 'display_en': slug.replace('-', ' ').title()})
+        _set_pokemon_list(lst)
+    # Names for the core languages are always needed; other shards load on first use
+    for lang in sorted(CORE_LANGS):
+        name_shards.shard(lang)
+    for slug, pid in dataset.FORMS.items():
+        aliases.register_form(slug, pid)
 
 
 def fetch_all_pokemon_names():
@@ -145,29 +174,33 @@ def get_localized_name(poke_id: int, lang: str) -> str:
             if p['id'] == poke_id:
                 return p['display_en']
         return str(poke_id)
-    if poke_id in SPECIES_NAMES and lang in SPECIES_NAMES[poke_id]:
-        return SPECIES_NAMES[poke_id][lang]
+    name = name_shards.get(poke_id, lang)
+    if name:
+        return name
+    if name_shards.is_complete(lang):
+        return get_localized_name(poke_id, 'en')
     url = f"{POKEAPI_BASE}/pokemon-species/{poke_id}"
     r = requests.get(url, timeout=8)
     r.raise_for_status()
-    j = r.json()
-    names_list = j.get('names', [])
+    lang_map = _species_names(r.json(), poke_id)
+    name_shards.put(poke_id, lang_map)
+    return lang_map.get(lang) or lang_map.get('en')
+
+
+def _species_names(species_json: dict, poke_id: int) -> dict:
+    """Return { lang: name } for every supported language in a species JSON."""
     lang_map = {}
-    for entry in names_list:
+    for entry in species_json.get('names', []):
         nm = entry.get('name')
-        lang_code = (entry.get('language') or {}).get('name')
-        if nm and lang_code:
-            if lang_code in SUPPORTED_LANGS:
-                lang_map[lang_code] = nm
-            elif lang_code == 'en':
-                lang_map['en'] = nm
+        lang_code = ((entry.get('language') or {}).get('name') or '').lower()
+        if nm and lang_code in SUPPORTED_LANGS:
+            lang_map[lang_code] = nm
     if 'en' not in lang_map:
         for p in get_pokemon_list():
             if p['id'] == poke_id:
                 lang_map['en'] = p['display_en']
                 break
-    SPECIES_NAMES[poke_id] = {**SPECIES_NAMES.get(poke_id, {}), **lang_map}
-    return SPECIES_NAMES[poke_id].get(lang) or SPECIES_NAMES[poke_id].get('en')
+    return lang_map
 
 
 def get_sprite_for_pokemon(poke_id):
@@ -208,13 +241,23 @@ def get_sprite_for_pokemon(poke_id):
     return art, base_name
 
 
+def artwork_url(poke_id) -> str:
+    """Official artwork URL for a species: from the dataset, else from PokeAPI."""
+    url = dataset.sprite_for(poke_id)
+    if not url:
+        url, _ = get_sprite_for_pokemon(poke_id)
+    return url or ''
+
+
 def get_species_metadata(poke_id: int):
     """Return cached species metadata: color name and generation number as strings.
     Example: { 'color': 'red', 'generation': '1' }
     Falls back to empty strings if unavailable.
     """
     if poke_id in SPECIES_META:
+        metrics.cache_event('species_meta', 'hit')
         return SPECIES_META[poke_id]
+    metrics.cache_event('species_meta', 'miss')
     try:
         url = f"{POKEAPI_BASE}/pokemon-species/{poke_id}"
         r = requests.get(url, timeout=12)
@@ -276,36 +319,25 @@ def _fetch_and_cache_species(pid: int):
     url = f"{POKEAPI_BASE}/pokemon-species/{pid}"
     r = requests.get(url, timeout=12)
     r.raise_for_status()
-    j = r.json()
-    names_list = j.get('names', [])
-    lang_map = {}
-    for entry in names_list:
-        nm = entry.get('name')
-        lang_code = (entry.get('language') or {}).get('name')
-        if nm and lang_code:
-            if lang_code in SUPPORTED_LANGS:
-                lang_map[lang_code] = nm
-            elif lang_code == 'en':
-                lang_map['en'] = nm
-    if 'en' not in lang_map:
-        for p in get_pokemon_list():
-            if p['id'] == pid:
-                lang_map['en'] = p['display_en']
-                break
-    SPECIES_NAMES[pid] = {**SPECIES_NAMES.get(pid, {}), **lang_map}
+    name_shards.put(pid, _species_names(r.json(), pid))
 
 
-def warm_up_all_names():
-    global WARMED
+def warm_up_all_names(langs=CORE_LANGS):
+    """Fetch the species whose names are still missing in any of `langs` (none when the
+    dataset shards are complete)."""
+    global WARMED, WARMUP_TOTAL, WARMUP_DONE
     try:
         lst = get_pokemon_list()
         ids = [p['id'] for p in lst]
-        futures = [EXECUTOR.submit(_fetch_and_cache_species, pid) for pid in ids]
+        todo = sorted({pid for lang in langs for pid in name_shards.missing(ids, lang)})
+        WARMUP_TOTAL, WARMUP_DONE = len(todo), 0
+        futures = [EXECUTOR.submit(_fetch_and_cache_species, pid) for pid in todo]
         for f in as_completed(futures):
             try:
                 f.result()
             except Exception:
                 pass
+            WARMUP_DONE += 1
         WARMED = True
     except Exception:
         WARMED = False
@@ -313,15 +345,17 @@ def warm_up_all_names():
 
 def ensure_language_filled(lang: str):
     lst = get_pokemon_list()
-    missing = [p['id'] for p in lst if lang not in SPECIES_NAMES.get(p['id'], {})]
+    missing = name_shards.missing([p['id'] for p in lst], lang)
     if not missing:
         return
-    futures = [EXECUTOR.submit(_fetch_and_cache_species, pid) for pid in missing]
-    for f in as_completed(futures):
-        try:
-            f.result()
-        except Exception:
-            pass
+    task = tracing.bind(_fetch_and_cache_species)
+    futures = [EXECUTOR.submit(task, pid) for pid in missing]
+    with tracing.span('executor', 'species'):
+        for f in as_completed(futures):
+            try:
+                f.result()
+            except Exception:
+                pass
 
 
 from .text_utils import normalize_name
@@ -425,9 +459,11 @@ def _slugify_guess_for_form_lookup(guess: str) -> list[str]:
     return out
 
 
-def resolve_variant_guess_to_species_id(guess: str):
+def resolve_variant_guess_to_species_id(guess: str, offline: bool = False):
     """Try to map a free-text guess that may include a form/variant to the base species id.
     Returns an int species id if resolved, or None otherwise. Caches results.
+    Uses the prebuilt form table when available; PokeAPI is only queried when no form
+    table is loaded and `offline` is False.
     """
     try:
         key = normalize_name(guess)
@@ -436,8 +472,13 @@ def resolve_variant_guess_to_species_id(guess: str):
     if key in VARIANT_GUESS_CACHE:
         return VARIANT_GUESS_CACHE[key]
 
+    candidates = _slugify_guess_for_form_lookup(guess)
+    # Prebuilt form table: pure dict lookups, nothing to cache
+    sid = aliases.lookup_form(candidates)
+    if sid or aliases.FORMS or offline:
+        return sid
+
     try:
-        candidates = _slugify_guess_for_form_lookup(guess)
         for cand in candidates:
             # Try pokemon-form first (best for forms/variants)
             try:
@@ -469,3 +510,27 @@ def resolve_variant_guess_to_species_id(guess: str):
 
     VARIANT_GUESS_CACHE[key] = None
     return None
+
+
+# ---- Cache registry hooks (/admin/caches) ----
+
+def _forget_variant_guesses(pid: int) -> int:
+    keys = [k for k, v in list(VARIANT_GUESS_CACHE.items()) if v == pid]
+    for k in keys:
+        VARIANT_GUESS_CACHE.pop(k, None)
+    return len(keys)
+
+
+def _warm_species_names(pid: int):
+    shards = list(name_shards.SHARDS.values())
+    if not shards or any(pid >= len(names) or names[pid] is None for names in shards):
+        _fetch_and_cache_species(pid)
+
+
+# The species list and its derived lookups are rebuilt only at startup
+for _name in ('POKEMON_LIST', 'POKEMON_NAMES', 'DISPLAY_TO_ID'):
+    cache_registry.configure(f'services.pokemon.{_name}', readonly=True)
+cache_registry.configure('services.pokemon.SPECIES_META', metric='species_meta')
+cache_registry.configure('services.pokemon.VARIANT_GUESS_CACHE', forget=_forget_variant_guesses)
+cache_registry.add_warmer('species_meta', get_species_metadata)
+cache_registry.add_warmer('species_names', _warm_species_names)
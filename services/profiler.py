@@ -0,0 +1,178 @@
+"""In-process sampling profiler producing collapsed stacks (flamegraph.pl / speedscope input).
+
+A Sampler thread wakes every `interval` seconds and records the Python stack of each
+watched thread from sys._current_frames(). Identical stacks are counted. Nothing runs
+unless a profile was requested, so the profiler costs nothing when it is idle.
+
+Profiles are written to PROFILE_DIR/<id>.txt, one "frame;frame;frame count" line per
+distinct stack, root first. Any gunicorn worker of the same master can then serve a
+profile that another worker recorded.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+DEFAULT_INTERVAL = 0.005
+MAX_SECONDS = 60
+KEEP_PROFILES = 50
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_WORKER_LOCK = threading.Lock()  # one worker-wide profile at a time
+
+
+def profile_dir() -> str:
+    return os.environ.get('PROFILE_DIR') or os.path.join(
+        tempfile.gettempdir(), 'pokemon-profiles', str(os.getppid())
+    )
+
+
+def _label(code) -> str:
+    path = code.co_filename
+    if path.startswith(_ROOT):
+        path = os.path.relpath(path, _ROOT)
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class Sampler:
+    """Sample the stacks of the given thread ids (None = every other thread) until stopped."""
+
+    def __init__(self, thread_ids=None, interval: float = DEFAULT_INTERVAL):
+        self.thread_ids = set(thread_ids) if thread_ids else None
+        self.interval = max(0.001, float(interval))
+        self.counts = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if self.thread_ids is None:
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == own or (self.thread_ids is not None and tid not in self.thread_ids):
+                    continue
+                if self.thread_ids is None and str(names.get(tid, '')).startswith('profiler-'):
+                    continue
+                stack = _collapse(frame)
+                if self.thread_ids is None:
+                    stack = f"{names.get(tid, tid)};{stack}"
+                self.counts[stack] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+
+def collapsed(counts: Counter) -> str:
+    return ''.join(f"{stack} {n}\n" for stack, n in counts.most_common())
+
+
+def save(counts: Counter, kind: str, profile_id: str | None = None) -> str:
+    """Write a finished profile and return its id."""
+    profile_id = profile_id or f"{kind}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    d = profile_dir()
+    os.makedirs(d, exist_ok=True)
+    tmp = os.path.join(d, f"{profile_id}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(collapsed(counts))
+    os.replace(tmp, os.path.join(d, f"{profile_id}.txt"))
+    _prune(d)
+    return profile_id
+
+
+def _prune(d: str):
+    try:
+        files = sorted((os.path.join(d, fn) for fn in os.listdir(d) if fn.endswith('.txt')),
+                       key=os.path.getmtime)
+        for path in files[:-KEEP_PROFILES]:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+def _path(profile_id: str, ext: str):
+    if not profile_id or '/' in profile_id or '\\' in profile_id or profile_id.startswith('.'):
+        return None
+    return os.path.join(profile_dir(), f"{profile_id}{ext}")
+
+
+def status(profile_id: str):
+    """'done', 'running' or None for an unknown id."""
+    for ext, st in (('.txt', 'done'), ('.running', 'running')):
+        path = _path(profile_id, ext)
+        if path and os.path.exists(path):
+            return st
+    return None
+
+
+def load(profile_id: str):
+    """Collapsed text of a finished profile, or None."""
+    path = _path(profile_id, '.txt')
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def list_profiles() -> list:
+    d = profile_dir()
+    try:
+        names = os.listdir(d)
+    except OSError:
+        return []
+    out = []
+    for fn in names:
+        stem, ext = os.path.splitext(fn)
+        if ext in ('.txt', '.running'):
+            out.append({'id': stem, 'status': 'done' if ext == '.txt' else 'running',
+                        'mtime': int(os.path.getmtime(os.path.join(d, fn)))})
+    return sorted(out, key=lambda p: -p['mtime'])
+
+
+def start_worker_profile(seconds: float, interval: float = DEFAULT_INTERVAL):
+    """Sample every thread of this worker for `seconds` in the background. Returns the
+    profile id, or None when a worker profile is already running in this process."""
+    if not _WORKER_LOCK.acquire(blocking=False):
+        return None
+    seconds = min(max(float(seconds), 0.1), MAX_SECONDS)
+    profile_id = f"worker-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    d = profile_dir()
+    os.makedirs(d, exist_ok=True)
+    marker = os.path.join(d, f"{profile_id}.running")
+    open(marker, 'w').close()
+
+    def run():
+        try:
+            sampler = Sampler(interval=interval).start()
+            time.sleep(seconds)
+            save(sampler.stop(), 'worker', profile_id)
+        finally:
+            try:
+                os.remove(marker)
+            except OSError:
+                pass
+            _WORKER_LOCK.release()
+
+    threading.Thread(target=run, name='profiler-worker', daemon=True).start()
+    return profile_id
@@ -0,0 +1,238 @@
+"""Pre-generated quiz questions (built by `python -m services.ingest quiz`).
+
+The bank has one shard per (generation, difficulty), stored as
+DATA_DIR/quiz/gen<g>-<difficulty>.npy: an int16 array with one row per question and
+COLUMNS as its columns. Rows are sorted by kind. The manifest
+(DATA_DIR/quiz/manifest.json) records each shard's row count and kind offsets, so
+serving a question of a given kind needs only two random numbers and one row read.
+Shards are memory-mapped, so every worker shares the page cache rather than holding
+its own copy.
+
+A generation's shards are rebuilt only when the species data they were generated from
+changes (see fingerprint()). Re-running the stage after a new snapshot therefore
+rewrites only the generations that changed.
+
+Kinds:
+  height / weight  which of two species is taller / heavier (options: 2 species ids)
+  generation       which generation introduced the subject (options: generation numbers)
+  color            the subject's PokeAPI color (options: dataset.COLOR_NAMES codes)
+  evolution        what the subject evolves into (options: species ids)
+  type             one of the subject's types (options: dataset.TYPE_NAMES codes)
+Difficulty picks closer height/weight ratios and more plausible distractors.
+"""
+import hashlib
+import json
+import os
+import random
+
+import numpy as np
+
+from . import dataset, evolution
+
+QUIZ_DIR = 'quiz'
+MANIFEST_FILE = 'manifest.json'
+QUIZ_VERSION = 1  # bump when the generators change so every shard is rebuilt
+KINDS = ['height', 'weight', 'generation', 'color', 'evolution', 'type']
+DIFFICULTIES = ['easy', 'medium', 'hard']
+COLUMNS = ['kind', 'subject', 'opt0', 'opt1', 'opt2', 'opt3', 'answer']
+# Larger / smaller value ratio allowed for height and weight pairs, per difficulty
+RATIO_BANDS = [(2.0, float('inf')), (1.25, 2.0), (1.0, 1.25)]
+CHOICES = 4
+
+SHARDS = {}  # (generation, difficulty index) -> memory-mapped int16 array
+KIND_PTR = {}  # (generation, difficulty index) -> row offset of each kind (len(KINDS) + 1)
+
+
+def shard_name(gen: int, difficulty: int) -> str:
+    return f"gen{gen}-{DIFFICULTIES[difficulty]}"
+
+
+def load(data_dir: str) -> bool:
+    """Memory-map the question shards listed in the manifest. Returns True when available."""
+    global SHARDS, KIND_PTR
+    quiz_dir = os.path.join(data_dir, QUIZ_DIR)
+    manifest = read_manifest(data_dir)
+    shards, kind_ptr = {}, {}
+    for name, info in manifest.get('shards', {}).items():
+        path = os.path.join(quiz_dir, f"{name}.npy")
+        if not info.get('rows') or not os.path.exists(path):
+            continue
+        key = (int(info['generation']), DIFFICULTIES.index(info['difficulty']))
+        shards[key] = np.load(path, mmap_mode='r', allow_pickle=False)
+        kind_ptr[key] = info['kind_ptr']
+    SHARDS, KIND_PTR = shards, kind_ptr
+    return bool(shards)
+
+
+def read_manifest(data_dir: str) -> dict:
+    path = os.path.join(data_dir, QUIZ_DIR, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f) or {}
+
+
+def is_loaded() -> bool:
+    return bool(SHARDS)
+
+
+def generations() -> list[int]:
+    return sorted({g for g, _ in SHARDS})
+
+
+def pick(gens=None, difficulty=None, exclude_kinds=(), rng=random):
+    """Return a random (generation, difficulty index, row) or None.
+    gens/difficulty narrow the shards (None = any). A kind is drawn uniformly first so the
+    more common kinds do not crowd out evolution questions."""
+    keys = [k for k in SHARDS
+            if (not gens or k[0] in gens) and (difficulty is None or k[1] == difficulty)]
+    if not keys:
+        return None
+    kinds = [i for i, k in enumerate(KINDS) if k not in exclude_kinds]
+    rng.shuffle(kinds)
+    for kind in kinds:
+        weights = [KIND_PTR[k][kind + 1] - KIND_PTR[k][kind] for k in keys]
+        if not any(weights):
+            continue
+        key = rng.choices(keys, weights=weights)[0]
+        lo, hi = KIND_PTR[key][kind], KIND_PTR[key][kind + 1]
+        return key[0], key[1], rng.randrange(lo, hi)
+    return None
+
+
+def question(gen: int, difficulty: int, row: int):
+    """Decode one bank row: {'kind', 'difficulty', 'subject', 'options', 'answer'}, or None."""
+    shard = SHARDS.get((gen, difficulty))
+    if shard is None or not 0 <= row < len(shard):
+        return None
+    rec = shard[row].tolist()
+    return {
+        'kind': KINDS[rec[0]],
+        'difficulty': DIFFICULTIES[difficulty],
+        'subject': rec[1] if rec[1] > 0 else None,
+        'options': [v for v in rec[2:2 + CHOICES] if v >= 0],
+        'answer': rec[-1],
+    }
+
+
+# ---- Generation (used by services/ingest.py) ----
+
+def _species_rows(gen: int):
+    cols = dataset.ATTRS
+    return np.flatnonzero(cols['generation'] == gen)
+
+
+def fingerprint(gen: int) -> str:
+    """Hash of every input a generation's shards are generated from."""
+    cols = dataset.ATTRS
+    rows = _species_rows(gen)
+    h = hashlib.sha1(f"v{QUIZ_VERSION}|{dataset.TYPE_NAMES}|{dataset.COLOR_NAMES}".encode('utf-8'))
+    for k in ('id', 'type1', 'type2', 'height', 'weight', 'color'):
+        h.update(np.ascontiguousarray(cols[k][rows]).tobytes())
+    # Generation questions draw distractors from the full range of generations
+    h.update(np.unique(cols['generation']).tobytes())
+    for pid in cols['id'][rows].tolist():
+        h.update(f"|{evolution.family_of(pid)}:{evolution.evolutions(pid)}".encode('ascii'))
+    return h.hexdigest()
+
+
+def _distractors(ranked: list, difficulty: int, rng, k: int = CHOICES - 1):
+    """Pick k wrong options from a list ranked most plausible first: the most plausible
+    for hard questions, the least plausible for easy ones, any for medium."""
+    if len(ranked) < k:
+        return None
+    if difficulty == 2:
+        return ranked[:k]
+    if difficulty == 0:
+        return ranked[-k:]
+    return rng.sample(ranked, k)
+
+
+def _by_frequency(values, exclude, rng) -> list:
+    counts = {}
+    for v in values:
+        if v >= 0 and v not in exclude:
+            counts[v] = counts.get(v, 0) + 1
+    return sorted(counts, key=lambda v: (-counts[v], rng.random()))
+
+
+def _choice_row(kind: int, subject: int, correct: int, wrong, rng):
+    options = [correct] + list(wrong)
+    rng.shuffle(options)
+    return [kind, subject, *options, *([-1] * (CHOICES - len(options))), options.index(correct)]
+
+
+def generate(gen: int, difficulty: int, rng) -> np.ndarray:
+    """Generate every question of one shard, sorted by kind."""
+    cols = dataset.ATTRS
+    rows = _species_rows(gen)
+    ids = cols['id'][rows].tolist()
+    t1, t2 = cols['type1'][rows].tolist(), cols['type2'][rows].tolist()
+    color = cols['color'][rows].tolist()
+    all_gens = sorted(g for g in set(cols['generation'].tolist()) if g > 0)
+    out = []
+
+    for kind, col in ((KINDS.index('height'), 'height'), (KINDS.index('weight'), 'weight')):
+        values = cols[col][rows].tolist()
+        lo, hi = RATIO_BANDS[difficulty]
+        measured = [(pid, v) for pid, v in zip(ids, values) if v > 0]
+        for pid, v in measured:
+            partners = [(p, w) for p, w in measured if w != v and lo <= max(v, w) / min(v, w) < hi]
+            if not partners:
+                continue
+            other, w = rng.choice(partners)
+            options = [pid, other]
+            rng.shuffle(options)
+            bigger = pid if v > w else other
+            out.append([kind, -1, *options, -1, -1, options.index(bigger)])
+
+    kind = KINDS.index('generation')
+    ranked_gens = sorted((g for g in all_gens if g != gen), key=lambda g: (abs(g - gen), rng.random()))
+    for pid in ids:
+        wrong = _distractors(ranked_gens, difficulty, rng)
+        if wrong:
+            out.append(_choice_row(kind, pid, gen, wrong, rng))
+
+    kind = KINDS.index('color')
+    for pid, c in zip(ids, color):
+        if c < 0:
+            continue
+        ranked = _by_frequency(color + list(range(len(dataset.COLOR_NAMES))), {c}, rng)
+        wrong = _distractors(ranked, difficulty, rng)
+        if wrong:
+            out.append(_choice_row(kind, pid, c, wrong, rng))
+
+    kind = KINDS.index('evolution')
+    types_of = {pid: {a, b} - {-1} for pid, a, b in zip(ids, t1, t2)}
+    for pid in ids:
+        targets = evolution.evolutions(pid)
+        if not targets:
+            continue
+        correct = rng.choice(targets)
+        correct_row = dataset.row_for(correct)
+        correct_types = ({int(cols['type1'][correct_row]), int(cols['type2'][correct_row])} - {-1}
+                         if correct_row >= 0 else set())
+        family = evolution.family_of(pid)
+        pool = [p for p in ids if evolution.family_of(p) != family]
+        # Plausible wrong answers share a type with the real evolution
+        ranked = sorted(pool, key=lambda p: (-len(types_of[p] & correct_types), rng.random()))
+        wrong = _distractors(ranked, difficulty, rng)
+        if wrong:
+            out.append(_choice_row(kind, pid, correct, wrong, rng))
+
+    kind = KINDS.index('type')
+    for pid, a, b in zip(ids, t1, t2):
+        own = {a, b} - {-1}
+        if not own:
+            continue
+        ranked = _by_frequency(t1 + t2 + list(range(len(dataset.TYPE_NAMES))), own, rng)
+        wrong = _distractors(ranked, difficulty, rng)
+        if wrong:
+            out.append(_choice_row(kind, pid, rng.choice(sorted(own)), wrong, rng))
+
+    out.sort(key=lambda r: r[0])
+    return np.array(out, dtype=np.int16).reshape(-1, len(COLUMNS))
+
+
+def kind_offsets(bank: np.ndarray) -> list[int]:
+    return np.searchsorted(bank[:, 0], np.arange(len(KINDS) + 1)).tolist()
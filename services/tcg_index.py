@@ -0,0 +1,75 @@
+"""Per-language index of TCG cards by species (built by `python -m services.ingest tcg`).
+
+Each TCGdex language is stored as DATA_DIR/tcg/<lang>.npz in CSR form: the cards for
+species `pid` are rows ptr[pid]:ptr[pid + 1] of the card_ids/images columns, so picking
+a random card for a species is O(1) and needs no upstream search.
+"""
+import os
+import random
+
+import numpy as np
+
+TCG_DIR = 'tcg'
+# App language -> TCGdex language code (others are used as-is)
+TCGDEX_LANGS = {'zh-hans': 'zh-cn', 'zh-hant': 'zh-tw', 'ja-hrkt': 'ja', 'roomaji': 'en'}
+
+INDEX = {}  # TCGdex lang -> { 'ptr', 'card_ids', 'images' } (image URLs without quality/extension)
+LOADED_MTIME = 0.0  # newest index file mtime at the last load
+
+
+def tcgdex_lang(lang: str) -> str:
+    return TCGDEX_LANGS.get(lang, lang)
+
+
+def index_mtime(data_dir: str) -> float:
+    """Modification time of the newest index file (0 when none was built)."""
+    tcg_dir = os.path.join(data_dir, TCG_DIR)
+    if not os.path.isdir(tcg_dir):
+        return 0.0
+    return max((os.path.getmtime(os.path.join(tcg_dir, fn)) for fn in _index_files(tcg_dir)), default=0.0)
+
+
+def _index_files(tcg_dir: str) -> list:
+    return sorted(fn for fn in os.listdir(tcg_dir) if fn.endswith('.npz') and not fn.endswith('.tmp.npz'))
+
+
+def load(data_dir: str) -> bool:
+    """Load every language index under DATA_DIR/tcg. Returns True when any is available."""
+    global INDEX, LOADED_MTIME
+    tcg_dir = os.path.join(data_dir, TCG_DIR)
+    if not os.path.isdir(tcg_dir):
+        return False
+    index = {}
+    for fn in _index_files(tcg_dir):
+        with np.load(os.path.join(tcg_dir, fn), allow_pickle=False) as z:
+            index[fn[:-len('.npz')]] = {k: z[k] for k in z.files}
+    # Swap in one assignment so readers never see a partially refreshed index
+    INDEX, LOADED_MTIME = index, index_mtime(data_dir)
+    return bool(index)
+
+
+def is_loaded() -> bool:
+    return bool(INDEX)
+
+
+def _bounds(pid: int, code: str):
+    idx = INDEX.get(code)
+    if idx is None or not 0 <= pid < len(idx['ptr']) - 1:
+        return idx, 0, 0
+    return idx, int(idx['ptr'][pid]), int(idx['ptr'][pid + 1])
+
+
+def card_count(pid: int, lang: str) -> int:
+    _, lo, hi = _bounds(pid, tcgdex_lang(lang))
+    return hi - lo
+
+
+def pick(pid: int, lang: str):
+    """Return (image base URL, card id) of a random card for the species in the language,
+    falling back to English, or (None, None)."""
+    for code in dict.fromkeys((tcgdex_lang(lang), 'en')):
+        idx, lo, hi = _bounds(pid, code)
+        if hi > lo:
+            row = random.randrange(lo, hi)
+            return str(idx['images'][row]), str(idx['card_ids'][row])
+    return None, None
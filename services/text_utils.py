@@ -1,11 +1,23 @@
 import unicodedata
+from functools import lru_cache
 
+# Normalization works one character at a time (NFKD only decomposes, every combining
+# mark and any other non [a-z0-9] output is dropped), so it can be expressed as a
+# per-character translation table, precomputed for the blocks species names are written
+# in. Any other code point is folded on the fly and never stored, so arbitrary client
+# input cannot grow the table.
+NORMALIZE_MEMO_SIZE = 65536
+# Only inputs up to this length are memoized; longer ones are rare, never repeat and
+# would only evict real names from the memo
+NORMALIZE_MEMO_MAX_LEN = 64
 
-def normalize_name(s: str) -> str:
-    if not isinstance(s, str):
-        s = str(s)
-    s = s.strip()
-    s = unicodedata.normalize('NFKD', s)
+_ASCII_TABLE = {
+    i: (chr(i).lower() if chr(i).isalnum() else None) for i in range(128)
+}
+
+
+def _normalize_char(ch: str) -> str:
+    s = unicodedata.normalize('NFKD', ch)
     s = ''.join(c for c in s if not unicodedata.combining(c))
     s = s.lower()
     # Map locale-specific letters
@@ -13,5 +25,66 @@ def normalize_name(s: str) -> str:
     # Map gender symbols to letters to keep parity with English suggestions like "Nidoran M/F"
     s = s.replace('♂', 'm').replace('♀', 'f')
     # Remove any remaining non-alphanumeric characters
-    s = ''.join(ch for ch in s if ('a' <= ch <= 'z') or ('0' <= ch <= '9'))
-    return s
+    return ''.join(c for c in s if ('a' <= c <= 'z') or ('0' <= c <= '9'))
+
+
+# Latin-1 and Latin Extended, combining marks, Greek and Cyrillic, Latin Extended
+# Additional, general punctuation to the gender signs, CJK punctuation and kana,
+# halfwidth/fullwidth forms
+_PRECOMPUTED_BLOCKS = [(0x80, 0x250), (0x300, 0x370), (0x370, 0x530), (0x1E00, 0x1F00),
+                       (0x2000, 0x2650), (0x3000, 0x3100), (0xFF00, 0xFFF0)]
+
+
+class _CharTable(dict):
+    def __missing__(self, code):
+        return _normalize_char(chr(code)) or None
+
+
+_CHAR_TABLE = _CharTable(_ASCII_TABLE)
+for _lo, _hi in _PRECOMPUTED_BLOCKS:
+    _CHAR_TABLE.update((cp, _normalize_char(chr(cp)) or None) for cp in range(_lo, _hi))
+
+
+@lru_cache(maxsize=NORMALIZE_MEMO_SIZE)
+def _normalize(s: str) -> str:
+    if s.isascii():
+        return s.translate(_ASCII_TABLE)
+    return s.translate(_CHAR_TABLE)
+
+
+def normalize_name(s: str) -> str:
+    """Fold a display name to a lookup key: accents stripped, lowercase, [a-z0-9] only."""
+    if not isinstance(s, str):
+        s = str(s)
+    if len(s) > NORMALIZE_MEMO_MAX_LEN:
+        return _normalize.__wrapped__(s)
+    return _normalize(s)
+
+
+# Hiragana -> katakana, so kana names match whichever script the player types
+_KANA_TABLE = {cp: cp + 0x60 for cp in range(0x3041, 0x3097)}
+
+
+def _is_unfoldable(ch: str) -> bool:
+    return ch.isalpha() and not _CHAR_TABLE[ord(ch)]
+
+
+@lru_cache(maxsize=NORMALIZE_MEMO_SIZE)
+def _name_key(s: str) -> str:
+    if s.isascii() or not any(_is_unfoldable(c) for c in s):
+        return normalize_name(s)
+    # Names in non-Latin scripts (ja, ko, zh, ...) would normalize to nothing (or to a
+    # stray 'm'/'f' from a gender symbol), so they keep their letters instead
+    s = unicodedata.normalize('NFKC', s).casefold()
+    s = s.replace('♂', 'm').replace('♀', 'f').translate(_KANA_TABLE)
+    return ''.join(c for c in s if c.isalnum())
+
+
+def name_key(s: str) -> str:
+    """Lookup key for a species name in any language: normalize_name() for names written
+    in Latin script, a casefolded letters-and-digits form for other scripts."""
+    if not isinstance(s, str):
+        s = str(s)
+    if len(s) > NORMALIZE_MEMO_MAX_LEN:
+        return _name_key.__wrapped__(s)
+    return _name_key(s)
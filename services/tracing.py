@@ -0,0 +1,188 @@
+"""Per-request accounting of upstream calls, cache lookups and executor waits.
+
+A sampled request gets a Trace in a context variable. services/metrics.py reports every
+upstream HTTP call and cache lookup to it, and the request code wraps waits on thread
+pools in span('executor', ...). Work submitted to a pool through bind() runs in the
+submitting request's context, so calls made on pool threads count toward that request.
+
+At the end of the request the summary is sent as a Server-Timing header and logged as
+one JSON line on the `pokemon.access` logger. Requests are sampled at TRACE_SAMPLE_RATE
+(env, default 0.01). A request with an `X-Trace: 1` header is always traced when the app
+allows it to force one (see install).
+Unsampled requests only pay for one context variable lookup per recorded event.
+"""
+import contextvars
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', '0.01'))
+TRACE_HEADER = 'X-Trace'
+
+ACCESS_LOG = logging.getLogger('pokemon.access')
+_CURRENT = contextvars.ContextVar('pokemon_trace', default=None)
+
+
+class Trace:
+    __slots__ = ('started', 'upstream', 'cache', 'executor', '_lock')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.upstream = {}  # host -> [calls, errors, bytes, seconds]
+        self.cache = {}     # cache name -> {event: count}
+        self.executor = {}  # wait name -> [waits, seconds]
+        self._lock = threading.Lock()  # pool threads report concurrently
+
+    def summary(self) -> dict:
+        with self._lock:
+            hosts = {h: {'calls': c, 'errors': e, 'bytes': b, 'ms': round(s * 1000, 1)}
+                     for h, (c, e, b, s) in self.upstream.items()}
+            waits = {n: {'waits': c, 'ms': round(s * 1000, 1)} for n, (c, s) in self.executor.items()}
+            cache = {n: dict(ev) for n, ev in self.cache.items()}
+        return {
+            'ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'upstream': {
+                'calls': sum(h['calls'] for h in hosts.values()),
+                'errors': sum(h['errors'] for h in hosts.values()),
+                'bytes': sum(h['bytes'] for h in hosts.values()),
+                'ms': round(sum(h['ms'] for h in hosts.values()), 1),
+                'hosts': hosts,
+            },
+            'cache': cache,
+            'executor': {
+                'waits': sum(w['waits'] for w in waits.values()),
+                'ms': round(sum(w['ms'] for w in waits.values()), 1),
+                'pools': waits,
+            },
+        }
+
+
+def current():
+    return _CURRENT.get()
+
+
+def begin(force: bool = False):
+    """Start tracing the current request if it is sampled. Returns a reset token or None."""
+    if not force and (SAMPLE_RATE <= 0 or random.random() >= SAMPLE_RATE):
+        return None
+    return _CURRENT.set(Trace())
+
+
+def end(token):
+    if token is not None:
+        try:
+            _CURRENT.reset(token)
+        except ValueError:
+            _CURRENT.set(None)  # token from another context
+
+
+def record_upstream(host: str, seconds: float, nbytes: int = 0, error: bool = False):
+    trace = _CURRENT.get()
+    if trace is None:
+        return
+    with trace._lock:
+        h = trace.upstream.setdefault(host, [0, 0, 0, 0.0])
+        h[0] += 1
+        h[1] += int(error)
+        h[2] += nbytes
+        h[3] += seconds
+
+
+def record_cache(cache: str, event: str, n: int = 1):
+    trace = _CURRENT.get()
+    if trace is None:
+        return
+    with trace._lock:
+        events = trace.cache.setdefault(cache, {})
+        events[event] = events.get(event, 0) + n
+
+
+@contextmanager
+def span(category: str, name: str):
+    """Time a block as a wait of the request (only executor waits are reported today)."""
+    trace = _CURRENT.get()
+    if trace is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        with trace._lock:
+            w = trace.executor.setdefault(name, [0, 0.0])
+            w[0] += 1
+            w[1] += time.perf_counter() - t0
+
+
+def bind(fn):
+    """Wrap fn so that, run on a pool thread, it reports to the submitting request's trace."""
+    if _CURRENT.get() is None:
+        return fn
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return ctx.copy().run(fn, *args, **kwargs)
+    return run
+
+
+def server_timing(summary: dict) -> str:
+    up, ex = summary['upstream'], summary['executor']
+    hits = sum(ev.get('hit', 0) for ev in summary['cache'].values())
+    misses = sum(ev.get('miss', 0) for ev in summary['cache'].values())
+    return ', '.join([
+        f'upstream;dur={up["ms"]};desc="{up["calls"]} calls, {up["errors"]} errors, {up["bytes"]} B"',
+        f'cache;desc="{hits} hits, {misses} misses"',
+        f'executor;dur={ex["ms"]};desc="{ex["waits"]} waits"',
+        f'total;dur={summary["ms"]}',
+    ])
+
+
+def _configure_log():
+    if not ACCESS_LOG.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        ACCESS_LOG.addHandler(handler)
+        ACCESS_LOG.setLevel(logging.INFO)
+        ACCESS_LOG.propagate = False
+
+
+def install(app, can_force=None):
+    """Trace sampled requests of a Flask app: Server-Timing header plus one access log line.
+    `X-Trace: 1` forces a trace only for requests can_force() accepts (e.g. operators
+    holding the admin token); without can_force the header is ignored."""
+    from flask import g, request
+
+    _configure_log()
+
+    @app.before_request
+    def _begin_trace():
+        force = request.headers.get(TRACE_HEADER) == '1' and can_force is not None and can_force()
+        g.trace_token = begin(force=force)
+
+    @app.after_request
+    def _emit_trace(response):
+        trace = _CURRENT.get()
+        if trace is None or g.get('trace_token') is None:
+            return response
+        summary = trace.summary()
+        response.headers['Server-Timing'] = server_timing(summary)
+        try:
+            ACCESS_LOG.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'route': request.url_rule.rule if request.url_rule else None,
+                'status': response.status_code,
+                **summary,
+            }, separators=(',', ':')))
+        except Exception:
+            pass
+        return response
+
+    @app.teardown_request
+    def _end_trace(exc=None):
+        end(g.pop('trace_token', None))
@@ -0,0 +1,113 @@
+"""Type effectiveness tables (built by `python -m services.ingest types`).
+
+CHART[attack, defend] is the damage multiplier of an attacking type against one
+defending type. PROFILES[type1, type2, attack] is the combined multiplier against a
+Pokémon with both types, for every attacking type. type2 == NO_TYPE stands for
+single-type Pokémon. Indexes follow NAMES, which is stored with the tables.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from .core import POKEAPI_BASE
+
+TYPE_CHART_FILE = 'type_chart.npz'
+SUPER_EFFECTIVE = 2.0
+RETRY_SECONDS = 60  # after a failed live build, answer "unavailable" without retrying this long
+
+NAMES = []        # type name per index
+INDEX_OF = {}     # type name -> index
+NO_TYPE = 0       # == len(NAMES): second-slot index for single-type Pokémon
+CHART = np.ones((0, 0), dtype=np.float32)
+PROFILES = np.ones((0, 0, 0), dtype=np.float32)
+_LOCK = threading.Lock()
+_FAILED_AT = None  # time.monotonic() of the last failed live build
+
+
+def chart_from_types(type_jsons: dict, names: list) -> np.ndarray:
+    """Build the attack x defence multiplier matrix from PokeAPI /type/<name> documents."""
+    index = {n: i for i, n in enumerate(names)}
+    chart = np.ones((len(names), len(names)), dtype=np.float32)
+    for name, tj in type_jsons.items():
+        rel = (tj or {}).get('damage_relations') or {}
+        for key, mult in (('double_damage_to', 2.0), ('half_damage_to', 0.5), ('no_damage_to', 0.0)):
+            for t in rel.get(key) or []:
+                if t.get('name') in index:
+                    chart[index[name], index[t['name']]] = mult
+    return chart
+
+
+def profiles_for(chart: np.ndarray) -> np.ndarray:
+    """Defensive profiles for every (type1, type2) pair, with a trailing 'no second type' slot."""
+    n = chart.shape[0]
+    by_defender = np.concatenate([chart.T, np.ones((1, n), dtype=chart.dtype)])  # defend -> attack row
+    return by_defender[:n, None, :] * by_defender[None, :, :]
+
+
+def _install(names, chart, profiles):
+    global NAMES, INDEX_OF, NO_TYPE, CHART, PROFILES
+    names = [str(n) for n in names]
+    NAMES, INDEX_OF, NO_TYPE, CHART, PROFILES = (
+        names, {n: i for i, n in enumerate(names)}, len(names), chart, profiles,
+    )
+
+
+def load(data_dir: str) -> bool:
+    """Load DATA_DIR/type_chart.npz. Returns True when the tables are available."""
+    path = os.path.join(data_dir, TYPE_CHART_FILE)
+    if not os.path.exists(path):
+        return False
+    with np.load(path, allow_pickle=False) as z:
+        _install(z['type_names'], z['chart'], z['profiles'])
+    return True
+
+
+def is_loaded() -> bool:
+    return bool(NAMES)
+
+
+def _backing_off() -> bool:
+    return _FAILED_AT is not None and time.monotonic() - _FAILED_AT < RETRY_SECONDS
+
+
+def ensure_loaded(names) -> bool:
+    """Build the tables from live PokeAPI type data once when no snapshot was built.
+    After a failure, returns False without calling PokeAPI for RETRY_SECONDS."""
+    global _FAILED_AT
+    if NAMES:
+        return True
+    if _backing_off():
+        return False
+    with _LOCK:
+        if NAMES:
+            return True
+        if _backing_off():
+            return False
+
+        def fetch(name):
+            r = requests.get(f"{POKEAPI_BASE}/type/{name}", timeout=20)
+            r.raise_for_status()
+            return name, r.json()
+
+        try:
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                type_jsons = dict(ex.map(fetch, names))
+        except Exception:
+            _FAILED_AT = time.monotonic()
+            return False
+        _FAILED_AT = None
+        chart = chart_from_types(type_jsons, list(names))
+        _install(names, chart, profiles_for(chart))
+    return True
+
+
+def profile(types) -> np.ndarray | None:
+    """Multiplier of every attacking type against a Pokémon with the given type names."""
+    idx = [INDEX_OF[t] for t in types if t in INDEX_OF][:2]
+    if not idx:
+        return None
+    return PROFILES[idx[0], idx[1] if len(idx) > 1 else NO_TYPE]
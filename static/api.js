@@ -33,15 +33,23 @@
         return { ok: false, error: normalizeError(null, res, data) };
       }
       // normalize
-      return { ok: true, correct: !!data.correct, name: data.name };
+      return { ok: true, correct: !!data.correct, name: data.name, didYouMean: data.did_you_mean || null };
     } catch(e){
       return { ok: false, error: normalizeError(e) };
     }
   }
 
+  // Feedback text for a wrong guess, with a typo suggestion when the server has one
+  function wrongMessage(r){
+    const tr = (typeof t === 'function') ? t : null;
+    if (r && r.didYouMean) return tr ? tr('feedback.didYouMean', { name: r.didYouMean }) : `Nope! Did you mean ${r.didYouMean}?`;
+    return tr ? tr('feedback.wrong') : 'Nope, try again!';
+  }
+
   // Random round loader for various modes
   // kind: 'sprite'|'entry'|'scream'|'pixelate'|'silhouette'|'tcg'
-  async function random({ kind, lang, gen }){
+  // params: optional extra query parameters (e.g. image hints for the TCG mode)
+  async function random({ kind, lang, gen, params }){
     const p = withDefaults({ lang, gen });
     const map = {
       sprite: '/api/random-sprite',
@@ -53,7 +61,8 @@
     };
     const base = map[kind];
     if (!base) return { ok: false, error: 'Unknown random kind' };
-    const qs = `?lang=${encodeURIComponent(p.lang || 'en')}&gen=${encodeURIComponent(p.gen || '')}`;
+    let qs = `?lang=${encodeURIComponent(p.lang || 'en')}&gen=${encodeURIComponent(p.gen || '')}`;
+    Object.keys(params || {}).forEach(k => { qs += `&${encodeURIComponent(k)}=${encodeURIComponent(params[k])}`; });
     const url = `${base}${qs}`;
     try {
       const res = await fetch(url);
@@ -65,5 +74,5 @@
     }
   }
 
-  window.Api = { checkGuess, random };
+  window.Api = { checkGuess, random, wrongMessage };
 })();
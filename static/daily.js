@@ -173,7 +173,15 @@ window.ALL_NAMES = window.ALL_NAMES || {};
 // game.js is included via base.html before this script
 
 // Daily state stored per UTC day key
-function todayKey(){ const d = new Date(); return new Date(Date.UTC(d.getUTCFullYear(), d.getUTCMonth(), d.getUTCDate())).toISOString().slice(0,10); }
+// Archive replay: /daily?date=YYYY-MM-DD plays a past day's puzzle
+function archiveDate(){
+  try {
+    const d = new URLSearchParams(window.location.search).get('date') || '';
+    return /^\d{4}-\d{2}-\d{2}$/.test(d) ? d : '';
+  } catch(_) { return ''; }
+}
+function dateQuery(){ const d = archiveDate(); return d ? `&date=${encodeURIComponent(d)}` : ''; }
+function todayKey(){ const a = archiveDate(); if (a) return a; const d = new Date(); return new Date(Date.UTC(d.getUTCFullYear(), d.getUTCMonth(), d.getUTCDate())).toISOString().slice(0,10); }
 function loadDaily(){
   try { return JSON.parse(localStorage.getItem('daily')||'{}'); } catch(_){ return {}; }
 }
@@ -377,7 +385,7 @@ async function showDailyWinPopup(name, answerId){
     if (!sprite) {
       try {
         const lang = (typeof getLang === 'function') ? getLang() : 'en';
-        const res = await fetch(`/api/daily/meta?lang=${encodeURIComponent(lang)}`);
+        const res = await fetch(`/api/daily/meta?lang=${encodeURIComponent(lang)}${dateQuery()}`);
         if (res && res.ok) {
           const j = await res.json().catch(()=>null);
           if (j && j.sprite) {
@@ -414,11 +422,12 @@ async function showDailyWinPopup(name, answerId){
 async function submitGuess(text){
   const res = await fetch('/api/daily/guess', {
     method: 'POST', headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ guess: text, lang: getLang() })
+    body: JSON.stringify({ guess: text, lang: getLang(), date: archiveDate() || undefined })
   });
   if (!res.ok){
     const j = await res.json().catch(()=>({error:(typeof t==='function'? t('daily.status.error'):'Error')}));
-    statusText(j.error || (typeof t==='function'? t('daily.status.error'):'Error'), 'incorrect');
+    const msg = j.did_you_mean && typeof t==='function' ? t('feedback.didYouMean', { name: j.did_you_mean }) : j.error;
+    statusText(msg || (typeof t==='function'? t('daily.status.error'):'Error'), 'incorrect');
     return null;
   }
   return await res.json();
@@ -650,7 +659,7 @@ window.addEventListener('DOMContentLoaded', async ()=>{
 
   async function fetchDailyMeta(){
     try{
-      const res = await fetch(`/api/daily/meta?lang=${encodeURIComponent(getLang())}`);
+      const res = await fetch(`/api/daily/meta?lang=${encodeURIComponent(getLang())}${dateQuery()}`);
       if (!res.ok) return null;
       const j = await res.json();
       try {
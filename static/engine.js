@@ -72,12 +72,12 @@
         this._callbacks.onCorrect({ name: name || state.answer, payload: this._lastPayload });
       }
     },
-    wrong({ guess }){
+    wrong({ guess, didYouMean }){
       try {
         if (!state.roundActive || state.roundSolved || state.revealed) return;
         state.attemptsWrong = (state.attemptsWrong || 0) + 1;
         resetOnWrongGuess();
-        showFeedback('wrong', (typeof t==='function'? t('feedback.wrong') : 'Wrong, try again.'));
+        showFeedback('wrong', window.Api ? Api.wrongMessage({ didYouMean }) : (typeof t==='function'? t('feedback.wrong') : 'Wrong, try again.'));
         try { window.noteGuessed && window.noteGuessed(guess); } catch(_) {}
         try { maybeRevealHints(); } catch(_) {}
       } catch(_) {}
@@ -135,7 +135,7 @@
                 try { showFeedback('correct', (typeof t==='function'? t('feedback.correct', { name: r.name }) : `Correct! ${r.name}`)); } catch(_) {}
                 Engine.correct(r.name);
               } else {
-                Engine.wrong({ guess });
+                Engine.wrong({ guess, didYouMean: r.didYouMean });
               }
             } catch(err){
               try { showFeedback('error', 'Network error'); } catch(_) {}
@@ -628,10 +628,7 @@ async function newRound() {
   // Reset any reveal state and disable transitions during setup
   el.classList.remove('revealed');
   el.classList.add('no-anim');
-  el.style.backgroundImage = `url(${data.sprite})`;
-  // Use background position to emulate cropping: we will set background-size larger and position offset
-  el.style.backgroundSize = data.bg_size;
-  el.style.backgroundPosition = data.bg_pos;
+  showSpriteCrop(el, data);
   // Force reflow to apply styles without transition, then allow transitions again
   void el.offsetWidth;
   el.classList.remove('no-anim');
@@ -646,7 +643,7 @@ async function newRound() {
 async function checkGuess(guess) {
   const r = await (window.Api ? Api.checkGuess({ url: '/api/check-guess', token: state.token, guess, lang: getLang() }) : Promise.resolve({ ok:false, error:'API unavailable' }));
   if (!r.ok) return { error: r.error };
-  return { correct: !!r.correct, name: r.name };
+  return { correct: !!r.correct, name: r.name, didYouMean: r.didYouMean };
 }
 
 function normalizeName(s) {
@@ -679,9 +676,62 @@ async function preloadNames(lang) {
   return ALL_NAMES[key];
 }
 
+// Server-cut crops of the round's sprite, one per zoom-out step (most zoomed in first).
+// When a round has them only the current crop is downloaded; the full sprite is loaded on reveal.
+let spriteTiles = [];
+let spriteTileStep = 0;
+
+function showSpriteCrop(el, data) {
+  spriteTiles = Array.isArray(data.tiles) ? data.tiles : [];
+  spriteTileStep = 0;
+  if (spriteTiles.length) {
+    el.style.backgroundImage = `url(${spriteTiles[0]})`;
+    el.style.backgroundSize = 'contain';
+    el.style.backgroundPosition = 'center';
+    if (spriteTiles[1]) { const next = new Image(); next.src = spriteTiles[1]; }
+    return;
+  }
+  // Use background position to emulate cropping: we will set background-size larger and position offset
+  el.style.backgroundImage = `url(${data.sprite})`;
+  el.style.backgroundSize = data.bg_size;
+  el.style.backgroundPosition = data.bg_pos;
+}
+
+// Visual hint after a wrong guess: show a larger part of the sprite
+function zoomOutSpriteCrop(el) {
+  if (spriteTiles.length) {
+    const step = spriteTileStep = Math.min(spriteTileStep + 1, spriteTiles.length - 1);
+    const img = new Image();
+    // Swap once loaded so the frame never flashes empty
+    img.onload = () => { if (spriteTileStep === step && !el.classList.contains('revealed')) el.style.backgroundImage = `url(${spriteTiles[step]})`; };
+    img.src = spriteTiles[step];
+    if (spriteTiles[step + 1]) { const next = new Image(); next.src = spriteTiles[step + 1]; }
+    return;
+  }
+  // Parse current background-size which may be in format like '500% 500%' or 'contain'
+  const cur = window.getComputedStyle(el).backgroundSize;
+  if (cur !== 'contain') {
+    const parts = cur.split(' ');
+    const parsePct = (s) => {
+      const v = parseFloat(s);
+      return isNaN(v) ? null : v;
+    };
+    const w = parsePct(parts[0]);
+    const h = parsePct(parts[1] || parts[0]);
+    if (w && h) {
+      const newW = Math.max(100, w - 25);
+      const newH = Math.max(100, h - 25);
+      el.style.backgroundSize = `${newW}% ${newH}%`;
+    }
+  }
+}
+
 function revealFullSprite() {
   const el = document.getElementById('sprite-crop');
   if (!el) return;
+  if (spriteTiles.length && state.meta && state.meta.sprite) {
+    el.style.backgroundImage = `url(${state.meta.sprite})`;
+  }
   // Ensure transitions are enabled for reveal
   el.classList.remove('no-anim');
   // Add a class to enable CSS transition, and set styles for full view
@@ -746,9 +796,7 @@ window.addEventListener('DOMContentLoaded', async () => {
         const el = document.getElementById('sprite-crop');
         el.classList.remove('revealed');
         el.classList.add('no-anim');
-        el.style.backgroundImage = `url(${payload.sprite})`;
-        el.style.backgroundSize = payload.bg_size;
-        el.style.backgroundPosition = payload.bg_pos;
+        showSpriteCrop(el, payload);
         void el.offsetWidth;
         el.classList.remove('no-anim');
         setTimeout(() => frame?.classList.remove('loading'), 200);
@@ -760,18 +808,7 @@ window.addEventListener('DOMContentLoaded', async () => {
         const el = document.getElementById('sprite-crop');
         if (!el) return;
         el.classList.remove('revealed');
-        const cur = window.getComputedStyle(el).backgroundSize;
-        if (cur !== 'contain') {
-          const parts = cur.split(' ');
-          const parsePct = (s) => { const v = parseFloat(s); return isNaN(v) ? null : v; };
-          const w = parsePct(parts[0]);
-          const h = parsePct(parts[1] || parts[0]);
-          if (w && h) {
-            const newW = Math.max(100, w - 25);
-            const newH = Math.max(100, h - 25);
-            el.style.backgroundSize = `${newW}% ${newH}%`;
-          }
-        }
+        zoomOutSpriteCrop(el);
       } catch(_) {}
     };
     const onReveal = () => { try { revealFullSprite(); } catch(_) {} };
@@ -820,7 +857,7 @@ window.addEventListener('DOMContentLoaded', async () => {
       // Wrong guess ends streak but keeps score
       try { resetOnWrongGuess(); } catch(_) {}
       // Feedback message for wrong guess
-      if (typeof showFeedback === 'function') showFeedback('wrong', t('feedback.wrong'));
+      if (typeof showFeedback === 'function') showFeedback('wrong', window.Api ? Api.wrongMessage(res) : t('feedback.wrong'));
       // Maybe reveal textual hints after certain wrong attempts
       try { maybeRevealHints(); } catch(_) {}
       // Note guessed name so it appears in the list and is removed from suggestions
@@ -829,22 +866,7 @@ window.addEventListener('DOMContentLoaded', async () => {
       if (el) {
         // Ensure we are not in revealed state
         el.classList.remove('revealed');
-        // Parse current background-size which may be in format like '500% 500%' or 'contain'
-        const cur = window.getComputedStyle(el).backgroundSize;
-        if (cur !== 'contain') {
-          const parts = cur.split(' ');
-          const parsePct = (s) => {
-            const v = parseFloat(s);
-            return isNaN(v) ? null : v;
-          };
-          const w = parsePct(parts[0]);
-          const h = parsePct(parts[1] || parts[0]);
-          if (w && h) {
-            const newW = Math.max(100, w - 25);
-            const newH = Math.max(100, h - 25);
-            el.style.backgroundSize = `${newW}% ${newH}%`;
-          }
-        }
+        zoomOutSpriteCrop(el);
       }
     }
   });
@@ -9,6 +9,8 @@
       'nav.cards': 'Cards',
       'nav.pokedex': 'Pokédex',
       'nav.daily': 'Daily',
+      'nav.type': 'Types',
+      'nav.quiz': 'Quiz',
       'lang.label': 'Language',
       'game.title': 'Guess the Pokémon!',
       'form.label': 'Your guess',
@@ -28,6 +30,7 @@
       'feedback.correct': 'Correct! It is {name}',
       'feedback.reveal': 'It was {name}',
       'feedback.wrong': 'Nope, try again!',
+      'feedback.didYouMean': 'Nope! Did you mean {name}?',
       'hud.score': 'Score',
       'hud.streak': 'Streak',
       'guessed.title': 'Guessed:',
@@ -54,6 +57,8 @@
       'nav.cards': 'Cartas',
       'nav.pokedex': 'Pokédex',
       'nav.daily': 'Diario',
+      'nav.type': 'Tipos',
+      'nav.quiz': 'Quiz',
       'lang.label': 'Idioma',
       'game.title': '¡Adivina el Pokémon!',
       'form.label': 'Tu respuesta',
@@ -73,6 +78,7 @@
       'feedback.correct': '¡Correcto! Es {name}',
       'feedback.reveal': 'Era {name}',
       'feedback.wrong': '¡No! Intenta de nuevo.',
+      'feedback.didYouMean': '¡No! ¿Quisiste decir {name}?',
       'hud.score': 'Puntuación',
       'hud.streak': 'Racha',
       'guessed.title': 'Adivinados:',
@@ -99,6 +105,8 @@
       'nav.cards': 'Cartes',
       'nav.pokedex': 'Pokédex',
       'nav.daily': 'Quotidien',
+      'nav.type': 'Types',
+      'nav.quiz': 'Quiz',
       'lang.label': 'Langue',
       'game.title': 'Devinez le Pokémon!',
       'form.label': 'Votre réponse',
@@ -118,6 +126,7 @@
       'feedback.correct': 'Correct ! C\'est {name}',
       'feedback.reveal': 'C\'était {name}',
       'feedback.wrong': 'Non, réessayez !',
+      'feedback.didYouMean': 'Non ! Vouliez-vous dire {name} ?',
       'hud.score': 'Score',
       'hud.streak': 'Série',
       'guessed.title': 'Proposés\u00A0:',
@@ -144,6 +153,8 @@
       'nav.cards': 'Karten',
       'nav.pokedex': 'Pokédex',
       'nav.daily': 'Daily',
+      'nav.type': 'Typen',
+      'nav.quiz': 'Quiz',
       'lang.label': 'Sprache',
       'game.title': 'Errate das Pokémon!',
       'form.label': 'Dein Tipp',
@@ -163,6 +174,7 @@
       'feedback.correct': 'Richtig! Es ist {name}',
       'feedback.reveal': 'Es war {name}',
       'feedback.wrong': 'Nein, versuch es nochmal!',
+      'feedback.didYouMean': 'Nein! Meintest du {name}?',
       'hud.score': 'Punkte',
       'hud.streak': 'Serie',
       'guessed.title': 'Geraten:',
@@ -183,6 +195,9 @@
     }
   };
 
+  // Languages with localized Pokémon names but no UI translation: UI strings fall back to English
+  ['it', 'ja', 'ja-hrkt', 'roomaji', 'ko', 'zh-hans', 'zh-hant'].forEach(l => { bundles[l] = bundles[l] || {}; });
+
   const LANG_KEY = 'lang';
 
   function getStoredLang(){
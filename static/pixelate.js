@@ -23,17 +23,51 @@ window.addEventListener('DOMContentLoaded', async () => {
 
   // Pixelation control
   const PIXEL_STEPS = [64, 48, 32, 24, 16, 12, 8, 6, 4, 3, 2, 1]; // block sizes in CSS pixels
-  function getCurrentBlockSize() {
+  function getCurrentLevel() {
     const wrong = state.attemptsWrong || 0;
-    const idx = Math.min(wrong, PIXEL_STEPS.length - 1);
-    return PIXEL_STEPS[idx];
+    return Math.min(wrong, PIXEL_STEPS.length - 1);
+  }
+  function getCurrentBlockSize() {
+    return PIXEL_STEPS[getCurrentLevel()];
   }
 
   let imageObj = null;
+  // Server-rendered levels (coarsest first, same steps as PIXEL_STEPS). When present, only
+  // the level being shown is downloaded; otherwise the full sprite is pixelated here.
+  let levelUrls = [];
+  let levelShown = -1;
+  let levelWanted = -1;
+
+  function setRoundImage(data) {
+    levelUrls = Array.isArray(data.levels) ? data.levels : [];
+    levelShown = levelWanted = levelUrls.length ? 0 : -1;
+    return levelUrls.length ? levelUrls[0] : data.sprite;
+  }
+
+  function showLevel(level) {
+    levelWanted = level;
+    const img = new Image();
+    img.onload = () => {
+      if (levelWanted !== level) return; // a newer level was requested meanwhile
+      imageObj = img;
+      levelShown = level;
+      drawPixelated();
+    };
+    img.src = levelUrls[level];
+    // Warm the cache for the next wrong guess
+    if (levelUrls[level + 1]) { const next = new Image(); next.src = levelUrls[level + 1]; }
+  }
 
   function drawPixelated() {
     const canvas = document.getElementById('pixel-canvas');
     if (!canvas || !imageObj) return;
+    if (levelUrls.length) {
+      const level = Math.min(getCurrentLevel(), levelUrls.length - 1);
+      if (level !== levelShown) {
+        if (level !== levelWanted) showLevel(level);
+        return; // keep the current level on screen until the next one has loaded
+      }
+    }
 
     const dpr = Math.max(1, Math.min(2, window.devicePixelRatio || 1));
     const frame = canvas.parentElement; // .sprite-frame
@@ -57,6 +91,13 @@ window.addEventListener('DOMContentLoaded', async () => {
     const dx = Math.floor((canvas.width - drawW) / 2);
     const dy = Math.floor((canvas.height - drawH) / 2);
 
+    if (levelUrls.length) {
+      // Already at the level's coarse resolution: just scale it up without smoothing
+      ctx.clearRect(0, 0, canvas.width, canvas.height);
+      ctx.drawImage(imageObj, 0, 0, iw, ih, dx, dy, drawW, drawH);
+      return;
+    }
+
     // Compute coarse resolution
     const block = getCurrentBlockSize();
     const coarseW = Math.max(1, Math.floor(drawW / block));
@@ -134,7 +175,7 @@ window.addEventListener('DOMContentLoaded', async () => {
       fbEl.className = 'feedback prominent incorrect';
       frame?.classList.remove('loading');
     };
-    imageObj.src = data.sprite;
+    imageObj.src = setRoundImage(data);
 
     if (typeof showFeedback === 'function') showFeedback('info', '');
     const input = document.getElementById('guess-input');
@@ -176,7 +217,7 @@ window.addEventListener('DOMContentLoaded', async () => {
         if (typeof showFeedback === 'function') showFeedback('error', 'Failed to load image'); else { fbEl.textContent = 'Failed to load image'; fbEl.className = 'feedback prominent incorrect'; }
         frame?.classList.remove('loading');
       };
-      imageObj.src = payload.sprite;
+      imageObj.src = setRoundImage(payload);
     };
     const onCorrect = () => {
       try { state.attemptsWrong = 999; } catch(_) {}
@@ -68,7 +68,7 @@ window.addEventListener('DOMContentLoaded', async () => {
   async function checkGuess(guess) {
     const r = await (window.Api ? Api.checkGuess({ url: '/api/check-guess', token: state.token, guess, lang: getLang() }) : Promise.resolve({ ok:false, error:'API unavailable' }));
     if (!r.ok) return { error: r.error };
-    return { correct: !!r.correct, name: r.name };
+    return { correct: !!r.correct, name: r.name, didYouMean: r.didYouMean };
   }
 
   // If RoundEngine is available, use it and skip legacy wiring
@@ -152,7 +152,7 @@ window.addEventListener('DOMContentLoaded', async () => {
         state.attemptsWrong = (state.attemptsWrong || 0) + 1;
         // A wrong guess ends the current streak (score unchanged)
         if (typeof resetOnWrongGuess === 'function') { resetOnWrongGuess(); }
-        if (typeof showFeedback === 'function') showFeedback('wrong', (typeof t==='function'? t('feedback.wrong') : 'Nope, try again!'));
+        if (typeof showFeedback === 'function') showFeedback('wrong', window.Api ? Api.wrongMessage(res) : (typeof t==='function'? t('feedback.wrong') : 'Nope, try again!'));
         try { window.noteGuessed && window.noteGuessed(guess); } catch(_){}
         try { if (typeof maybeRevealHints === 'function') maybeRevealHints(); } catch(_) {}
       }
@@ -0,0 +1,192 @@
+// Quiz game logic: multiple-choice questions served from the pre-generated question bank.
+// Relies on shared helpers from game.js (i18n, HUD, scoring).
+
+window.addEventListener('DOMContentLoaded', async () => {
+  if (!document.querySelector('[data-game="quiz"]')) return;
+
+  // Initialize language and UI
+  setLang(getLang());
+  const extraI18N = {
+    en: {
+      'quiz.title': 'Pokémon Quiz', 'quiz.any': 'Any', 'quiz.easy': 'Easy', 'quiz.medium': 'Medium', 'quiz.hard': 'Hard',
+      'quiz.q.height': 'Which Pokémon is taller?', 'quiz.q.weight': 'Which Pokémon is heavier?',
+      'quiz.q.generation': 'In which generation was {name} introduced?', 'quiz.q.color': 'What color is {name}?',
+      'quiz.q.evolution': 'What does {name} evolve into?', 'quiz.q.type': 'Which of these types does {name} have?',
+      'quiz.gen': 'Generation {n}', 'quiz.correct': 'Correct!', 'quiz.wrong': 'Not quite. Try again.', 'quiz.reveal': 'The answer was: {answer}',
+    },
+    es: {
+      'quiz.title': 'Quiz Pokémon', 'quiz.any': 'Cualquiera', 'quiz.easy': 'Fácil', 'quiz.medium': 'Media', 'quiz.hard': 'Difícil',
+      'quiz.q.height': '¿Qué Pokémon es más alto?', 'quiz.q.weight': '¿Qué Pokémon pesa más?',
+      'quiz.q.generation': '¿En qué generación apareció {name}?', 'quiz.q.color': '¿De qué color es {name}?',
+      'quiz.q.evolution': '¿En qué evoluciona {name}?', 'quiz.q.type': '¿Cuál de estos tipos tiene {name}?',
+      'quiz.gen': 'Generación {n}', 'quiz.correct': '¡Correcto!', 'quiz.wrong': 'No exactamente. Inténtalo de nuevo.', 'quiz.reveal': 'La respuesta era: {answer}',
+    },
+    fr: {
+      'quiz.title': 'Quiz Pokémon', 'quiz.any': 'Toutes', 'quiz.easy': 'Facile', 'quiz.medium': 'Moyen', 'quiz.hard': 'Difficile',
+      'quiz.q.height': 'Quel Pokémon est le plus grand ?', 'quiz.q.weight': 'Quel Pokémon est le plus lourd ?',
+      'quiz.q.generation': 'Dans quelle génération {name} est-il apparu ?', 'quiz.q.color': 'De quelle couleur est {name} ?',
+      'quiz.q.evolution': 'En quoi {name} évolue-t-il ?', 'quiz.q.type': 'Lequel de ces types {name} possède-t-il ?',
+      'quiz.gen': 'Génération {n}', 'quiz.correct': 'Correct !', 'quiz.wrong': 'Pas tout à fait. Réessayez.', 'quiz.reveal': 'La réponse était : {answer}',
+    },
+    de: {
+      'quiz.title': 'Pokémon-Quiz', 'quiz.any': 'Alle', 'quiz.easy': 'Leicht', 'quiz.medium': 'Mittel', 'quiz.hard': 'Schwer',
+      'quiz.q.height': 'Welches Pokémon ist größer?', 'quiz.q.weight': 'Welches Pokémon ist schwerer?',
+      'quiz.q.generation': 'In welcher Generation erschien {name}?', 'quiz.q.color': 'Welche Farbe hat {name}?',
+      'quiz.q.evolution': 'Wozu entwickelt sich {name}?', 'quiz.q.type': 'Welchen dieser Typen hat {name}?',
+      'quiz.gen': 'Generation {n}', 'quiz.correct': 'Richtig!', 'quiz.wrong': 'Nicht ganz. Versuch es noch einmal.', 'quiz.reveal': 'Die Antwort war: {answer}',
+    },
+  };
+  try { if (window.i18n && typeof i18n.extend === 'function') i18n.extend(extraI18N); } catch (_) {}
+  translatePage();
+
+  // Type and color labels (same as daily.js, which is only loaded on the daily page)
+  const VALUE_LABELS = {
+    en: { normal: 'Normal', fire: 'Fire', water: 'Water', grass: 'Grass', electric: 'Electric', ice: 'Ice', fighting: 'Fighting', poison: 'Poison', ground: 'Ground', flying: 'Flying', psychic: 'Psychic', bug: 'Bug', rock: 'Rock', ghost: 'Ghost', dragon: 'Dragon', dark: 'Dark', steel: 'Steel', fairy: 'Fairy',
+          black:'Black', blue:'Blue', brown:'Brown', gray:'Gray', green:'Green', pink:'Pink', purple:'Purple', red:'Red', white:'White', yellow:'Yellow' },
+    es: { normal: 'Normal', fire: 'Fuego', water: 'Agua', grass: 'Planta', electric: 'Eléctrico', ice: 'Hielo', fighting: 'Lucha', poison: 'Veneno', ground: 'Tierra', flying: 'Volador', psychic: 'Psíquico', bug: 'Bicho', rock: 'Roca', ghost: 'Fantasma', dragon: 'Dragón', dark: 'Siniestro', steel: 'Acero', fairy: 'Hada',
+          black:'Negro', blue:'Azul', brown:'Marrón', gray:'Gris', green:'Verde', pink:'Rosa', purple:'Morado', red:'Rojo', white:'Blanco', yellow:'Amarillo' },
+    fr: { normal: 'Normal', fire: 'Feu', water: 'Eau', grass: 'Plante', electric: 'Électrik', ice: 'Glace', fighting: 'Combat', poison: 'Poison', ground: 'Sol', flying: 'Vol', psychic: 'Psy', bug: 'Insecte', rock: 'Roche', ghost: 'Spectre', dragon: 'Dragon', dark: 'Ténèbres', steel: 'Acier', fairy: 'Fée',
+          black:'Noir', blue:'Bleu', brown:'Marron', gray:'Gris', green:'Vert', pink:'Rose', purple:'Violet', red:'Rouge', white:'Blanc', yellow:'Jaune' },
+    de: { normal: 'Normal', fire: 'Feuer', water: 'Wasser', grass: 'Pflanze', electric: 'Elektro', ice: 'Eis', fighting: 'Kampf', poison: 'Gift', ground: 'Boden', flying: 'Flug', psychic: 'Psycho', bug: 'Käfer', rock: 'Gestein', ghost: 'Geist', dragon: 'Drache', dark: 'Unlicht', steel: 'Stahl', fairy: 'Fee',
+          black:'Schwarz', blue:'Blau', brown:'Braun', gray:'Grau', green:'Grün', pink:'Rosa', purple:'Lila', red:'Rot', white:'Weiß', yellow:'Gelb' },
+  };
+
+  // Stats and HUD
+  loadStats();
+  updateHUD();
+
+  const subjectEl = document.getElementById('quiz-subject');
+  const subjectSprite = document.getElementById('quiz-subject-sprite');
+  const questionEl = document.getElementById('quiz-question');
+  const optionsEl = document.getElementById('quiz-options');
+  const diffButtons = Array.from(document.querySelectorAll('.quiz-difficulty-btn'));
+  let difficulty = localStorage.getItem('quizDifficulty') || '';
+  let current = null;
+  let busy = false;
+
+  function optionLabel(opt) {
+    if (!current) return '';
+    if (opt.name) return opt.name;
+    if (current.kind === 'generation') return t('quiz.gen', { n: opt.value });
+    return (VALUE_LABELS[getLang()] || VALUE_LABELS.en)[opt.value] || String(opt.value);
+  }
+
+  function renderQuestion() {
+    if (!current) return;
+    const subject = current.subject;
+    subjectEl.hidden = !subject;
+    subjectSprite.style.backgroundImage = subject && subject.sprite ? `url(${subject.sprite})` : '';
+    questionEl.textContent = t(`quiz.q.${current.kind}`, { name: subject ? subject.name : '' });
+    optionsEl.replaceChildren(...current.options.map((opt, i) => {
+      const btn = document.createElement('button');
+      btn.type = 'button';
+      btn.className = current.kind === 'type' ? 'type-badge quiz-option' : 'btn quiz-option';
+      if (current.kind === 'type') btn.dataset.type = opt.value;
+      if (opt.sprite) {
+        const img = document.createElement('img');
+        img.src = opt.sprite;
+        img.alt = '';
+        img.loading = 'lazy';
+        btn.appendChild(img);
+      }
+      const label = document.createElement('span');
+      label.textContent = optionLabel(opt);
+      btn.appendChild(label);
+      btn.addEventListener('click', () => choose(btn, i));
+      return btn;
+    }));
+  }
+
+  function markAnswer(answer) {
+    optionsEl.querySelectorAll('button').forEach((b, i) => {
+      if (i === answer) b.classList.add('correct');
+      b.disabled = true;
+    });
+  }
+
+  function syncDifficulty() {
+    diffButtons.forEach(b => b.setAttribute('aria-pressed', b.dataset.difficulty === difficulty ? 'true' : 'false'));
+  }
+
+  async function newRound() {
+    if (typeof resetOnAbandon === 'function') { resetOnAbandon(); }
+    state.roundActive = true;
+    state.roundSolved = false;
+    state.revealed = false;
+    state.attemptsWrong = 0;
+    try { if (typeof setRoundControlsDisabled === 'function') setRoundControlsDisabled(false); } catch(_) {}
+    try { if (typeof setNextButtonDisabled === 'function') setNextButtonDisabled(true); } catch(_) {}
+    if (typeof showFeedback === 'function') showFeedback('info', '');
+    try {
+      const qs = `lang=${encodeURIComponent(getLang())}&gen=${encodeURIComponent(getGen())}&difficulty=${encodeURIComponent(difficulty)}`;
+      const res = await fetch(`/api/quiz/question?${qs}`);
+      const data = await res.json();
+      if (!res.ok || data.error) { showFeedback('error', data.error || 'Failed to load'); return; }
+      current = data;
+      state.token = data.token;
+      renderQuestion();
+    } catch (_) {
+      showFeedback('error', 'Network error');
+    }
+  }
+
+  async function submit(choice) {
+    const res = await fetch('/api/quiz/answer', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ token: state.token, choice }),
+    });
+    const data = await res.json();
+    if (!res.ok || data.error) throw new Error(data.error || 'Error');
+    return data;
+  }
+
+  async function choose(btn, choice) {
+    if (busy || !state.token || state.roundSolved || state.revealed) return;
+    busy = true;
+    try {
+      const data = await submit(choice);
+      if (data.correct) {
+        awardCorrect({ wrong: state.attemptsWrong || 0 });
+        showFeedback('correct', t('quiz.correct'));
+        markAnswer(data.answer);
+      } else {
+        state.attemptsWrong = (state.attemptsWrong || 0) + 1;
+        resetOnWrongGuess();
+        btn.classList.add('wrong');
+        btn.disabled = true;
+        showFeedback('wrong', t('quiz.wrong'));
+      }
+    } catch (err) {
+      showFeedback('error', err.message || 'Network error');
+    } finally {
+      busy = false;
+    }
+  }
+
+  async function reveal() {
+    if (!state.roundActive || state.roundSolved || state.revealed || !current) return;
+    resetOnReveal();
+    try {
+      const { answer } = await submit(0);
+      markAnswer(answer);
+      showFeedback('reveal', t('quiz.reveal', { answer: optionLabel(current.options[answer]) }));
+    } catch (_) {}
+  }
+
+  diffButtons.forEach(b => b.addEventListener('click', () => {
+    difficulty = b.dataset.difficulty;
+    try { localStorage.setItem('quizDifficulty', difficulty); } catch(_) {}
+    syncDifficulty();
+    newRound();
+  }));
+  syncDifficulty();
+  document.getElementById('reveal-btn')?.addEventListener('click', reveal);
+  document.getElementById('next-btn')?.addEventListener('click', newRound);
+
+  // Centralized wiring via initMode
+  try { initMode({ id: 'quiz', onGenChange: newRound, onLangChange: renderQuestion }); } catch(_) {}
+
+  // Start first round
+  newRound();
+});
@@ -35,6 +35,10 @@ window.addEventListener('DOMContentLoaded', async () => {
   const canvas = document.getElementById('wave-canvas');
   const canvasWrap = document.getElementById('audio-visual');
   const ctx = canvas ? canvas.getContext('2d') : null;
+  // Precomputed envelope (0..127 per bucket) and duration of the current cry, when the
+  // server has them: the waveform is drawn right away and the audio only loads on play
+  let wavePeaks = null;
+  let waveDuration = 0;
 
   // Resize canvas to fit its container (responsive, crisp on high-DPR screens)
   function resizeCanvas() {
@@ -51,6 +55,7 @@ window.addEventListener('DOMContentLoaded', async () => {
       // Ensure drawing coordinates are in CSS pixels
       ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
       clearCanvas();
+      if (wavePeaks) drawWaveform(progressRatio());
     }
   }
 
@@ -90,8 +95,11 @@ window.addEventListener('DOMContentLoaded', async () => {
     // Audio events & controls
     audioEl.addEventListener('play', async () => {
       setPlayState('pause');
-      ensureAudioGraph();
-      try { await audioCtx.resume?.(); } catch(_) {}
+      // The live analyser is only needed when there is no precomputed waveform
+      if (!wavePeaks) {
+        ensureAudioGraph();
+        try { await audioCtx.resume?.(); } catch(_) {}
+      }
       stopDrawing();
       draw();
     });
@@ -145,7 +153,51 @@ window.addEventListener('DOMContentLoaded', async () => {
     ctx.clearRect(0, 0, width, height);
   }
 
+  function progressRatio() {
+    const dur = (Number.isFinite(audioEl.duration) && audioEl.duration > 0) ? audioEl.duration : waveDuration;
+    const cur = audioEl.currentTime || 0;
+    return dur ? Math.min(1, Math.max(0, cur / dur)) : 0;
+  }
+
+  function setWaveform(data) {
+    wavePeaks = (Array.isArray(data.peaks) && data.peaks.length) ? data.peaks : null;
+    waveDuration = Number(data.duration) || 0;
+    try { audioEl.preload = wavePeaks ? 'none' : 'auto'; } catch(_) {}
+  }
+
+  // Static waveform from the precomputed peaks, played part highlighted
+  function drawWaveform(ratio) {
+    if (!ctx || !canvas || !wavePeaks) return;
+    const width = canvas.clientWidth || 0;
+    const height = canvas.clientHeight || 0;
+    ctx.clearRect(0, 0, width, height);
+    const bg = ctx.createLinearGradient(0, 0, 0, height);
+    bg.addColorStop(0, '#0e1740');
+    bg.addColorStop(1, '#0b112e');
+    ctx.fillStyle = bg;
+    ctx.fillRect(0, 0, width, height);
+
+    const barCount = Math.max(1, Math.min(wavePeaks.length, Math.floor(width / 3)));
+    const per = wavePeaks.length / barCount;
+    const barWidth = width / barCount;
+    const mid = height / 2;
+    for (let i = 0; i < barCount; i++) {
+      let v = 0;
+      for (let k = Math.floor(i * per); k < Math.floor((i + 1) * per); k++) v = Math.max(v, wavePeaks[k] || 0);
+      v /= 127;
+      const barH = Math.max(2, v * (height - 6));
+      const played = (i + 0.5) / barCount <= ratio;
+      ctx.fillStyle = played ? '#ffd942' : `hsl(${220 - Math.floor(v * 120)} 80% 60% / 0.95)`;
+      ctx.fillRect(i * barWidth + 1, mid - barH / 2, Math.max(1, barWidth - 2), barH);
+    }
+  }
+
   function draw() {
+    if (wavePeaks) {
+      drawWaveform(progressRatio());
+      rafId = requestAnimationFrame(draw);
+      return;
+    }
     if (!ctx || !analyser) return;
     const width = canvas.clientWidth || 0;
     const height = canvas.clientHeight || 0;
@@ -197,6 +249,7 @@ window.addEventListener('DOMContentLoaded', async () => {
     if (rafId) cancelAnimationFrame(rafId);
     rafId = null;
     clearCanvas();
+    if (wavePeaks) drawWaveform(progressRatio());
   }
 
   function seekFromCanvas(ev) {
@@ -241,9 +294,10 @@ window.addEventListener('DOMContentLoaded', async () => {
       color: data.color,
       generation: data.generation,
     });
+    setWaveform(data);
+    audioEl.src = data.audio || '';
     stopDrawing();
     setPlayState('play');
-    audioEl.src = data.audio || '';
     document.getElementById('feedback').textContent = '';
     document.getElementById('feedback').className = 'feedback';
   }
@@ -266,14 +320,13 @@ window.addEventListener('DOMContentLoaded', async () => {
       };
     };
     const onRoundLoaded = ({ payload }) => {
+      setWaveform(payload);
+      audioEl.src = payload.audio || '';
       try {
         stopDrawing();
       } catch(_) {}
       setPlayState('play');
-      audioEl.src = payload.audio || '';
       try { setTimeout(() => frame?.classList.remove('loading'), 200); } catch(_) {}
-      // Ensure canvas reset
-      try { clearCanvas(); } catch(_) {}
     };
     const onCorrect = () => {
       // No special visuals; feedback handled by engine
@@ -334,7 +387,7 @@ window.addEventListener('DOMContentLoaded', async () => {
       state.attemptsWrong = (state.attemptsWrong || 0) + 1;
       // A wrong guess ends the current streak (score unchanged)
       if (typeof resetOnWrongGuess === 'function') { resetOnWrongGuess(); }
-      if (typeof showFeedback === 'function') showFeedback('wrong', t('feedback.wrong'));
+      if (typeof showFeedback === 'function') showFeedback('wrong', window.Api ? Api.wrongMessage(r) : t('feedback.wrong'));
       try { window.noteGuessed && window.noteGuessed(guess); } catch(_){ }
       try { maybeRevealHints(); } catch(_) {}
     }
@@ -20,6 +20,19 @@ window.addEventListener('DOMContentLoaded', async () => {
   // Centralized wiring via initMode
   try { initMode({ id: 'silhouette' }); } catch(_) {}
 
+  // Server-rendered black mask when available (the artwork is then only downloaded on
+  // reveal), else the artwork blacked out with a CSS filter
+  function showSilhouette(el, data) {
+    el.style.backgroundImage = `url(${data.silhouette || data.sprite})`;
+    el.style.filter = data.silhouette ? '' : 'brightness(0) saturate(100%)';
+  }
+  function showArtwork(el, data) {
+    if (data && data.sprite) el.style.backgroundImage = `url(${data.sprite})`;
+    el.style.filter = '';
+    el.style.backgroundSize = 'contain';
+    el.style.backgroundPosition = 'center center';
+  }
+
   // If the new RoundEngine is available, use it and skip legacy wiring
   if (window.RoundEngine) {
     const frame = document.querySelector('.sprite-frame');
@@ -40,10 +53,9 @@ window.addEventListener('DOMContentLoaded', async () => {
         const el = document.getElementById('sprite-crop');
         el.classList.remove('revealed');
         el.classList.add('no-anim');
-        el.style.backgroundImage = `url(${payload.sprite})`;
+        showSilhouette(el, payload);
         el.style.backgroundSize = payload.bg_size || 'contain';
         el.style.backgroundPosition = payload.bg_pos || 'center center';
-        el.style.filter = 'brightness(0) saturate(100%)';
         void el.offsetWidth;
         el.classList.remove('no-anim');
         try { setTimeout(() => frame?.classList.remove('loading'), 200); } catch(_) {}
@@ -51,10 +63,7 @@ window.addEventListener('DOMContentLoaded', async () => {
     };
     const onCorrect = ({ name, payload }) => {
       try {
-        const el = document.getElementById('sprite-crop');
-        el.style.filter = '';
-        el.style.backgroundSize = 'contain';
-        el.style.backgroundPosition = 'center center';
+        showArtwork(document.getElementById('sprite-crop'), payload);
       } catch(_) {}
     };
     const onWrong = ({ attemptsWrong, guess, payload }) => {
@@ -62,10 +71,7 @@ window.addEventListener('DOMContentLoaded', async () => {
     };
     const onReveal = ({ answer, payload }) => {
       try {
-        const el = document.getElementById('sprite-crop');
-        el.style.filter = '';
-        el.style.backgroundSize = 'contain';
-        el.style.backgroundPosition = 'center center';
+        showArtwork(document.getElementById('sprite-crop'), payload);
       } catch(_) {}
     };
     RoundEngine.start({ fetchRound, onRoundLoaded, onCorrect, onWrong, onReveal, checkUrl: '/api/check-guess' });
@@ -73,6 +79,8 @@ window.addEventListener('DOMContentLoaded', async () => {
     return; // skip legacy flow
   }
 
+  let roundData = null;
+
   async function newRoundSilhouette() {
     if (typeof resetOnAbandon === 'function') { resetOnAbandon(); }
     state.roundActive = true;
@@ -109,11 +117,10 @@ window.addEventListener('DOMContentLoaded', async () => {
     const el = document.getElementById('sprite-crop');
     el.classList.remove('revealed');
     el.classList.add('no-anim');
-    el.style.backgroundImage = `url(${data.sprite})`;
+    roundData = data;
+    showSilhouette(el, data);
     el.style.backgroundSize = data.bg_size || 'contain';
     el.style.backgroundPosition = data.bg_pos || 'center center';
-    // Apply silhouette effect via CSS filter (black fill via drop-shadow on white) fallback to brightness(0)
-    el.style.filter = 'brightness(0) saturate(100%)';
     void el.offsetWidth;
     el.classList.remove('no-anim');
     if (typeof showFeedback === 'function') showFeedback('info', '');
@@ -168,11 +175,8 @@ window.addEventListener('DOMContentLoaded', async () => {
         const guessBtn = document.querySelector('#guess-form button[type="submit"], form.guess-form button[type="submit"]');
         if (guessBtn) { guessBtn.disabled = true; guessBtn.setAttribute('aria-disabled','true'); }
       } catch(_) {}
-      // Reveal: remove silhouette filter and ensure full image is visible
-      const el = document.getElementById('sprite-crop');
-      el.style.filter = '';
-      el.style.backgroundSize = 'contain';
-      el.style.backgroundPosition = 'center center';
+      // Reveal: swap in the full artwork
+      showArtwork(document.getElementById('sprite-crop'), roundData);
     } else {
       state.attemptsWrong = (state.attemptsWrong || 0) + 1;
       // A wrong guess ends the current streak (score unchanged)
@@ -185,10 +189,7 @@ window.addEventListener('DOMContentLoaded', async () => {
 
   document.getElementById('reveal-btn').addEventListener('click', () => {
     if (!state.token) return;
-    const el = document.getElementById('sprite-crop');
-    el.style.filter = '';
-    el.style.backgroundSize = 'contain';
-    el.style.backgroundPosition = 'center center';
+    showArtwork(document.getElementById('sprite-crop'), roundData);
     if (typeof showFeedback === 'function') showFeedback('reveal', `Revealed: ${state.answer || ''}`);
     if (typeof resetOnReveal === 'function') { resetOnReveal(); }
   });
@@ -20,6 +20,31 @@ window.addEventListener('DOMContentLoaded', async () => {
   // Centralized wiring via initMode
   try { initMode({ id: 'tcg' }); } catch(_) {}
 
+  // Image hints so the server can pick the smallest suitable card asset
+  const supportsWebp = (() => {
+    try { return document.createElement('canvas').toDataURL('image/webp').indexOf('data:image/webp') === 0; } catch(_) { return false; }
+  })();
+  function imageHints() {
+    const el = document.getElementById('card-crop');
+    const hints = { dpr: Math.round((window.devicePixelRatio || 1) * 100) / 100, webp: supportsWebp ? 1 : 0 };
+    if (el && el.clientWidth) { hints.w = el.clientWidth; hints.h = el.clientHeight || el.clientWidth; }
+    try { if (navigator.connection && navigator.connection.saveData) hints.save = 1; } catch(_) {}
+    return hints;
+  }
+  function hintQuery() {
+    const h = imageHints();
+    return Object.keys(h).map(k => `&${k}=${encodeURIComponent(h[k])}`).join('');
+  }
+  // Swap in the full-quality card once it is shown unblurred; the round image stays
+  // underneath as a placeholder until the high-quality one has loaded
+  function showFullQuality() {
+    const el = document.getElementById('card-crop');
+    const hq = state.imageHq;
+    if (!el || !hq || state.shownHq === hq) return;
+    state.shownHq = hq;
+    el.style.backgroundImage = state.image && state.image !== hq ? `url(${hq}), url(${state.image})` : `url(${hq})`;
+  }
+
   async function newRoundTCG() {
     if (typeof resetOnAbandon === 'function') { resetOnAbandon(); }
     state.roundActive = true;
@@ -43,10 +68,13 @@ window.addEventListener('DOMContentLoaded', async () => {
 
     const frame = document.querySelector('.sprite-frame');
     frame?.classList.add('loading');
-    const res = await fetch(`/api/tcg/random?lang=${encodeURIComponent(getLang())}&gen=${encodeURIComponent(getGen())}`);
+    const res = await fetch(`/api/tcg/random?lang=${encodeURIComponent(getLang())}&gen=${encodeURIComponent(getGen())}${hintQuery()}`);
     const data = await res.json();
     state.token = data.token;
     state.answer = data.name;
+    state.image = data.image;
+    state.imageHq = data.image_hq || data.image;
+    state.shownHq = null;
     // Provide metadata for shared hints; use card image as silhouette surrogate
     state.meta = Object.assign({}, state.meta, {
       sprite: data.image,
@@ -81,6 +109,7 @@ window.addEventListener('DOMContentLoaded', async () => {
     const px = BLUR_STEPS[idx];
     if (px <= 0) {
       el.style.filter = 'contrast(110%)';
+      showFullQuality();
     } else {
       el.style.filter = `blur(${px}px) contrast(110%)`;
     }
@@ -97,7 +126,7 @@ window.addEventListener('DOMContentLoaded', async () => {
     const frame = document.querySelector('.sprite-frame');
     const fetchRound = async () => {
       try { frame?.classList.add('loading'); } catch(_) {}
-      const r = await (window.Api ? Api.random({ kind: 'tcg' }) : Promise.resolve({ ok:false, error:'API unavailable' }));
+      const r = await (window.Api ? Api.random({ kind: 'tcg', params: imageHints() }) : Promise.resolve({ ok:false, error:'API unavailable' }));
       if (!r.ok) { try { showFeedback('error', r.error || 'Failed to load'); } catch(_) {} ; return {}; }
       const data = r.data;
       return {
@@ -109,6 +138,9 @@ window.addEventListener('DOMContentLoaded', async () => {
     };
     const onRoundLoaded = ({ payload }) => {
       const el = document.getElementById('card-crop');
+      state.image = payload.image;
+      state.imageHq = payload.image_hq || payload.image;
+      state.shownHq = null;
       try {
         el.classList.remove('revealed');
         el.classList.add('no-anim');
@@ -123,10 +155,10 @@ window.addEventListener('DOMContentLoaded', async () => {
     };
     const onCorrect = () => {
       const el = document.getElementById('card-crop');
-      try { el.style.filter = ''; el.style.backgroundSize = 'contain'; el.style.backgroundPosition = 'center center'; } catch(_) {}
+      try { el.style.filter = ''; el.style.backgroundSize = 'contain'; el.style.backgroundPosition = 'center center'; showFullQuality(); } catch(_) {}
     };
     const onWrong = () => { try { setCardBlur((state.attemptsWrong||0)); } catch(_) {} };
-    const onReveal = () => { const el = document.getElementById('card-crop'); try { el.style.filter=''; el.style.backgroundSize='contain'; el.style.backgroundPosition='center center'; } catch(_) {} };
+    const onReveal = () => { const el = document.getElementById('card-crop'); try { el.style.filter=''; el.style.backgroundSize='contain'; el.style.backgroundPosition='center center'; showFullQuality(); } catch(_) {} };
     RoundEngine.start({ fetchRound, onRoundLoaded, onCorrect, onWrong, onReveal, checkUrl: '/api/check-guess' });
     try { initMode({ id: 'tcg' }); } catch(_) {}
     return; // skip legacy flow
@@ -180,6 +212,7 @@ window.addEventListener('DOMContentLoaded', async () => {
       el.style.filter = '';
       el.style.backgroundSize = 'contain';
       el.style.backgroundPosition = 'center center';
+      showFullQuality();
     } else {
       state.attemptsWrong = (state.attemptsWrong || 0) + 1;
       // Unblur slightly on each wrong guess
@@ -197,6 +230,7 @@ window.addEventListener('DOMContentLoaded', async () => {
     el.style.filter = '';
     el.style.backgroundSize = 'contain';
     el.style.backgroundPosition = 'center center';
+    showFullQuality();
     if (typeof showFeedback === 'function') showFeedback('reveal', `Revealed: ${state.answer || ''}`);
     if (typeof resetOnReveal === 'function') { resetOnReveal(); }
   });
@@ -0,0 +1,163 @@
+// Type Matchup game logic: pick an attacking type that is super effective against the
+// shown Pokémon. Relies on shared helpers from game.js (i18n, HUD, scoring).
+
+window.addEventListener('DOMContentLoaded', async () => {
+  if (!document.querySelector('[data-game="type"]')) return;
+
+  // Initialize language and UI
+  setLang(getLang());
+  const extraI18N = {
+    en: { 'type.title': 'Type Matchup', 'type.question': 'Which attack type is super effective against', 'type.correct': 'Correct! {type} deals ×{mult} damage.', 'type.wrong': '{type} deals ×{mult} damage. Try again.', 'type.reveal': 'Super effective: {types}' },
+    es: { 'type.title': 'Tabla de tipos', 'type.question': '¿Qué tipo de ataque es súper eficaz contra', 'type.correct': '¡Correcto! {type} hace ×{mult} de daño.', 'type.wrong': '{type} hace ×{mult} de daño. Inténtalo de nuevo.', 'type.reveal': 'Súper eficaz: {types}' },
+    fr: { 'type.title': 'Table des types', 'type.question': "Quel type d'attaque est super efficace contre", 'type.correct': 'Correct ! {type} inflige ×{mult} dégâts.', 'type.wrong': '{type} inflige ×{mult} dégâts. Réessayez.', 'type.reveal': 'Super efficace : {types}' },
+    de: { 'type.title': 'Typen-Duell', 'type.question': 'Welcher Angriffstyp ist sehr effektiv gegen', 'type.correct': 'Richtig! {type} macht ×{mult} Schaden.', 'type.wrong': '{type} macht ×{mult} Schaden. Versuch es noch einmal.', 'type.reveal': 'Sehr effektiv: {types}' },
+  };
+  try { if (window.i18n && typeof i18n.extend === 'function') i18n.extend(extraI18N); } catch (_) {}
+  translatePage();
+
+  // Type labels (same as daily.js, which is only loaded on the daily page)
+  const TYPE_LABELS = {
+    en: { normal: 'Normal', fire: 'Fire', water: 'Water', grass: 'Grass', electric: 'Electric', ice: 'Ice', fighting: 'Fighting', poison: 'Poison', ground: 'Ground', flying: 'Flying', psychic: 'Psychic', bug: 'Bug', rock: 'Rock', ghost: 'Ghost', dragon: 'Dragon', dark: 'Dark', steel: 'Steel', fairy: 'Fairy' },
+    es: { normal: 'Normal', fire: 'Fuego', water: 'Agua', grass: 'Planta', electric: 'Eléctrico', ice: 'Hielo', fighting: 'Lucha', poison: 'Veneno', ground: 'Tierra', flying: 'Volador', psychic: 'Psíquico', bug: 'Bicho', rock: 'Roca', ghost: 'Fantasma', dragon: 'Dragón', dark: 'Siniestro', steel: 'Acero', fairy: 'Hada' },
+    fr: { normal: 'Normal', fire: 'Feu', water: 'Eau', grass: 'Plante', electric: 'Électrik', ice: 'Glace', fighting: 'Combat', poison: 'Poison', ground: 'Sol', flying: 'Vol', psychic: 'Psy', bug: 'Insecte', rock: 'Roche', ghost: 'Spectre', dragon: 'Dragon', dark: 'Ténèbres', steel: 'Acier', fairy: 'Fée' },
+    de: { normal: 'Normal', fire: 'Feuer', water: 'Wasser', grass: 'Pflanze', electric: 'Elektro', ice: 'Eis', fighting: 'Kampf', poison: 'Gift', ground: 'Boden', flying: 'Flug', psychic: 'Psycho', bug: 'Käfer', rock: 'Gestein', ghost: 'Geist', dragon: 'Drache', dark: 'Unlicht', steel: 'Stahl', fairy: 'Fee' },
+  };
+  const typeLabel = (slug) => (TYPE_LABELS[getLang()] || TYPE_LABELS.en)[slug] || slug;
+
+  // Stats and HUD
+  loadStats();
+  updateHUD();
+
+  const spriteEl = document.getElementById('matchup-sprite');
+  const nameEl = document.getElementById('matchup-name');
+  const typesEl = document.getElementById('matchup-types');
+  const attacksEl = document.getElementById('matchup-attacks');
+  const frame = document.querySelector('.sprite-frame');
+  let roundData = null;
+  let answers = null;  // super-effective types, known once the round ends
+  let busy = false;
+
+  function badge(slug, tag = 'span') {
+    const el = document.createElement(tag);
+    el.className = 'type-badge';
+    el.dataset.type = slug;
+    el.textContent = typeLabel(slug);
+    return el;
+  }
+
+  function renderRound() {
+    if (!roundData) return;
+    nameEl.textContent = roundData.name || '';
+    typesEl.replaceChildren(...(roundData.types || []).map(s => badge(s)));
+    attacksEl.replaceChildren(...(roundData.attack_types || []).map(s => {
+      const btn = badge(s, 'button');
+      btn.type = 'button';
+      btn.addEventListener('click', () => pickAttack(btn, s));
+      return btn;
+    }));
+  }
+
+  function relabel() {
+    document.querySelectorAll('#matchup-types .type-badge, #matchup-attacks .type-badge').forEach(el => {
+      el.textContent = typeLabel(el.dataset.type);
+    });
+  }
+
+  function setAttacksDisabled(disabled) {
+    attacksEl.querySelectorAll('button').forEach(b => { b.disabled = !!disabled; });
+  }
+
+  function markAnswers(list) {
+    answers = list || [];
+    attacksEl.querySelectorAll('button').forEach(b => {
+      if (answers.includes(b.dataset.type)) b.classList.add('correct');
+    });
+    setAttacksDisabled(true);
+  }
+
+  async function newRound() {
+    if (typeof resetOnAbandon === 'function') { resetOnAbandon(); }
+    state.roundActive = true;
+    state.roundSolved = false;
+    state.revealed = false;
+    state.attemptsWrong = 0;
+    answers = null;
+    try { if (typeof setRoundControlsDisabled === 'function') setRoundControlsDisabled(false); } catch(_) {}
+    try { if (typeof setNextButtonDisabled === 'function') setNextButtonDisabled(true); } catch(_) {}
+    if (typeof showFeedback === 'function') showFeedback('info', '');
+
+    frame?.classList.add('loading');
+    try {
+      const res = await fetch(`/api/type-matchup/random?lang=${encodeURIComponent(getLang())}&gen=${encodeURIComponent(getGen())}`);
+      const data = await res.json();
+      if (!res.ok || data.error) { showFeedback('error', data.error || 'Failed to load'); return; }
+      roundData = data;
+      state.token = data.token;
+      state.answer = data.name;
+      spriteEl.style.backgroundImage = data.sprite ? `url(${data.sprite})` : '';
+      renderRound();
+    } catch (_) {
+      showFeedback('error', 'Network error');
+    } finally {
+      setTimeout(() => frame?.classList.remove('loading'), 200);
+    }
+  }
+
+  async function pickAttack(btn, attack) {
+    if (busy || !state.token || state.roundSolved || state.revealed) return;
+    busy = true;
+    try {
+      const res = await fetch('/api/type-matchup/check', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ token: state.token, attack }),
+      });
+      const data = await res.json();
+      if (!res.ok || data.error) { showFeedback('error', data.error || 'Error'); return; }
+      const vars = { type: typeLabel(attack), mult: data.multiplier };
+      if (data.correct) {
+        awardCorrect({ wrong: state.attemptsWrong || 0 });
+        showFeedback('correct', t('type.correct', vars));
+        markAnswers(data.super_effective);
+      } else {
+        state.attemptsWrong = (state.attemptsWrong || 0) + 1;
+        resetOnWrongGuess();
+        btn.classList.add('wrong');
+        btn.disabled = true;
+        answers = data.super_effective;
+        showFeedback('wrong', t('type.wrong', vars));
+      }
+    } catch (_) {
+      showFeedback('error', 'Network error');
+    } finally {
+      busy = false;
+    }
+  }
+
+  async function reveal() {
+    if (!state.roundActive || state.roundSolved || state.revealed || !roundData) return;
+    resetOnReveal();
+    if (!answers) {
+      // No guess yet: any check answers with the full list
+      try {
+        const res = await fetch('/api/type-matchup/check', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ token: state.token, attack: roundData.attack_types[0] }),
+        });
+        answers = (await res.json()).super_effective || [];
+      } catch (_) { answers = []; }
+    }
+    markAnswers(answers);
+    showFeedback('reveal', t('type.reveal', { types: answers.map(typeLabel).join(', ') }));
+  }
+
+  document.getElementById('reveal-btn')?.addEventListener('click', reveal);
+  document.getElementById('next-btn')?.addEventListener('click', newRound);
+
+  // Centralized wiring via initMode
+  try { initMode({ id: 'type', onGenChange: newRound, onLangChange: relabel }); } catch(_) {}
+
+  // Start first round
+  newRound();
+});
@@ -0,0 +1,113 @@
+"""Shared fixtures: a small offline dataset and no network access.
+
+The dataset is built by services.ingest itself, from canned PokeAPI documents written
+into its raw response cache, so the tests run the same build as `python -m services.ingest`.
+"""
+import json
+import os
+
+import pytest
+import requests
+from flask import Flask
+
+from services import core, dataset, ingest, pokemon
+
+# id -> (slug, types, height, weight, color, generation, chain id, {lang: name})
+SPECIES = {
+    1: ('bulbasaur', ['grass', 'poison'], 7, 69, 'green', 1, 1, {'fr': 'Bulbizarre', 'de': 'Bisasam'}),
+    2: ('ivysaur', ['grass', 'poison'], 10, 130, 'green', 1, 1, {'fr': 'Herbizarre', 'de': 'Bisaknosp'}),
+    3: ('venusaur', ['grass', 'poison'], 20, 1000, 'green', 1, 1, {'fr': 'Florizarre', 'de': 'Bisaflor'}),
+    4: ('charmander', ['fire'], 6, 85, 'red', 1, 2, {'fr': 'Salamèche', 'de': 'Glumanda'}),
+    5: ('charmeleon', ['fire'], 11, 190, 'red', 1, 2, {'fr': 'Reptincel', 'de': 'Glutexo'}),
+    6: ('charizard', ['fire', 'flying'], 17, 905, 'red', 1, 2, {'fr': 'Dracaufeu', 'de': 'Glurak'}),
+    25: ('pikachu', ['electric'], 4, 60, 'yellow', 1, 10, {'fr': 'Pikachu', 'de': 'Pikachu'}),
+    26: ('raichu', ['electric'], 8, 300, 'yellow', 1, 10, {'fr': 'Raichu', 'de': 'Raichu'}),
+    128: ('tauros', ['normal'], 14, 884, 'brown', 1, 61, {'fr': 'Tauros', 'de': 'Tauros'}),
+    133: ('eevee', ['normal'], 3, 65, 'brown', 1, 67, {'fr': 'Évoli', 'de': 'Evoli'}),
+    134: ('vaporeon', ['water'], 10, 290, 'blue', 1, 67, {'fr': 'Aquali', 'de': 'Aquana'}),
+    135: ('jolteon', ['electric'], 8, 245, 'yellow', 1, 67, {'fr': 'Voltali', 'de': 'Blitza'}),
+    172: ('pichu', ['electric'], 3, 20, 'yellow', 2, 10, {'fr': 'Pichu', 'de': 'Pichu'}),
+    252: ('treecko', ['grass'], 5, 50, 'green', 3, 130, {'fr': 'Arcko', 'de': 'Geckarbor'}),
+}
+# chain id -> nested (species id, [evolutions])
+CHAINS = {
+    1: (1, [(2, [(3, [])])]),
+    2: (4, [(5, [(6, [])])]),
+    10: (172, [(25, [(26, [])])]),
+    61: (128, []),
+    67: (133, [(134, []), (135, [])]),
+    130: (252, []),
+}
+
+
+def _offline(*args, **kwargs):
+    raise requests.ConnectionError('network access in a test')
+
+
+def _species_ref(pid: int) -> dict:
+    return {'name': SPECIES[pid][0], 'url': f"{core.POKEAPI_BASE}/pokemon-species/{pid}/"}
+
+
+def _chain_node(node) -> dict:
+    pid, evolves_to = node
+    return {'species': _species_ref(pid), 'evolves_to': [_chain_node(n) for n in evolves_to]}
+
+
+def _write(data_dir: str, url: str, doc):
+    path = ingest._raw_path(data_dir, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(doc, f)
+
+
+def write_raw(data_dir: str):
+    """Write the PokeAPI documents the ingest stages read for SPECIES."""
+    base = core.POKEAPI_BASE
+    _write(data_dir, f"{base}/pokemon-species?limit=20000", {'results': [_species_ref(pid) for pid in SPECIES]})
+    for pid, (slug, types, height, weight, color, gen, chain, names) in SPECIES.items():
+        _write(data_dir, f"{base}/pokemon-species/{pid}", {
+            'id': pid,
+            'name': slug,
+            'color': {'name': color},
+            'generation': {'url': f"{base}/generation/{gen}/"},
+            'evolution_chain': {'url': f"{base}/evolution-chain/{chain}/"},
+            'varieties': [{'is_default': True, 'pokemon': {'name': slug, 'url': f"{base}/pokemon/{pid}/"}}],
+            'names': [{'name': name, 'language': {'name': lang}} for lang, name in names.items()],
+        })
+        _write(data_dir, f"{base}/pokemon/{pid}", {
+            'id': pid,
+            'name': slug,
+            'height': height,
+            'weight': weight,
+            'types': [{'slot': i + 1, 'type': {'name': t}} for i, t in enumerate(types)],
+            'sprites': {'other': {'official-artwork': {'front_default': f"https://img.test/{pid}.png"}}},
+        })
+    for chain, root in CHAINS.items():
+        _write(data_dir, f"{base}/evolution-chain/{chain}", {'id': chain, 'chain': _chain_node(root)})
+
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    monkeypatch.setattr(requests.Session, 'send', _offline)
+
+
+@pytest.fixture(scope='session')
+def data_dir(tmp_path_factory):
+    """Directory with the attrs, evolution and names stages built for SPECIES, loaded."""
+    d = str(tmp_path_factory.mktemp('data'))
+    write_raw(d)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(requests.Session, 'send', _offline)
+        for build in (ingest.build_attrs, ingest.build_evolution, ingest.build_names):
+            build(d)
+    dataset.load(d)
+    pokemon.load_prebuilt()
+    return d
+
+
+@pytest.fixture
+def app():
+    """A bare Flask app; tests register the blueprints they exercise."""
+    flask_app = Flask(__name__)
+    flask_app.secret_key = 'test'
+    return flask_app
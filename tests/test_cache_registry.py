@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+
+from games import daily, guess, quiz, scream  # noqa: F401 (import the proxies of every games module)
+from services import cache_registry, pokemon
+
+
+def test_discover_outside_app_context(data_dir):
+    caches = cache_registry.discover()
+    assert 'games.daily.META_CACHE' in caches
+    assert 'services.text_utils._normalize' in caches
+    assert 'services.name_shards.SHARDS' in caches
+    assert not any(name.endswith(('.request', '.g', '.current_app')) for name in caches)
+
+
+def test_observe_records_ages_outside_app_context(data_dir, monkeypatch):
+    monkeypatch.setattr(cache_registry, '_SEEN', {})
+    monkeypatch.setitem(daily.META_CACHE, '2000-01-01', {})
+    cache_registry.observe()
+    assert '2000-01-01' in cache_registry._SEEN['games.daily.META_CACHE']
+    assert sum(cache_registry.stats('games.daily.META_CACHE')['ages'].values()) >= 1
+
+
+def test_observer_logs_failures(monkeypatch, caplog):
+    def broken():
+        raise RuntimeError('scan failed')
+
+    class Timer:
+        def __init__(self, *args):
+            self.daemon = False
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(cache_registry, 'observe', broken)
+    monkeypatch.setattr(cache_registry.threading, 'Timer', Timer)
+    monkeypatch.setattr(cache_registry, '_TIMER', None)
+    with caplog.at_level(logging.ERROR, logger=cache_registry.__name__):
+        cache_registry._tick()
+    assert 'scan failed' in caplog.text
+
+
+def test_invalidate(data_dir, monkeypatch):
+    monkeypatch.setitem(daily.ATTR_CACHE, 999, {'types': []})
+    assert cache_registry.invalidate('games.daily.ATTR_CACHE', [999]) == 1
+    assert 999 not in daily.ATTR_CACHE
+    with pytest.raises(PermissionError):
+        cache_registry.invalidate('services.pokemon.POKEMON_LIST')
+    assert pokemon.get_pokemon_list()
+    assert cache_registry.invalidate('no.such.CACHE') is None
@@ -0,0 +1,79 @@
+import struct
+
+import numpy as np
+import pytest
+
+from services import cries
+
+RATE = 8000
+
+
+def _lacing(size: int) -> list:
+    return [255] * (size // 255) + [size % 255]
+
+
+def _page(serial: int, seq: int, granule: int, lacing: list, body: bytes) -> bytes:
+    assert sum(lacing) == len(body)
+    header = struct.pack('<4sBBqIIIB', b'OggS', 0, 0, granule, serial, seq, 0, len(lacing))
+    return header + bytes(lacing) + body
+
+
+def _packets_page(serial: int, seq: int, granule: int, packets) -> bytes:
+    lacing = [v for p in packets for v in _lacing(len(p))]
+    return _page(serial, seq, granule, lacing, b''.join(packets))
+
+
+def _ident(rate: int = RATE, magic: bytes = b'\x01vorbis') -> bytes:
+    return magic + struct.pack('<IBIiiiBB', 0, 1, rate, 0, 0, 0, 0xB8, 1)
+
+
+def _stream(head=None) -> tuple:
+    """A Vorbis stream with a 600-byte audio packet split across two pages and a second
+    logical stream interleaved with it. Returns (file bytes, the split packet)."""
+    split = bytes(range(256)) * 2 + bytes(88)
+    other = _packets_page(2, 0, 10 ** 9, [b'\x01vorbis' + bytes(40), bytes(900)])
+    data = b''.join([
+        _packets_page(1, 0, 0, [head or _ident()]),
+        other,
+        _packets_page(1, 1, 0, [b'\x03vorbis' + bytes(20), b'\x05vorbis' + bytes(300)]),
+        # Two 10-byte packets, then the first 510 bytes of the split packet (no terminating lacing value)
+        _page(1, 2, RATE // 2, [10, 10, 255, 255], bytes(20) + split[:510]),
+        other,
+        _page(1, 3, RATE, [90, 10], split[510:] + bytes(10)),
+    ])
+    return data, split
+
+
+def test_packets_follow_the_first_logical_stream():
+    data, split = _stream()
+    packets = list(cries._packets(data))
+    assert [len(p) for p, _ in packets] == [30, 27, 307, 10, 10, 600, 10]
+    assert [g for _, g in packets][3:] == [RATE // 2, RATE // 2, RATE, RATE]
+    assert packets[5][0] == split
+
+
+def test_analyze_duration_and_envelope():
+    data, _ = _stream()
+    duration, peaks = cries.analyze(data, buckets=64)
+    assert duration == pytest.approx(1.0)  # granule of the first stream only
+    assert peaks.shape == (64,) and peaks.dtype == np.int8
+    assert peaks.min() >= 0 and peaks.max() == 127
+    # The split packet fills the second half: dense there, sparse before it
+    assert np.all(peaks[32:48] == 127)
+    assert np.all(peaks[:32] <= 2)
+
+
+def test_empty_stream():
+    data = _packets_page(1, 0, 0, [_ident(), b'\x03vorbis', b'\x05vorbis', bytes(10)])
+    with pytest.raises(ValueError, match='empty'):
+        cries.analyze(data)
+    with pytest.raises(ValueError, match='not an Ogg Vorbis'):
+        cries.analyze(b'')
+
+
+def test_not_vorbis():
+    data, _ = _stream(head=b'OpusHead' + bytes(11))
+    with pytest.raises(ValueError, match='not an Ogg Vorbis'):
+        cries.analyze(data)
+    with pytest.raises(ValueError, match='not an Ogg stream'):
+        cries.analyze(b'RIFF' + bytes(60))
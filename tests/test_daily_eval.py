@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from games import daily
+from services import daily_eval, dataset, evolution, ingest
+
+from .conftest import SPECIES
+
+
+@pytest.fixture
+def client(app, data_dir, monkeypatch):
+    app.register_blueprint(daily.bp)
+    monkeypatch.setattr(dataset, 'CALENDAR', {})
+    return app.test_client()
+
+
+def _guess(client, monkeypatch, guess_id: int, answer_id: int) -> dict:
+    monkeypatch.setattr(daily, '_pick_daily_id', lambda date_key: answer_id)
+    resp = client.post('/api/daily/guess', json={'guess': SPECIES[guess_id][0], 'lang': 'en'})
+    assert resp.status_code == 200
+    return resp.get_json()
+
+
+def test_codes_match_api_guess(client, monkeypatch):
+    ids = sorted(SPECIES)
+    rows = [dataset.row_for(pid) for pid in ids]
+    codes = daily_eval.feedback_codes(rows, rows)
+    for gi, guess_id in enumerate(ids):
+        for ai, answer_id in enumerate(ids):
+            got = _guess(client, monkeypatch, guess_id, answer_id)
+            fb = got['guess']
+            want = daily_eval.decode(codes[gi, ai])
+            assert got['correct'] == want['correct']
+            assert fb['types']['status'] == want['types']
+            for field in ('generation', 'height', 'weight', 'evo_stage'):
+                assert fb[field]['status'] == want[field]['status'], (guess_id, answer_id, field)
+                assert fb[field]['dir'] == want[field]['dir'], (guess_id, answer_id, field)
+            assert fb['color']['status'] == want['color']
+            assert fb['evolution']['value'] == want['evolution'], (guess_id, answer_id)
+
+
+def test_consistent_mask_keeps_answer_and_matches_brute_force():
+    rows = np.arange(len(SPECIES))
+    codes = daily_eval.feedback_codes(rows, rows)
+    for answer in rows:
+        history = [0, 5, 9]
+        mask = daily_eval.consistent_mask(history, answer)
+        assert mask[answer]
+        expected = [all(codes[g, a] == codes[g, answer] for g in history) for a in rows]
+        assert mask.tolist() == expected
+
+
+def test_candidates_counts_remaining(client, monkeypatch):
+    monkeypatch.setattr(daily, '_pick_daily_id', lambda date_key: 25)
+    resp = client.post('/api/daily/candidates', json={'guesses': ['bulbasaur', 'jolteon']})
+    assert resp.status_code == 200
+    rows = [dataset.row_for(1), dataset.row_for(135)]
+    assert resp.get_json()['remaining'] == int(daily_eval.consistent_mask(rows, dataset.row_for(25)).sum())
+
+
+def test_candidates_deduplicates_and_bounds_history(client, monkeypatch):
+    monkeypatch.setattr(daily, '_pick_daily_id', lambda date_key: 25)
+    once = client.post('/api/daily/candidates', json={'ids': [1, 135]}).get_json()
+    repeated = client.post('/api/daily/candidates', json={'ids': [1, 135] * 50}).get_json()
+    assert once == repeated
+    too_many = client.post('/api/daily/candidates', json={'ids': [1] * (daily.MAX_CANDIDATE_GUESSES + 1)})
+    assert too_many.status_code == 400
+    assert client.post('/api/daily/candidates', json={'ids': 'x' * 10}).status_code == 400
+
+
+@pytest.fixture
+def no_graph(data_dir, monkeypatch):
+    """The table without the evolution graph; live PokeAPI documents come from the raw cache."""
+    def fetch(url, timeout=12):
+        with open(ingest._raw_path(data_dir, url.rstrip('/')), encoding='utf-8') as f:
+            return json.load(f)
+
+    monkeypatch.setattr(daily, '_fetch_json', fetch)
+    monkeypatch.setattr(evolution, 'FAMILY', np.full(0, -1, dtype=np.int32))
+    for name in ('ATTR_CACHE', 'CHAIN_CACHE', 'SPECIES_CACHE', 'POKEMON_CACHE'):
+        monkeypatch.setattr(daily, name, {})
+
+
+@pytest.mark.parametrize('guess_id, answer_id, relation', [
+    (1, 3, 'pre'), (3, 1, 'post'), (4, 3, 'unrelated'), (134, 135, 'same'), (134, 133, 'post'), (172, 26, 'pre'),
+])
+def test_evolution_falls_back_to_live_chain(client, monkeypatch, no_graph, guess_id, answer_id, relation):
+    assert _guess(client, monkeypatch, guess_id, answer_id)['guess']['evolution']['value'] == relation
+
+
+def test_candidates_need_the_graph(client, monkeypatch, no_graph):
+    monkeypatch.setattr(daily, '_pick_daily_id', lambda date_key: 25)
+    assert client.post('/api/daily/candidates', json={'guesses': ['bulbasaur']}).status_code == 503
+
+
+def test_load_warns_without_evolution_graph(data_dir, tmp_path, caplog):
+    shutil.copy(os.path.join(data_dir, dataset.ATTRS_FILE), tmp_path)
+    try:
+        with caplog.at_level(logging.WARNING, logger=dataset.__name__):
+            assert dataset.load(str(tmp_path))
+        assert evolution.EVOLUTION_FILE in caplog.text
+    finally:
+        dataset.load(data_dir)
@@ -0,0 +1,50 @@
+import random
+
+from games import guess
+from services import fuzzy
+from services.text_utils import name_key
+
+
+def _levenshtein(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def _distance(a: str, b: str) -> int:
+    return fuzzy._myers(a, fuzzy._peq(a), b)
+
+
+def test_myers_matches_dynamic_programming():
+    rng = random.Random(7)
+    alphabet = 'abcdeé♀ '
+    for _ in range(3000):
+        a = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        b = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert _distance(a, b) == _levenshtein(a, b), (a, b)
+
+
+def test_myers_edge_cases():
+    for a, b in [('', ''), ('', 'abc'), ('abc', ''), ('abc', 'abc'), ('kitten', 'sitting'),
+                 ('charizard', 'charzard'), ('x' * 70, 'x' * 68 + 'yy')]:
+        assert _distance(a, b) == _levenshtein(a, b)
+
+
+def test_match_finds_typos_within_budget(data_dir):
+    pid, alias, d = fuzzy.match('Charzard')[0]
+    assert (pid, d) == (6, 1)
+    assert alias == name_key('Charizard')
+    assert fuzzy.match('Qwxyzabc') == []
+    assert fuzzy.match('Pik') == []  # shorter than MIN_QUERY_LEN
+
+
+def test_suggestions_respect_generation(app, data_dir):
+    app.register_blueprint(guess.bp)
+    client = app.test_client()
+    assert client.get('/api/pokemon-suggest?q=Treeckoo').get_json() == ['Treecko']
+    assert client.get('/api/pokemon-suggest?q=Treeckoo&gen=1').get_json() == []
+    assert client.get('/api/pokemon-suggest?q=Arckoo&lang=fr&gen=1').get_json() == []
@@ -0,0 +1,24 @@
+from services import ingest
+from services.text_utils import name_key
+
+
+def _index():
+    return {name_key(n): pid for n, pid in [('ピカチュウ', 25), ('ライチュウ', 26), ('ミュウ', 151),
+                                            ('ミュウツー', 150), ('Mr. Mime', 122), ('Meowth', 52)]}
+
+
+def test_match_card_species_by_words():
+    index = _index()
+    assert ingest.match_card_species("Team Rocket's Meowth", index) == 52
+    assert ingest.match_card_species('Mr. Mime ex', index) == 122
+    assert ingest.match_card_species('Trainer', index) is None
+
+
+def test_match_card_species_longest_contained_name():
+    index = _index()
+    trie = ingest.name_trie(index)
+    assert ingest.match_card_species('ミュウツーex', index, trie=trie) == 150
+    assert ingest.match_card_species('ひかるミュウ', index, trie=trie) == 151
+    assert ingest.match_card_species('ロケット団のライチュウ', index, trie=trie) == 26
+    assert ingest.match_card_species('ふしぎなアメ', index, trie=trie) is None
+    assert ingest.match_card_species('ピカチュウV', index) == 25  # trie built on the fly
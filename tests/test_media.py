@@ -0,0 +1,17 @@
+import pytest
+
+from games import media
+from services import media_cache
+
+
+@pytest.fixture
+def client(app, data_dir, monkeypatch):
+    monkeypatch.setattr(media_cache, 'get', lambda key, resolve_url: pytest.fail(f"fetched {key}"))
+    app.register_blueprint(media.bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize('path', ['/media/artwork/9999', '/media/cry/0', '/media/silhouette/123456789',
+                                  '/media/pixelate/9999/0', '/media/tile/9999/0/0'])
+def test_unknown_species_are_not_fetched(client, path):
+    assert client.get(path).status_code == 404
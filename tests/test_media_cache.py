@@ -0,0 +1,100 @@
+import os
+import time
+
+import pytest
+import requests
+
+from services import dataset, media_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(media_cache, 'MAX_BYTES', 20_000)
+    monkeypatch.setattr(media_cache, 'RESCAN_BYTES', 4_000)
+    monkeypatch.setattr(media_cache, '_TOTAL', None)
+    monkeypatch.setattr(media_cache, '_UNSCANNED', 0)
+    return media_cache
+
+
+def _disk_bytes() -> int:
+    return sum(size for _, size, _ in media_cache._files())
+
+
+def _blob(i: int) -> bytes:
+    return i.to_bytes(4, 'big') * 250  # 1000 distinct bytes per asset
+
+
+def test_store_and_lookup(cache):
+    entry = cache.store('artwork:1', _blob(1), 'image/png')
+    assert entry['mimetype'] == 'image/png'
+    with open(entry['path'], 'rb') as f:
+        assert f.read() == _blob(1)
+    assert cache.lookup('artwork:1') == entry
+    assert cache.lookup('artwork:2') is None
+
+
+def test_eviction_bounds_every_file(cache):
+    for i in range(60):
+        cache.store(f"tile:{i}", _blob(i), 'image/png')
+        assert _disk_bytes() <= cache.MAX_BYTES + cache.RESCAN_BYTES
+    assert cache.lookup('tile:59') is not None
+    assert cache.lookup('tile:0') is None
+
+
+def test_eviction_is_least_recently_used(cache):
+    for i in range(10):
+        cache.store(f"tile:{i}", _blob(i), 'image/png')
+    old = time.time() - 2 * cache.TOUCH_INTERVAL
+    for path, _, _ in list(cache._files()):
+        os.utime(path, (old, old))
+    # A lookup refreshes the recency of both the key file and its blob
+    assert cache.lookup('tile:0') is not None
+    for i in range(10, 20):
+        cache.store(f"tile:{i}", _blob(i), 'image/png')
+    survivors = [i for i in range(20) if cache.lookup(f"tile:{i}") is not None]
+    assert 0 in survivors
+    assert survivors[1:] != list(range(1, 20))  # something untouched was evicted...
+    assert set(range(10, 20)) <= set(survivors)  # ... and nothing newer
+
+
+def test_rescan_sees_other_workers(cache):
+    cache.store('tile:0', _blob(0), 'image/png')
+    # Another worker filled the directory past the bound behind this one's back
+    other = os.path.join(media_cache._root(), 'blobs', 'zz')
+    os.makedirs(other)
+    for i in range(30):
+        with open(os.path.join(other, f"{i}.png"), 'wb') as f:
+            f.write(_blob(1000 + i))
+    for i in range(1, 6):
+        cache.store(f"tile:{i}", _blob(i), 'image/png')
+    assert _disk_bytes() <= cache.MAX_BYTES
+
+
+def test_missing_assets_are_remembered(cache, monkeypatch):
+    calls = []
+
+    def resolve():
+        calls.append(1)
+        return ''
+
+    assert cache.get('cry:9999', resolve) is None
+    assert cache.get('cry:9999', resolve) is None
+    assert calls == [1]
+    assert cache.is_missing('cry:9999') and cache.lookup('cry:9999') is None
+    monkeypatch.setattr(cache, 'NEGATIVE_TTL', -1)
+    assert cache.get('cry:9999', resolve) is None
+    assert calls == [1, 1]
+
+
+def test_upstream_404_is_remembered(cache, monkeypatch):
+    def not_found(key, url):
+        resp = requests.Response()
+        resp.status_code = 404
+        raise requests.HTTPError(response=resp)
+
+    monkeypatch.setattr(cache, 'fetch', not_found)
+    assert cache.get('artwork:9999', lambda: 'https://example.invalid/9999.png') is None
+    assert cache.is_missing('artwork:9999')
+    cache.store('artwork:9999', _blob(1), 'image/png')  # a later store replaces the marker
+    assert cache.get('artwork:9999', lambda: '') is not None
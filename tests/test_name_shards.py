@@ -0,0 +1,69 @@
+import pytest
+
+from services import metrics, name_shards, pokemon
+
+from .conftest import SPECIES
+
+
+@pytest.fixture
+def shards(data_dir, monkeypatch):
+    """Empty shard state, read again from the dataset on first use."""
+    monkeypatch.setattr(name_shards, 'SHARDS', {})
+    monkeypatch.setattr(name_shards, 'COMPLETE', set())
+    return name_shards
+
+
+def _events() -> dict:
+    out = {}
+    for name, labels, v in metrics.snapshot()['counters']:
+        lab = dict(labels)
+        if name == 'pokemon_cache_events_total' and lab.get('cache') == 'species_names':
+            out[lab['event']] = v
+    return out
+
+
+def test_shard_loads_dataset_names(shards):
+    assert shards.get(4, 'fr') == 'Salamèche'
+    assert shards.get(9999, 'fr') is None
+    assert shards.is_complete('fr')
+    assert shards.missing(sorted(SPECIES), 'fr') == []
+
+
+def test_unsupported_languages_are_not_stored(shards):
+    for lang in ('xx', 'en-gb', 'a' * 100):
+        assert shards.get(1, lang) is None
+        assert shards.is_complete(lang)
+        assert shards.missing([1], lang) == []
+    assert shards.loaded_langs() == []
+    assert shards.COMPLETE == set()
+    assert pokemon.get_localized_name(1, 'xx') == 'Bulbasaur'
+
+
+def test_get_many_matches_get_and_counts_once(shards):
+    ids = sorted(SPECIES) + [9999]
+    shards.shard('de')
+    before = _events()
+    names = shards.get_many(ids, 'de')
+    after = _events()
+    assert names == [shards.SHARDS['de'][pid] if pid < len(shards.SHARDS['de']) else None for pid in ids]
+    assert after.get('hit', 0) - before.get('hit', 0) == len(SPECIES)
+    assert after.get('miss', 0) - before.get('miss', 0) == 1
+
+
+def test_put_fills_incomplete_shard_and_forget_drops(shards, monkeypatch):
+    monkeypatch.setattr(name_shards.dataset, 'NAME_LANGS', set())  # no dataset: shards start empty
+    assert shards.missing([1, 4], 'it') == [1, 4]
+    shards.put(4, {'it': 'Charmander', 'fr': 'Salamèche'})
+    assert shards.get(4, 'it') == 'Charmander'
+    assert shards.missing([1, 4], 'it') == [1]
+    assert shards.forget(4) == 1
+    assert shards.get(4, 'it') is None
+
+
+def test_warmup_skips_complete_shards(shards, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(pokemon, '_fetch_and_cache_species', fetched.append)
+    monkeypatch.setattr(pokemon, 'WARMED', False)
+    pokemon.warm_up_all_names()
+    assert fetched == []
+    assert pokemon.WARMED and pokemon.WARMUP_TOTAL == 0
@@ -0,0 +1,38 @@
+import pytest
+
+from games import quiz
+from services import ingest, quiz_bank
+
+
+@pytest.mark.parametrize('gen', [0, 1, 9, 63])
+@pytest.mark.parametrize('difficulty', range(len(quiz_bank.DIFFICULTIES)))
+@pytest.mark.parametrize('row', [0, 1, 4097, 0xFFFFF])
+def test_qid_round_trip(gen, difficulty, row):
+    qid = quiz._qid(gen, difficulty, row)
+    assert qid >= 0
+    assert quiz._unpack_qid(qid) == (gen, difficulty, row)
+
+
+@pytest.fixture
+def client(app, data_dir):
+    ingest.build_quiz(data_dir)
+    quiz_bank.load(data_dir)
+    app.register_blueprint(quiz.bp)
+    return app.test_client()
+
+
+def test_question_token_answers_its_own_question(client):
+    for _ in range(20):
+        q = client.get('/api/quiz/question?gen=1').get_json()
+        assert 'token' in q, q
+        verdicts = [client.post('/api/quiz/answer', json={'token': q['token'], 'choice': c}).get_json()
+                    for c in range(len(q['options']))]
+        assert sum(v['correct'] for v in verdicts) == 1
+        assert {v['answer'] for v in verdicts} == {next(c for c, v in enumerate(verdicts) if v['correct'])}
+
+
+def test_forged_token_is_rejected(client):
+    q = client.get('/api/quiz/question').get_json()
+    qid, sig = q['token'].split('.', 1)
+    forged = f"{int(qid) + 1}.{sig}"
+    assert client.post('/api/quiz/answer', json={'token': forged, 'choice': 0}).status_code == 400
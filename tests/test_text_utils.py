@@ -0,0 +1,27 @@
+from services import text_utils
+from services.text_utils import name_key, normalize_name
+
+
+def test_folding():
+    assert normalize_name('Salamèche') == 'salameche'
+    assert normalize_name('Nidoran♀') == 'nidoranf'
+    assert normalize_name('Ｐｉｋａｃｈｕ') == 'pikachu'
+    assert name_key('ぴかちゅう') == name_key('ピカチュウ')
+    assert name_key('皮卡丘') == '皮卡丘'
+
+
+def test_unknown_code_points_are_not_stored():
+    size = len(text_utils._CHAR_TABLE)
+    assert normalize_name('中😀𝔸') == 'a'
+    assert name_key('😀中') == '中'
+    assert len(text_utils._CHAR_TABLE) == size
+
+
+def test_long_inputs_are_not_memoized():
+    text_utils._normalize.cache_clear()
+    text_utils._name_key.cache_clear()
+    long = 'Pikachu' * 20
+    assert normalize_name(long) == 'pikachu' * 20
+    assert name_key(long + '中') == 'pikachu' * 20 + '中'
+    assert text_utils._normalize.cache_info().currsize == 0
+    assert text_utils._name_key.cache_info().currsize == 0
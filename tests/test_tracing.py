@@ -0,0 +1,28 @@
+import pytest
+
+from games import admin
+from services import tracing
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    monkeypatch.setattr(tracing, 'SAMPLE_RATE', 0)
+    monkeypatch.setattr(admin, 'ADMIN_TOKEN', 'secret')
+    tracing.install(app, can_force=admin.is_admin)
+    app.add_url_rule('/ping', 'ping', lambda: 'pong')
+    return app.test_client()
+
+
+def test_forced_trace_requires_admin_token(client):
+    assert 'Server-Timing' not in client.get('/ping').headers
+    assert 'Server-Timing' not in client.get('/ping', headers={'X-Trace': '1'}).headers
+    assert 'Server-Timing' not in client.get('/ping', headers={'X-Trace': '1', 'X-Admin-Token': 'wrong'}).headers
+    resp = client.get('/ping', headers={'X-Trace': '1', 'X-Admin-Token': 'secret'})
+    assert 'total;dur=' in resp.headers['Server-Timing']
+
+
+def test_forced_trace_is_ignored_without_can_force(app, monkeypatch):
+    monkeypatch.setattr(tracing, 'SAMPLE_RATE', 0)
+    tracing.install(app)
+    app.add_url_rule('/ping', 'ping', lambda: 'pong')
+    assert 'Server-Timing' not in app.test_client().get('/ping', headers={'X-Trace': '1'}).headers
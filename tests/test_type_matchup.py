@@ -0,0 +1,40 @@
+import pytest
+import requests
+
+from games import type_matchup
+from services import type_chart
+
+
+@pytest.fixture
+def no_chart(data_dir, monkeypatch):
+    """No built chart and PokeAPI down: every live build attempt fails."""
+    calls = []
+
+    def fetch(url, **kwargs):
+        calls.append(url)
+        raise requests.ConnectionError('down')
+
+    monkeypatch.setattr(type_chart, 'NAMES', [])
+    monkeypatch.setattr(type_chart, '_FAILED_AT', None)
+    monkeypatch.setattr(type_chart.requests, 'get', fetch)
+    return calls
+
+
+def test_failed_build_backs_off(no_chart, monkeypatch):
+    assert not type_chart.ensure_loaded(['fire', 'water'])
+    attempts = len(no_chart)
+    assert attempts
+    assert not type_chart.ensure_loaded(['fire', 'water'])
+    assert len(no_chart) == attempts
+    monkeypatch.setattr(type_chart, 'RETRY_SECONDS', 0)
+    assert not type_chart.ensure_loaded(['fire', 'water'])
+    assert len(no_chart) > attempts
+
+
+def test_check_without_chart_is_unavailable(app, no_chart):
+    app.register_blueprint(type_matchup.bp)
+    client = app.test_client()
+    token = type_matchup._sign_token(4)
+    resp = client.post('/api/type-matchup/check', json={'token': token, 'attack': 'water'})
+    assert resp.status_code == 503
+    assert client.get('/api/type-matchup/random').status_code == 503